@@ -0,0 +1,47 @@
+"""
+JSON encoding for the hot read routes.
+
+Returning ORM objects costs three passes per response: FastAPI validates
+them into the response model (``from_attributes``), serializes the model
+back to Python primitives, then encodes those with the stdlib json module.
+The hot routes instead build plain dicts straight from the rows (the
+``*_dict`` helpers next to each schema) and return a ``FastJSONResponse``,
+which FastAPI sends as-is. ``response_model`` stays on those routes for
+the OpenAPI docs.
+
+Encoding uses orjson when installed, with the stdlib as the fallback.
+Both produce the same text as pydantic's ``model_dump_json``: compact,
+UTF-8, datetimes in ISO 8601 with "Z" for UTC.
+"""
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    if isinstance(obj, datetime):
+        text = obj.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode()
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
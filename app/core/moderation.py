@@ -0,0 +1,281 @@
+"""
+Comment moderation engine shared by the manga and chapter comment routes.
+
+Banned terms (Uzbek Latin and Cyrillic, Russian; app/core/banned_terms.txt)
+and link markers ("http://", "www.", ".com", ...) are compiled together
+into one Aho-Corasick automaton, so a comment is checked for both in a
+single pass over its text, however long the term list grows. The C
+automaton from ``pyahocorasick`` is used when installed, with a pure-Python
+automaton of the same shape as the fallback.
+
+Each finding adds to a spam score; a comment is rejected once the score
+reaches 1.0. Links and banned terms do so on their own, and weaker signals
+(long runs of one character, shouting) only in combination.
+
+``python -m app.core.moderation rescan`` streams the existing comment
+table through the same engine in batches. With ``--delete`` it removes
+the rejected ones; other processes' response caches catch up within
+``RESPONSE_CACHE_TTL_SECONDS``.
+"""
+import argparse
+import json
+import re
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import Row, delete, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.response_cache import invalidate_manga
+from app.db.aggregates import refresh_chapters, refresh_manga
+from app.db.models.manga_model import Chapter, Comment, Manga
+
+
+DEFAULT_TERMS_PATH = Path(__file__).with_name("banned_terms.txt")
+
+# Same coverage as the URL_PATTERN regex the routes used before: a scheme,
+# "www.", or a dotted name ending in one of these TLDs.
+LINK_PREFIXES = ("http://", "https://", "www.")
+LINK_TLDS = ("com", "org", "net", "io", "co", "dev", "app", "xyz", "info", "biz", "me")
+
+APOSTROPHES = "ʻʼ‘’`´"
+REPEATED_RUN = re.compile(r"(.)\1{9,}")
+
+WEIGHTS = {"link": 1.0, "banned": 1.0, "repeated": 0.5, "shouting": 0.5}
+REJECT_SCORE = 1.0
+
+
+@dataclass(frozen=True)
+class Verdict:
+    score: float
+    reasons: tuple[str, ...]
+    terms: tuple[str, ...]
+
+    @property
+    def allowed(self) -> bool:
+        return self.score < REJECT_SCORE
+
+
+@dataclass(frozen=True)
+class _Pattern:
+    kind: str  # "banned" | "link" | "tld"
+    term: str
+    prefix: bool  # banned term matching any word that starts with it
+
+
+class _PyAutomaton:
+    """Minimal Aho-Corasick automaton with pyahocorasick's add_word/make_automaton/iter."""
+
+    def __init__(self):
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[list] = [[]]
+
+    def add_word(self, word: str, value) -> None:
+        state = 0
+        for ch in word:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+                self.goto[state][ch] = nxt
+            state = nxt
+        self.out[state].append(value)
+
+    def make_automaton(self) -> None:
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def iter(self, text: str) -> Iterator[tuple[int, object]]:
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for value in out[state]:
+                yield i, value
+
+
+def _new_automaton(native: bool):
+    if native:
+        try:
+            import ahocorasick
+            return ahocorasick.Automaton()
+        except ImportError:
+            pass
+    return _PyAutomaton()
+
+
+def load_terms(path: Path) -> list[str]:
+    terms = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            terms.append(normalize(line))
+    return terms
+
+
+def normalize(text: str) -> str:
+    text = text.lower()
+    # str.replace per variant is far cheaper than str.translate on non-ASCII text
+    for apostrophe in APOSTROPHES:
+        if apostrophe in text:
+            text = text.replace(apostrophe, "'")
+    return text
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "'"
+
+
+class ModerationEngine:
+    def __init__(self, terms: Iterable[str], native: bool = True):
+        patterns: dict[str, list[_Pattern]] = {}
+        for term in terms:
+            prefix = term.endswith("*")
+            word = term.rstrip("*")
+            patterns.setdefault(word, []).append(_Pattern("banned", word, prefix))
+        for marker in LINK_PREFIXES:
+            patterns.setdefault(marker, []).append(_Pattern("link", marker, False))
+        for tld in LINK_TLDS:
+            patterns.setdefault("." + tld, []).append(_Pattern("tld", tld, False))
+
+        self.automaton = _new_automaton(native)
+        for word, entries in patterns.items():
+            self.automaton.add_word(word, (len(word), tuple(entries)))
+        self.automaton.make_automaton()
+
+    def _findings(self, text: str) -> tuple[bool, list[str]]:
+        link = False
+        banned = []
+        for end, (length, entries) in self.automaton.iter(text):
+            start = end - length + 1
+            for p in entries:
+                if p.kind == "link":
+                    link = True
+                elif p.kind == "tld":
+                    # "<label>.<tld>": the regex this replaces needed one
+                    # ASCII letter, digit or hyphen before the dot
+                    before = text[start - 1] if start else ""
+                    if before.isascii() and (before.isalnum() or before == "-"):
+                        link = True
+                elif (start == 0 or not _is_word_char(text[start - 1])) and (
+                    p.prefix or end + 1 == len(text) or not _is_word_char(text[end + 1])
+                ):
+                    banned.append(p.term)
+        return link, banned
+
+    def check(self, text: str) -> Verdict:
+        link, banned = self._findings(normalize(text))
+        reasons = []
+        if link:
+            reasons.append("link")
+        if banned:
+            reasons.append("banned")
+        if REPEATED_RUN.search(text):
+            reasons.append("repeated")
+        # Every cased character upper case, in a comment of some length
+        if len(text) >= 12 and text.isupper():
+            reasons.append("shouting")
+        score = sum(WEIGHTS[r] for r in reasons)
+        return Verdict(score, tuple(reasons), tuple(dict.fromkeys(banned)))
+
+    def check_many(self, texts: Iterable[str]) -> Iterator[Verdict]:
+        for text in texts:
+            yield self.check(text)
+
+
+_engine: Optional[ModerationEngine] = None
+
+
+def get_engine() -> ModerationEngine:
+    """Process-wide engine, compiled on first use."""
+    global _engine
+    if _engine is None:
+        path = Path(settings.moderation_terms_path) if settings.moderation_terms_path else DEFAULT_TERMS_PATH
+        _engine = ModerationEngine(load_terms(path))
+    return _engine
+
+
+def scan_comments(db: Session, engine: ModerationEngine, batch_size: int = 1000) -> Iterator[tuple[Row, Verdict]]:
+    """Stream every comment (keyset batches by id) with its verdict."""
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(Comment.id, Comment.manga_id, Comment.chapter_id, Comment.user_name, Comment.text)
+            .where(Comment.id > last_id)
+            .order_by(Comment.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        for row in rows:
+            verdict = engine.check(row.text)
+            if verdict.allowed and row.user_name:
+                verdict = engine.check(row.user_name)
+            yield row, verdict
+
+
+def delete_comments(db: Session, rows: list[Row], batch_size: int = 1000) -> None:
+    """Delete scanned comment rows, fix the counts and drop the cached manga pages that showed them."""
+    for i in range(0, len(rows), batch_size):
+        ids = [row.id for row in rows[i:i + batch_size]]
+        db.execute(delete(Comment).where(Comment.id.in_(ids)))
+    manga_ids = {row.manga_id for row in rows if row.manga_id}
+    chapter_ids = {row.chapter_id for row in rows if row.chapter_id}
+    refresh_manga(db, manga_ids)
+    refresh_chapters(db, chapter_ids)
+    db.commit()
+    slugs = db.execute(
+        select(Manga.slug).where(
+            or_(Manga.id.in_(manga_ids), Manga.id.in_(select(Chapter.manga_id).where(Chapter.id.in_(chapter_ids))))
+        )
+    ).scalars()
+    for slug in slugs:
+        invalidate_manga(slug)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.core.moderation")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rescan = sub.add_parser("rescan", help="re-check every stored comment; prints rejected ones as JSON lines")
+    rescan.add_argument("--batch-size", type=int, default=1000)
+    rescan.add_argument("--delete", action="store_true", help="delete the rejected comments")
+    args = parser.parse_args()
+
+    from app.db.session import SessionLocal
+
+    engine = get_engine()
+    scanned = rejected = 0
+    with SessionLocal() as db:
+        doomed = []
+        for row, verdict in scan_comments(db, engine, args.batch_size):
+            scanned += 1
+            if verdict.allowed:
+                continue
+            rejected += 1
+            doomed.append(row)
+            print(json.dumps({"id": row.id, "reasons": verdict.reasons, "terms": verdict.terms}, ensure_ascii=False))
+        if args.delete and doomed:
+            delete_comments(db, doomed, args.batch_size)
+    action = "deleted" if args.delete else "rejected"
+    print(f"scanned {scanned} comments, {action} {rejected}")
+
+
+if __name__ == "__main__":
+    main()
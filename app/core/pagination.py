@@ -0,0 +1,48 @@
+import base64
+import json
+from typing import Any, Callable, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Pack the sort key of the last row into an opaque, URL-safe token."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, parsers: Sequence[Callable[[Any], Any]]) -> list[Any]:
+    """Unpack a cursor, converting each value with the matching parser."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("cursor shape mismatch")
+        return [parse(value) for parse, value in zip(parsers, values)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(
+    q,
+    keys: Sequence[Any],
+    cursor: Optional[str],
+    parsers: Sequence[Callable[[Any], Any]],
+    page_size: int,
+) -> tuple[list[Any], Optional[str]]:
+    """
+    Newest-first keyset page over `keys` (e.g. created_at, id). Backed by a
+    matching composite index this costs the same at any depth.
+    Returns the rows and the cursor for the next page (None on the last one).
+    """
+    key = tuple_(*keys)
+    if cursor:
+        q = q.filter(key < tuple(decode_cursor(cursor, parsers)))
+    rows = q.order_by(*(k.desc() for k in keys)).limit(page_size + 1).all()
+
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, k.key) for k in keys])
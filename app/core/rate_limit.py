@@ -0,0 +1,165 @@
+"""
+Token-bucket rate limiting, applied as ASGI middleware.
+
+Every request is classified into a route class (comments, likes,
+progress, ...) whose budget comes from ``settings.rate_limits`` as
+"<requests>/<seconds>": a bucket holds up to <requests> tokens and refills
+at <requests>/<seconds> per second. Buckets are keyed on (class, client
+IP, X-User-Token). Write classes also have a bucket per (class, client IP)
+from ``settings.rate_limits_per_ip``, since the token is chosen by the
+client and a fresh one would otherwise mean a fresh bucket; a request
+needs a token from both. Over-budget requests get a 429 with Retry-After before
+routing, so they never check out a database connection.
+
+Buckets live in an LRU of at most ``settings.rate_limit_max_keys``
+entries. The least recently used bucket is evicted first; by then it has
+usually refilled, so evicting it loses nothing. Limits are per worker
+process.
+"""
+import json
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+
+
+# (method or None for any, path pattern, route class); first match wins
+ROUTE_CLASSES = [
+    ("POST", re.compile(r"^/api/v1/(manga/[^/]+|chapters/\d+)/comments/?$"), "comments"),
+    ("POST", re.compile(r"^/api/v1/(manga/[^/]+|chapters/\d+)/like/?$"), "likes"),
+    (None, re.compile(r"^/api/v1/progress"), "progress"),
+    (None, re.compile(r"^/admin/"), "admin"),
+    ("GET", re.compile(r"^/manga/"), "assets"),
+]
+
+
+def parse_budget(budget: str) -> tuple[float, float]:
+    """"30/60" -> (capacity 30, refill 0.5 tokens per second)."""
+    requests, seconds = budget.split("/")
+    return float(requests), float(requests) / float(seconds)
+
+
+def route_class(method: str, path: str) -> str:
+    for want, pattern, name in ROUTE_CLASSES:
+        if (want is None or want == method) and pattern.match(path):
+            return name
+    return "default"
+
+
+class TokenBucketLimiter:
+    def __init__(self, budgets: dict[str, str], max_keys: int, ip_budgets: Optional[dict[str, str]] = None):
+        self.budgets = {name: parse_budget(b) for name, b in budgets.items()}
+        self.ip_budgets = {name: parse_budget(b) for name, b in (ip_budgets or {}).items()}
+        self.max_keys = max_keys
+        # key -> [tokens, last refill time]
+        self._buckets: OrderedDict[tuple, list[float]] = OrderedDict()
+        self.rejected = 0
+
+    def _bucket(self, key: tuple, capacity: float, rate: float, now: float) -> list[float]:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [capacity, now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+        return bucket
+
+    def hit(self, route: str, client: tuple, now: Optional[float] = None) -> float:
+        """
+        Take one token from each bucket that applies. Returns 0 if allowed,
+        else the seconds until a token is available. Routes without a
+        budget are not limited.
+
+        `client` is (ip, user token). A route with an ip budget also has a
+        bucket per IP alone, so inventing a new token per request gains
+        nothing; an empty IP bucket is checked first and rejects without
+        creating a bucket for the new token.
+        """
+        budget = self.budgets.get(route)
+        ip_budget = self.ip_budgets.get(route)
+        if budget is None and ip_budget is None:
+            return 0.0
+        now = time.monotonic() if now is None else now
+
+        buckets = []
+        if ip_budget is not None:
+            bucket = self._bucket((route, client[0]), *ip_budget, now)
+            if bucket[0] < 1:
+                self.rejected += 1
+                return (1 - bucket[0]) / ip_budget[1]
+            buckets.append(bucket)
+        if budget is not None:
+            bucket = self._bucket((route, *client), *budget, now)
+            if bucket[0] < 1:
+                self.rejected += 1
+                return (1 - bucket[0]) / budget[1]
+            buckets.append(bucket)
+
+        for bucket in buckets:
+            bucket[0] -= 1
+        return 0.0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+def client_ip(scope) -> str:
+    if settings.rate_limit_trust_forwarded:
+        hops = [
+            hop.strip()
+            for name, value in scope["headers"]
+            if name == b"x-forwarded-for"
+            for hop in value.decode("latin-1").split(",")
+        ]
+        if hops:
+            # Counted from the right: only our own proxies' entries can be trusted
+            return hops[-min(settings.rate_limit_trusted_proxies, len(hops))]
+    client = scope.get("client")
+    return client[0] if client else ""
+
+
+def user_token(scope) -> str:
+    for name, value in scope["headers"]:
+        if name == b"x-user-token":
+            return value.decode("latin-1")
+    return ""
+
+
+class RateLimitMiddleware:
+    def __init__(self, app, limiter: "TokenBucketLimiter"):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        route = route_class(scope["method"], scope["path"])
+        retry_after = self.limiter.hit(route, (client_ip(scope), user_token(scope)))
+        if not retry_after:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Too many requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(math.ceil(retry_after)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+rate_limiter = TokenBucketLimiter(
+    settings.rate_limits, settings.rate_limit_max_keys, settings.rate_limits_per_ip
+)
@@ -0,0 +1,104 @@
+"""
+Serialized-response cache for read-mostly endpoints.
+
+Entries hold the encoded JSON body and a strong ETag (content hash), so a
+hit costs no database round trip and no serialization, and a client that
+already has the body gets a bodiless 304. Writes (the admin routes,
+comment creation) invalidate the affected keys; the TTL bounds staleness
+across worker processes, whose caches are independent.
+"""
+import hashlib
+from typing import Awaitable, Callable, Hashable, NamedTuple, Union
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.fast_json import dumps
+
+
+class CachedBody(NamedTuple):
+    body: bytes
+    etag: str
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in header.split(","))
+
+
+def cached_response(
+    cache: TTLCache,
+    request: Request,
+    key: Hashable,
+    build: Callable[[], Union[BaseModel, dict]],
+    cache_control: str = "no-cache",
+) -> Response:
+    """
+    Serve `key` from `cache`, calling `build()` (which may raise) on a miss.
+    `build` returns a model or an already plain dict (see app/core/fast_json.py).
+    Answers If-None-Match with 304.
+    """
+    entry = cache.get(key)
+    if entry is None:
+        entry = _store(cache, key, build())
+    return _respond(request, entry, cache_control)
+
+
+async def cached_response_async(
+    cache: TTLCache,
+    request: Request,
+    key: Hashable,
+    build: Callable[[], Awaitable[Union[BaseModel, dict]]],
+    cache_control: str = "no-cache",
+) -> Response:
+    """cached_response() with an async `build`, for the async routes."""
+    entry = cache.get(key)
+    if entry is None:
+        entry = _store(cache, key, await build())
+    return _respond(request, entry, cache_control)
+
+
+def _store(cache: TTLCache, key: Hashable, content: Union[BaseModel, dict]) -> CachedBody:
+    body = dumps(content) if isinstance(content, dict) else content.model_dump_json().encode()
+    entry = CachedBody(body, make_etag(body))
+    cache.set(key, entry)
+    return entry
+
+
+def _respond(request: Request, entry: CachedBody, cache_control: str) -> Response:
+    headers = {"ETag": entry.etag, "Cache-Control": cache_control}
+    if etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+response_cache = TTLCache(
+    maxsize=settings.response_cache_size,
+    ttl=settings.response_cache_ttl_seconds,
+)
+
+
+def invalidate_manga(slug: str) -> None:
+    response_cache.invalidate(("manga", slug))
+
+
+def invalidate_chapter(chapter_id: int) -> None:
+    response_cache.invalidate(("chapter", chapter_id))
+    response_cache.invalidate(("reader", chapter_id))
+    response_cache.invalidate(("prefetch", chapter_id))
+    response_cache.invalidate(("renditions", chapter_id))
+
+
+def invalidate_readers() -> None:
+    """Reader and prefetch payloads embed their neighbours, so any chapter change can stale them."""
+    response_cache.invalidate_matching(lambda key: key[0] in ("reader", "prefetch"))
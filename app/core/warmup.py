@@ -0,0 +1,94 @@
+"""
+Background warmup for fast-start workers (settings.fast_start).
+
+A fast-start worker runs no migrations or seeding before it starts
+serving, so a cold start or a scale-out is only as slow as the imports
+plus, with SCHEMA_CHECK=fail, one read of the migrations table. Once the
+server is up, this runs off the event loop:
+
+1. with SCHEMA_CHECK=warn, the schema check, logged as an error
+   (migrations belong in the release step), which ends the warmup;
+2. ``settings.warmup_connections`` pooled connections, so the first
+   requests skip the connect handshake;
+3. ORM mapper configuration, the catalog.json snapshot and the
+   moderation automaton.
+
+Any failure is logged and left to the request path, which fills the same
+caches on demand.
+"""
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def check_schema_quietly(engine: Engine) -> bool:
+    """False (and an error logged) if migrations are pending."""
+    from app.db.migrations import SchemaBehindError, check_schema
+
+    try:
+        check_schema(engine)
+    except SchemaBehindError as exc:
+        logger.error("%s", exc)
+        return False
+    return True
+
+
+def warm_pool(engine: Engine, connections: int) -> None:
+    """Open `connections` connections at once, then return them all to the pool."""
+    held = []
+    try:
+        for _ in range(min(connections, settings.db_pool_size)):
+            conn = engine.connect()
+            held.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in held:
+            conn.close()
+
+
+async def warm_async_pool(connections: int) -> None:
+    from app.db.async_session import get_async_engine
+
+    async def ping():
+        async with get_async_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(min(connections, settings.db_pool_size))))
+
+
+def warm_caches() -> None:
+    from sqlalchemy.orm import configure_mappers
+
+    from app.core.moderation import get_engine
+    from app.db.catalog import get_catalog_snapshot
+    from app.db.session import SessionLocal
+
+    # Otherwise done by the first ORM query of the first request
+    configure_mappers()
+    with SessionLocal() as db:
+        get_catalog_snapshot(db)
+    get_engine()
+
+
+async def warm_up(engine: Engine) -> None:
+    start = time.perf_counter()
+    try:
+        # With "fail" the schema was already checked before serving (app/main.py)
+        if settings.schema_check == "warn" and not await asyncio.to_thread(check_schema_quietly, engine):
+            return
+        await asyncio.to_thread(warm_pool, engine, settings.warmup_connections)
+        if settings.db_mode == "async":
+            await warm_async_pool(settings.warmup_connections)
+        await asyncio.to_thread(warm_caches)
+    except Exception:
+        logger.exception("Warmup failed; caches will fill on demand")
+        return
+    logger.info("Warmup finished in %.2fs", time.perf_counter() - start)
@@ -0,0 +1,126 @@
+"""
+Denormalized counts on manga and chapter rows.
+
+``manga.comment_count`` and ``chapter.comment_count`` count the comments
+posted on that manga or chapter page; ``manga.chapter_count`` and
+``manga.latest_chapter_number`` summarise its chapters. List endpoints
+read them off the row instead of running a COUNT(*) per card.
+
+Write paths keep them current in the same transaction as the change:
+comment creation increments, and anything that adds or removes chapters
+or deletes comments recomputes the affected rows. If they ever drift,
+
+    python -m app.db.aggregates repair
+
+recomputes every row in keyset batches and rewrites only the ones that
+differ.
+"""
+import argparse
+from typing import Iterable
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.models.manga_model import Chapter, Comment, Manga
+
+
+MODELS = {"manga": Manga, "chapter": Chapter}
+
+
+def _comment_total(model):
+    column = Comment.manga_id if model is Manga else Comment.chapter_id
+    return select(func.count(Comment.id)).where(column == model.id).scalar_subquery()
+
+
+def _chapter_total():
+    return select(func.count(Chapter.id)).where(Chapter.manga_id == Manga.id).scalar_subquery()
+
+
+def _latest_chapter():
+    return select(func.max(Chapter.number)).where(Chapter.manga_id == Manga.id).scalar_subquery()
+
+
+def add_comments(db: Session, kind: str, row_id: int, n: int = 1) -> None:
+    """Atomic ``comment_count += n`` on one manga or chapter row; the caller commits."""
+    model = MODELS[kind]
+    values = {"comment_count": func.coalesce(model.comment_count, 0) + n}
+    if model is Manga:
+        # A new comment is not a content update
+        values["updated_at"] = Manga.updated_at
+    db.execute(update(model).where(model.id == row_id).values(**values))
+
+
+def refresh_manga(db: Session, manga_ids: Iterable[int]) -> int:
+    """Recompute all manga counts for the given rows. Returns the number of rows changed."""
+    ids = set(manga_ids)
+    if not ids:
+        return 0
+    comments, chapters, latest = _comment_total(Manga), _chapter_total(), _latest_chapter()
+    return db.execute(
+        update(Manga)
+        .where(
+            Manga.id.in_(ids),
+            or_(
+                Manga.comment_count.is_distinct_from(comments),
+                Manga.chapter_count.is_distinct_from(chapters),
+                Manga.latest_chapter_number.is_distinct_from(latest),
+            ),
+        )
+        .values(
+            comment_count=comments,
+            chapter_count=chapters,
+            latest_chapter_number=latest,
+            updated_at=Manga.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def refresh_chapters(db: Session, chapter_ids: Iterable[int]) -> int:
+    """Recompute chapter comment counts for the given rows. Returns the number of rows changed."""
+    ids = set(chapter_ids)
+    if not ids:
+        return 0
+    comments = _comment_total(Chapter)
+    return db.execute(
+        update(Chapter)
+        .where(Chapter.id.in_(ids), Chapter.comment_count.is_distinct_from(comments))
+        .values(comment_count=comments)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def repair(db: Session, batch_size: int = 1000) -> dict[str, int]:
+    """Recompute every row, committing once per batch. Returns rows changed per kind."""
+    stats = {}
+    for kind, model, refresh in (("manga", Manga, refresh_manga), ("chapter", Chapter, refresh_chapters)):
+        stats[kind] = 0
+        last_id = 0
+        while True:
+            ids = db.execute(
+                select(model.id).where(model.id > last_id).order_by(model.id).limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+            last_id = ids[-1]
+            stats[kind] += refresh(db, ids)
+            db.commit()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.db.aggregates")
+    sub = parser.add_subparsers(dest="command", required=True)
+    fix = sub.add_parser("repair", help="recompute comment and chapter counts for every row")
+    fix.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        stats = repair(db, args.batch_size)
+    print(f"repaired {stats['manga']} manga and {stats['chapter']} chapter rows")
+
+
+if __name__ == "__main__":
+    main()
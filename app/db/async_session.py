@@ -0,0 +1,42 @@
+from functools import lru_cache
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.pool import pool_options
+
+# Sync driver -> async driver for the same database
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_db_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# Built on first use so sync-mode deployments never need the async drivers
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    url = settings.async_db_url or async_db_url(settings.db_url)
+    return create_async_engine(url, **pool_options(url, async_=True))
+
+
+@lru_cache
+def get_async_sessionmaker() -> async_sessionmaker:
+    return async_sessionmaker(
+        autoflush=False,
+        bind=get_async_engine(),
+    )
+
+
+# FastAPI dependency
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
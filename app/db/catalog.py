@@ -0,0 +1,95 @@
+"""
+Precomputed /manga/catalog.json.
+
+The catalog is built from a single manga LEFT JOIN chapter query, encoded
+once and gzipped once. The snapshot is then served as-is until content
+changes: the admin routes call invalidate_catalog(), and the TTL covers
+the other worker processes.
+"""
+import gzip
+import json
+import threading
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.response_cache import make_etag
+from app.db.models.manga_model import Chapter, Manga
+
+
+class CatalogSnapshot(NamedTuple):
+    body: bytes
+    gzipped: bytes
+    etag: str
+    gzip_etag: str
+
+
+def build_catalog(db: Session) -> dict:
+    rows = db.execute(
+        select(
+            Manga.id,
+            Manga.slug,
+            Manga.title,
+            Manga.description,
+            Manga.cover_url,
+            Manga.status,
+            Chapter.id.label("chapter_id"),
+            Chapter.number,
+            Chapter.title.label("chapter_title"),
+        )
+        .outerjoin(Chapter, Chapter.manga_id == Manga.id)
+        .order_by(Manga.id.desc(), Chapter.number.asc())
+    )
+
+    items = []
+    current_id = None
+    for row in rows:
+        if row.id != current_id:
+            current_id = row.id
+            items.append({
+                "slug": row.slug,
+                "title": row.title,
+                "description": row.description,
+                "cover_url": row.cover_url,
+                "status": row.status,
+                "chapters": [],
+            })
+        if row.chapter_id is not None:
+            items[-1]["chapters"].append(
+                {"id": row.chapter_id, "number": row.number, "title": row.chapter_title}
+            )
+    return {"items": items}
+
+
+def make_snapshot(catalog: dict) -> CatalogSnapshot:
+    body = json.dumps(catalog, ensure_ascii=False, separators=(",", ":")).encode()
+    etag = make_etag(body)
+    return CatalogSnapshot(
+        body=body,
+        gzipped=gzip.compress(body, compresslevel=9, mtime=0),
+        etag=etag,
+        gzip_etag=etag[:-1] + '-gz"',
+    )
+
+
+_snapshots = TTLCache(maxsize=1, ttl=settings.response_cache_ttl_seconds)
+_build_lock = threading.Lock()
+
+
+def get_catalog_snapshot(db: Session) -> CatalogSnapshot:
+    snapshot: Optional[CatalogSnapshot] = _snapshots.get("catalog")
+    if snapshot is None:
+        # One rebuild at a time; concurrent requests wait and reuse it
+        with _build_lock:
+            snapshot = _snapshots.get("catalog")
+            if snapshot is None:
+                snapshot = make_snapshot(build_catalog(db))
+                _snapshots.set("catalog", snapshot)
+    return snapshot
+
+
+def invalidate_catalog() -> None:
+    _snapshots.clear()
@@ -0,0 +1,162 @@
+"""
+Process-wide chapter ordering index for next/prev navigation.
+
+Each manga's chapters are kept as a list sorted by (number, id), loaded
+lazily with a single query the first time any of its chapters is
+navigated from. Next/prev is then a binary search with no database
+round trip. The admin routes invalidate a manga when they add chapters,
+and entries also expire after ``settings.chapter_index_ttl_seconds`` so
+that other worker processes pick up new chapters.
+"""
+import bisect
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.manga_model import Chapter
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@dataclass(frozen=True)
+class ChapterEntry:
+    id: int
+    number: int
+    title: Optional[str]
+    manga_id: int
+
+
+@dataclass
+class MangaChapters:
+    entries: list[ChapterEntry]  # sorted by (number, id)
+    numbers: list[int]
+    positions: dict[int, int]  # chapter id -> index in entries
+    loaded_at: float
+
+
+class ChapterIndex:
+    def __init__(self, max_manga: int, ttl: float):
+        self.max_manga = max_manga
+        self.ttl = ttl
+        self._by_manga: OrderedDict[int, MangaChapters] = OrderedDict()
+        self._manga_of: dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, chapter_id: int) -> Optional[tuple[MangaChapters, ChapterEntry]]:
+        with self._lock:
+            manga_id = self._manga_of.get(chapter_id)
+            chapters = self._by_manga.get(manga_id) if manga_id is not None else None
+            if chapters is None or chapters.loaded_at + self.ttl < time.monotonic():
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._by_manga.move_to_end(manga_id)
+            return chapters, chapters.entries[chapters.positions[chapter_id]]
+
+    @staticmethod
+    def _statement(chapter_id: int):
+        """All chapters of the manga that `chapter_id` belongs to, in order."""
+        manga_id = select(Chapter.manga_id).where(Chapter.id == chapter_id).scalar_subquery()
+        return (
+            select(Chapter.id, Chapter.number, Chapter.title, Chapter.manga_id)
+            .where(Chapter.manga_id == manga_id)
+            .order_by(Chapter.number, Chapter.id)
+        )
+
+    def _load(self, db: Session, chapter_id: int) -> Optional[tuple[MangaChapters, ChapterEntry]]:
+        return self._store(db.execute(self._statement(chapter_id)).all(), chapter_id)
+
+    async def _load_async(
+        self, db: "AsyncSession", chapter_id: int
+    ) -> Optional[tuple[MangaChapters, ChapterEntry]]:
+        return self._store((await db.execute(self._statement(chapter_id))).all(), chapter_id)
+
+    def _store(self, rows, chapter_id: int) -> Optional[tuple[MangaChapters, ChapterEntry]]:
+        if not rows:
+            return None
+
+        entries = [ChapterEntry(*row) for row in rows]
+        chapters = MangaChapters(
+            entries=entries,
+            numbers=[e.number for e in entries],
+            positions={e.id: i for i, e in enumerate(entries)},
+            loaded_at=time.monotonic(),
+        )
+        with self._lock:
+            self._drop(entries[0].manga_id)
+            self._by_manga[entries[0].manga_id] = chapters
+            for entry in entries:
+                self._manga_of[entry.id] = entry.manga_id
+            while len(self._by_manga) > self.max_manga:
+                self._drop(next(iter(self._by_manga)))
+        return chapters, entries[chapters.positions[chapter_id]]
+
+    def _drop(self, manga_id: int) -> None:
+        chapters = self._by_manga.pop(manga_id, None)
+        if chapters:
+            for entry in chapters.entries:
+                self._manga_of.pop(entry.id, None)
+
+    def manga_of(self, db: Session, chapter_id: int) -> Optional[int]:
+        """The chapter's manga id, or None if the chapter doesn't exist."""
+        found = self._lookup(chapter_id) or self._load(db, chapter_id)
+        return found[1].manga_id if found else None
+
+    def neighbours(
+        self, db: Session, chapter_id: int
+    ) -> Optional[tuple[Optional[ChapterEntry], Optional[ChapterEntry]]]:
+        """(prev, next) for a chapter, or None if the chapter doesn't exist."""
+        found = self._lookup(chapter_id) or self._load(db, chapter_id)
+        return self._around(*found) if found else None
+
+    async def neighbours_async(
+        self, db: "AsyncSession", chapter_id: int
+    ) -> Optional[tuple[Optional[ChapterEntry], Optional[ChapterEntry]]]:
+        """neighbours() on an AsyncSession."""
+        found = self._lookup(chapter_id) or await self._load_async(db, chapter_id)
+        return self._around(*found) if found else None
+
+    @staticmethod
+    def _around(
+        chapters: MangaChapters, entry: ChapterEntry
+    ) -> tuple[Optional[ChapterEntry], Optional[ChapterEntry]]:
+        before = bisect.bisect_left(chapters.numbers, entry.number)
+        after = bisect.bisect_right(chapters.numbers, entry.number)
+        prev_ch = chapters.entries[before - 1] if before > 0 else None
+        next_ch = chapters.entries[after] if after < len(chapters.entries) else None
+        return prev_ch, next_ch
+
+    def invalidate_manga(self, manga_id: int) -> None:
+        with self._lock:
+            self._drop(manga_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_manga.clear()
+            self._manga_of.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "manga": len(self._by_manga),
+                "chapters": len(self._manga_of),
+            }
+
+
+chapter_index = ChapterIndex(
+    max_manga=settings.chapter_index_max_manga,
+    ttl=settings.chapter_index_ttl_seconds,
+)
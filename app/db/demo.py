@@ -0,0 +1,39 @@
+"""Placeholder manga for frontend development, seeded at startup when ENV=dev."""
+from sqlalchemy.orm import Session
+
+from app.db.aggregates import refresh_manga
+from app.db.models.manga_model import Chapter, Manga, Page
+
+
+def seed_demo(db: Session) -> None:
+    """Add the demo manga if the catalog is empty."""
+    if db.query(Manga.id).first() is not None:
+        return
+
+    demo = Manga(
+        slug="demo-manga",
+        title="Demo Manga",
+        description="Placeholder manga for frontend dev.",
+        cover_url="https://placehold.co/300x450",
+        status="ongoing",
+    )
+    db.add(demo)
+    db.flush()
+
+    ch1 = Chapter(manga_id=demo.id, number=1, title="Chapter 1")
+    ch2 = Chapter(manga_id=demo.id, number=2, title="Chapter 2")
+    db.add_all([ch1, ch2])
+    db.flush()
+
+    # Add demo pages for each chapter
+    for ch in [ch1, ch2]:
+        for i in range(1, 6):
+            page = Page(
+                chapter_id=ch.id,
+                index=i,
+                image_url=f"https://placehold.co/800x1200?text=Ch{ch.number}+Page{i}"
+            )
+            db.add(page)
+
+    refresh_manga(db, [demo.id])
+    db.commit()
@@ -0,0 +1,165 @@
+"""
+Versioned schema migrations.
+
+Each module in ``versions/`` is named ``NNNN_description.py`` and defines
+``upgrade(conn)``. Migrations run in order inside their own transaction;
+a module that sets ``transactional = False`` runs on an autocommit
+connection instead, which is what PostgreSQL needs for
+``CREATE INDEX CONCURRENTLY``. Such migrations must be idempotent, because
+a crash can leave them half applied.
+
+Applied versions are recorded in the ``schema_version`` table.
+
+    python -m app.db.migrations status
+    python -m app.db.migrations upgrade
+"""
+import importlib
+import pkgutil
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Optional, Sequence
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.migrations import versions
+from app.db.models.manga_model import utc_now
+
+
+MODULE_PATTERN = re.compile(r"^(\d{4})_(\w+)$")
+# Arbitrary app-wide key so concurrent workers don't migrate at the same time
+ADVISORY_LOCK_KEY = 724_311_001
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime(timezone=True), default=utc_now),
+)
+
+
+class SchemaBehindError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    module: ModuleType
+
+    @property
+    def transactional(self) -> bool:
+        return getattr(self.module, "transactional", True)
+
+
+def discover() -> list[Migration]:
+    migrations = []
+    for info in pkgutil.iter_modules(versions.__path__):
+        match = MODULE_PATTERN.match(info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{versions.__name__}.{info.name}")
+        migrations.append(Migration(int(match.group(1)), match.group(2), module))
+    migrations.sort(key=lambda m: m.version)
+    return migrations
+
+
+def applied_versions(engine: Engine) -> set[int]:
+    """Read only: a database without the schema_version table has none applied."""
+    with engine.connect() as conn:
+        if not inspect(conn).has_table(schema_version.name):
+            return set()
+        return set(conn.execute(select(schema_version.c.version)).scalars())
+
+
+def pending_migrations(engine: Engine) -> list[Migration]:
+    applied = applied_versions(engine)
+    return [m for m in discover() if m.version not in applied]
+
+
+@contextmanager
+def migration_lock(engine: Engine):
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> list[Migration]:
+    """Apply pending migrations up to `target` (default: latest)."""
+    applied = []
+    with migration_lock(engine):
+        with engine.begin() as conn:
+            schema_version.create(conn, checkfirst=True)
+        for migration in pending_migrations(engine):
+            if target is not None and migration.version > target:
+                break
+            record = insert(schema_version).values(
+                version=migration.version, name=migration.name
+            )
+            if migration.transactional:
+                with engine.begin() as conn:
+                    migration.module.upgrade(conn)
+                    conn.execute(record)
+            else:
+                with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                    migration.module.upgrade(conn)
+                    conn.execute(record)
+            applied.append(migration)
+    return applied
+
+
+def check_schema(engine: Engine) -> None:
+    pending = pending_migrations(engine)
+    if pending:
+        names = ", ".join(f"{m.version:04d}_{m.name}" for m in pending)
+        raise SchemaBehindError(
+            f"Database schema is behind by {len(pending)} migration(s): {names}. "
+            "Run `python -m app.db.migrations upgrade`."
+        )
+
+
+# --- Helpers for migration modules ---
+def create_index(
+    conn: Connection,
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    unique: bool = False,
+    using: Optional[str] = None,
+    concurrently: bool = False,
+) -> None:
+    """
+    CREATE INDEX IF NOT EXISTS, optionally CONCURRENTLY on PostgreSQL (the
+    calling migration must then be non-transactional). An INVALID index
+    left behind by an interrupted concurrent build is dropped and rebuilt.
+    """
+    postgres = conn.dialect.name == "postgresql"
+    online = "CONCURRENTLY " if postgres and concurrently else ""
+    if postgres:
+        invalid = conn.execute(
+            text(
+                "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name AND NOT i.indisvalid"
+            ),
+            {"name": name},
+        ).first()
+        if invalid:
+            conn.execute(text(f"DROP INDEX {online}IF EXISTS {name}"))
+
+    method = f" USING {using}" if postgres and using else ""
+    conn.execute(
+        text(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX {online}IF NOT EXISTS {name} "
+            f"ON {table}{method} ({', '.join(columns)})"
+        )
+    )
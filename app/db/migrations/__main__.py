@@ -0,0 +1,29 @@
+import argparse
+
+from app.db.migrations import discover, pending_migrations, upgrade
+from app.db.session import engine
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.db.migrations")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="list applied and pending migrations")
+    up = sub.add_parser("upgrade", help="apply pending migrations")
+    up.add_argument("--target", type=int, help="stop after this version")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        pending = {m.version for m in pending_migrations(engine)}
+        for m in discover():
+            state = "pending" if m.version in pending else "applied"
+            print(f"{m.version:04d}_{m.name:<32} {state}")
+    else:
+        applied = upgrade(engine, target=args.target)
+        for m in applied:
+            print(f"applied {m.version:04d}_{m.name}")
+        if not applied:
+            print("schema is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Baseline schema, as previously created by Base.metadata.create_all.
+
+Frozen here rather than read from the models so later model changes can't
+leak into it. Existing databases already have these tables and are left
+untouched (checkfirst).
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Text
+
+
+metadata = MetaData()
+
+Table(
+    "manga",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("slug", String(255), unique=True, index=True, nullable=False),
+    Column("title", String(255), nullable=False),
+    Column("description", Text, nullable=True),
+    Column("cover_url", String(512), nullable=True),
+    Column("status", String(50), nullable=True),
+    Column("like_count", Integer),
+    Column("created_at", DateTime(timezone=True)),
+    Column("updated_at", DateTime(timezone=True)),
+)
+
+Table(
+    "chapter",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("manga_id", Integer, ForeignKey("manga.id"), nullable=False),
+    Column("number", Integer, nullable=False),
+    Column("title", String(255), nullable=True),
+    Column("like_count", Integer),
+    Column("published_at", DateTime(timezone=True)),
+)
+
+Table(
+    "page",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("chapter_id", Integer, ForeignKey("chapter.id"), nullable=False),
+    Column("index", Integer, nullable=False),
+    Column("image_url", String(512), nullable=False),
+)
+
+Table(
+    "comment",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("manga_id", Integer, ForeignKey("manga.id"), nullable=True),
+    Column("chapter_id", Integer, ForeignKey("chapter.id"), nullable=True),
+    Column("user_name", String(100)),
+    Column("text", Text, nullable=False),
+    Column("created_at", DateTime(timezone=True)),
+)
+
+Table(
+    "reading_progress",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_token", String(255), nullable=False, index=True),
+    Column("manga_id", Integer, ForeignKey("manga.id"), nullable=False),
+    Column("chapter_id", Integer, ForeignKey("chapter.id"), nullable=False),
+    Column("page_index", Integer),
+    Column("updated_at", DateTime(timezone=True)),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
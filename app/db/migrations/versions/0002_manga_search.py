@@ -0,0 +1,51 @@
+"""Indexed search over manga title/description (see app/db/search.py)."""
+from sqlalchemy import text
+
+
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE manga ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_manga_search_vector ON manga USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_manga_title_trgm ON manga USING GIN (title gin_trgm_ops)",
+]
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS manga_fts USING fts5(
+        title, description, content='manga', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS manga_fts_ai AFTER INSERT ON manga BEGIN
+        INSERT INTO manga_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS manga_fts_ad AFTER DELETE ON manga BEGIN
+        INSERT INTO manga_fts(manga_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS manga_fts_au AFTER UPDATE OF title, description ON manga BEGIN
+        INSERT INTO manga_fts(manga_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO manga_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    # Backfill rows that existed before the index did.
+    "INSERT INTO manga_fts(manga_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade(conn):
+    for statement in {"postgresql": POSTGRES_DDL, "sqlite": SQLITE_DDL}.get(conn.dialect.name, []):
+        conn.execute(text(statement))
@@ -0,0 +1,38 @@
+"""Indexes for the read/write hot paths, built online on PostgreSQL."""
+from sqlalchemy import text
+
+from app.db.migrations import create_index
+
+
+transactional = False
+
+
+def upgrade(conn):
+    # Chapter lists and next/prev navigation
+    create_index(conn, "ix_chapter_manga_number", "chapter", ["manga_id", "number"], concurrently=True)
+    # Reader page loads
+    create_index(conn, "ix_page_chapter_index", "page", ["chapter_id", '"index"'], concurrently=True)
+    # Comment feeds (keyset pagination, newest first)
+    create_index(
+        conn, "ix_comment_manga_created", "comment", ["manga_id", "created_at", "id"], concurrently=True
+    )
+    create_index(
+        conn, "ix_comment_chapter_created", "comment", ["chapter_id", "created_at", "id"], concurrently=True
+    )
+
+    # One progress row per reader and manga. The old read-then-write upsert
+    # could race into duplicates; keep the newest before enforcing it.
+    conn.execute(
+        text(
+            "DELETE FROM reading_progress WHERE id NOT IN "
+            "(SELECT MAX(id) FROM reading_progress GROUP BY user_token, manga_id)"
+        )
+    )
+    create_index(
+        conn,
+        "uq_reading_progress_user_manga",
+        "reading_progress",
+        ["user_token", "manga_id"],
+        unique=True,
+        concurrently=True,
+    )
@@ -0,0 +1,12 @@
+"""Page dimensions, byte size and LQIP placeholder."""
+from sqlalchemy import text
+
+
+def upgrade(conn):
+    for column, sql_type in (
+        ("width", "INTEGER"),
+        ("height", "INTEGER"),
+        ("byte_size", "INTEGER"),
+        ("placeholder", "TEXT"),
+    ):
+        conn.execute(text(f"ALTER TABLE page ADD COLUMN {column} {sql_type}"))
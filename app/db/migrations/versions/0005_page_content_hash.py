@@ -0,0 +1,6 @@
+"""Source file hash per page, so re-ingesting skips unchanged images."""
+from sqlalchemy import text
+
+
+def upgrade(conn):
+    conn.execute(text("ALTER TABLE page ADD COLUMN content_hash VARCHAR(64)"))
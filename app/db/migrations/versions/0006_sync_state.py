@@ -0,0 +1,17 @@
+"""Fingerprints of ingested manifests and chapter directories, for incremental sync."""
+from sqlalchemy import Column, DateTime, MetaData, String, Table
+
+
+metadata = MetaData()
+
+sync_state = Table(
+    "sync_state",
+    metadata,
+    Column("key", String(512), primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+    Column("synced_at", DateTime(timezone=True)),
+)
+
+
+def upgrade(conn):
+    sync_state.create(conn, checkfirst=True)
@@ -0,0 +1,26 @@
+"""Content-addressed page image blobs, referenced by page.content_hash."""
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, text
+
+from app.db.migrations import create_index
+
+
+transactional = False
+
+metadata = MetaData()
+
+blob = Table(
+    "blob",
+    metadata,
+    Column("hash", String(64), primary_key=True),
+    Column("suffix", String(16), nullable=False),
+    Column("byte_size", Integer, nullable=False),
+    Column("created_at", DateTime(timezone=True)),
+)
+
+
+def upgrade(conn):
+    blob.create(conn, checkfirst=True)
+    # Reference checks during garbage collection
+    create_index(conn, "ix_page_content_hash", "page", ["content_hash"], concurrently=True)
+    # Make the next ingest revisit every chapter and move its pages to blob URLs
+    conn.execute(text("DELETE FROM sync_state"))
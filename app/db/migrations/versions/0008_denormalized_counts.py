@@ -0,0 +1,23 @@
+"""Denormalized comment and chapter counts on manga and chapter, backfilled."""
+from sqlalchemy import text
+
+
+def upgrade(conn):
+    for table, column, sql_type in (
+        ("manga", "comment_count", "INTEGER NOT NULL DEFAULT 0"),
+        ("manga", "chapter_count", "INTEGER NOT NULL DEFAULT 0"),
+        ("manga", "latest_chapter_number", "INTEGER"),
+        ("chapter", "comment_count", "INTEGER NOT NULL DEFAULT 0"),
+    ):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {sql_type}"))
+
+    conn.execute(text(
+        "UPDATE manga SET "
+        "comment_count = (SELECT COUNT(*) FROM comment WHERE comment.manga_id = manga.id), "
+        "chapter_count = (SELECT COUNT(*) FROM chapter WHERE chapter.manga_id = manga.id), "
+        "latest_chapter_number = (SELECT MAX(number) FROM chapter WHERE chapter.manga_id = manga.id)"
+    ))
+    conn.execute(text(
+        "UPDATE chapter SET "
+        "comment_count = (SELECT COUNT(*) FROM comment WHERE comment.chapter_id = chapter.id)"
+    ))
@@ -1,2 +1,3 @@
 from app.db.models.manga_model import Manga, Chapter, Page, Comment, ReadingProgress  # noqa: F401
-
+from app.db.models.sync_model import SyncState  # noqa: F401
+from app.db.models.blob_model import Blob  # noqa: F401
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.db.base import Base
+from app.db.models.manga_model import utc_now
+
+
+class Blob(Base):
+    """A stored page image, addressed by the sha256 of its bytes (see app/media/blobs.py)."""
+    __tablename__ = "blob"
+
+    hash = Column(String(64), primary_key=True)
+    suffix = Column(String(16), nullable=False)  # ".png", ".jpg", ...
+    byte_size = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utc_now)
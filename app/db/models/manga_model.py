@@ -7,6 +7,7 @@ from sqlalchemy import (
     Text,
     ForeignKey,
     DateTime,
+    Index,
 )
 from sqlalchemy.orm import relationship
 
@@ -27,21 +28,29 @@ class Manga(Base):
     cover_url = Column(String(512), nullable=True)
     status = Column(String(50), nullable=True)  # "ongoing" | "completed"
     like_count = Column(Integer, default=0)
+    # Maintained by the write paths; see app/db/aggregates.py
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    chapter_count = Column(Integer, nullable=False, default=0, server_default="0")
+    latest_chapter_number = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), default=utc_now)
     updated_at = Column(DateTime(timezone=True), default=utc_now, onupdate=utc_now)
 
-    chapters = relationship("Chapter", back_populates="manga")
+    chapters = relationship("Chapter", back_populates="manga", order_by="Chapter.number")
     comments = relationship("Comment", back_populates="manga")
 
 
 class Chapter(Base):
     __tablename__ = "chapter"
+    __table_args__ = (
+        Index("ix_chapter_manga_number", "manga_id", "number"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     manga_id = Column(Integer, ForeignKey("manga.id"), nullable=False)
     number = Column(Integer, nullable=False)  # chapter number
     title = Column(String(255), nullable=True)
     like_count = Column(Integer, default=0)
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
     published_at = Column(DateTime(timezone=True), default=utc_now)
 
     manga = relationship("Manga", back_populates="chapters")
@@ -51,17 +60,33 @@ class Chapter(Base):
 
 class Page(Base):
     __tablename__ = "page"
+    __table_args__ = (
+        Index("ix_page_chapter_index", "chapter_id", "index"),
+        Index("ix_page_content_hash", "content_hash"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     chapter_id = Column(Integer, ForeignKey("chapter.id"), nullable=False)
     index = Column(Integer, nullable=False)  # 1,2,3...
     image_url = Column(String(512), nullable=False)
+    # Filled in at ingest (app/media/inspect.py) for pages under the manga root
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    byte_size = Column(Integer, nullable=True)
+    placeholder = Column(Text, nullable=True)  # LQIP data URI
+    # sha256 of the image; for ingested pages, the blob.hash serving image_url
+    content_hash = Column(String(64), nullable=True)
 
     chapter = relationship("Chapter", back_populates="pages")
 
 
 class Comment(Base):
     __tablename__ = "comment"
+    __table_args__ = (
+        # Newest-first feeds keyset-paginate on (created_at, id)
+        Index("ix_comment_manga_created", "manga_id", "created_at", "id"),
+        Index("ix_comment_chapter_created", "chapter_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     manga_id = Column(Integer, ForeignKey("manga.id"), nullable=True)
@@ -76,6 +101,9 @@ class Comment(Base):
 
 class ReadingProgress(Base):
     __tablename__ = "reading_progress"
+    __table_args__ = (
+        Index("uq_reading_progress_user_manga", "user_token", "manga_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_token = Column(String(255), nullable=False, index=True)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, String
+
+from app.db.base import Base
+from app.db.models.manga_model import utc_now
+
+
+class SyncState(Base):
+    """Fingerprint of each manifest and chapter directory at its last ingest."""
+    __tablename__ = "sync_state"
+
+    key = Column(String(512), primary_key=True)  # "manga:<slug>" | "chapter:<slug>/<dir>"
+    fingerprint = Column(String(64), nullable=False)
+    synced_at = Column(DateTime(timezone=True), default=utc_now, onupdate=utc_now)
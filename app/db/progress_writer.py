@@ -0,0 +1,142 @@
+"""
+Reading-progress writes.
+
+Every save is a single ``INSERT ... ON CONFLICT (user_token, manga_id) DO
+UPDATE`` backed by the ``uq_reading_progress_user_manga`` index. In
+coalesced mode saves are held for ``settings.progress_flush_interval_seconds``
+and only the latest position per (user_token, manga_id) is written, so a
+burst of page flips becomes one row in one multi-row upsert. A delete
+leaves a tombstone, so a batch that was already being flushed doesn't
+bring the row back.
+"""
+import logging
+import threading
+from typing import Optional
+
+from sqlalchemy import and_, delete, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from app.db.counters import flush_forever
+from app.db.models.manga_model import ReadingProgress, utc_now
+from app.db.session import engine
+
+
+logger = logging.getLogger(__name__)
+
+INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+BATCH_SIZE = 1000
+
+
+def upsert_statement(dialect_name: str):
+    stmt = INSERTS[dialect_name](ReadingProgress)
+    return stmt.on_conflict_do_update(
+        index_elements=[ReadingProgress.user_token, ReadingProgress.manga_id],
+        set_={
+            "chapter_id": stmt.excluded.chapter_id,
+            "page_index": stmt.excluded.page_index,
+            "updated_at": stmt.excluded.updated_at,
+        },
+        # Another worker may flush an older position after ours; never go back.
+        where=or_(
+            ReadingProgress.updated_at.is_(None),
+            ReadingProgress.updated_at <= stmt.excluded.updated_at,
+        ),
+    )
+
+
+def progress_row(user_token: str, manga_id: int, chapter_id: int, page_index: int) -> dict:
+    return {
+        "user_token": user_token,
+        "manga_id": manga_id,
+        "chapter_id": chapter_id,
+        "page_index": page_index,
+        "updated_at": utc_now(),
+    }
+
+
+def upsert_progress(conn: Connection, rows: list[dict]) -> None:
+    """Upsert rows (unique per user_token/manga_id) in as few statements as possible."""
+    stmt = upsert_statement(conn.dialect.name)
+    for start in range(0, len(rows), BATCH_SIZE):
+        conn.execute(stmt.values(rows[start:start + BATCH_SIZE]))
+
+
+class ProgressCoalescer:
+    def __init__(self, bind: Engine):
+        self.bind = bind
+        self._pending: dict[tuple[str, int], dict] = {}
+        # Keys discarded since the current batch was taken
+        self._tombstones: set[tuple[str, int]] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, row: dict) -> None:
+        key = (row["user_token"], row["manga_id"])
+        with self._lock:
+            self._pending[key] = row
+            self._tombstones.discard(key)
+
+    def get(self, user_token: str, manga_id: int) -> Optional[dict]:
+        """Not-yet-flushed progress, so readers see their own writes."""
+        with self._lock:
+            return self._pending.get((user_token, manga_id))
+
+    def discard(self, user_token: str, manga_id: int) -> None:
+        """Drop pending progress; the caller deletes the stored row."""
+        with self._lock:
+            self._pending.pop((user_token, manga_id), None)
+            self._tombstones.add((user_token, manga_id))
+
+    def flush(self) -> int:
+        with self._lock:
+            batch = self._pending
+            self._pending = {}
+            self._tombstones = set()
+        if not batch:
+            return 0
+
+        with self._lock:
+            rows = [row for key, row in batch.items() if key not in self._tombstones]
+        try:
+            with self.bind.begin() as conn:
+                upsert_progress(conn, rows)
+        except IntegrityError:
+            # Some row points at a manga/chapter that doesn't exist. Write the
+            # rest one by one and drop the offenders.
+            for row in rows:
+                try:
+                    with self.bind.begin() as conn:
+                        upsert_progress(conn, [row])
+                except IntegrityError:
+                    logger.warning(
+                        "Dropping progress for missing manga/chapter %s/%s",
+                        row["manga_id"], row["chapter_id"],
+                    )
+        except Exception:
+            with self._lock:
+                for key, row in batch.items():
+                    if key not in self._tombstones:
+                        self._pending.setdefault(key, row)
+            raise
+
+        # Deleted while this batch was being written: the delete may have run first
+        with self._lock:
+            late = [key for key in batch if key in self._tombstones]
+        if late:
+            with self.bind.begin() as conn:
+                conn.execute(
+                    delete(ReadingProgress).where(
+                        or_(*(
+                            and_(ReadingProgress.user_token == token, ReadingProgress.manga_id == manga_id)
+                            for token, manga_id in late
+                        ))
+                    )
+                )
+        return len(rows)
+
+    async def run(self, interval: float) -> None:
+        await flush_forever(self.flush, interval)
+
+
+progress_coalescer = ProgressCoalescer(engine)
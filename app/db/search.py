@@ -0,0 +1,71 @@
+"""
+Indexed manga search.
+
+PostgreSQL: a generated ``search_vector`` tsvector column (title weighted
+above description) with a GIN index, plus a pg_trgm index on ``title`` for
+typo-tolerant matches. SQLite (local runs): an external-content FTS5 table
+kept in sync by triggers. Any other dialect falls back to ILIKE.
+
+The DDL lives in app/db/migrations/versions/0002_manga_search.py.
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import Double, Float, Integer, cast, false, func, literal_column, or_, text
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.models.manga_model import Manga
+
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+def tokenize(term: str) -> list[str]:
+    return TOKEN_PATTERN.findall(term.lower())
+
+
+def ranked_search(
+    q: Query, term: str, dialect_name: str
+) -> tuple[Query, Optional[ColumnElement]]:
+    """
+    Filter a Manga query by `term`. Returns the filtered (unordered) query and
+    a rank expression where lower sorts first, or None when the dialect has
+    no ranking and results fall back to id order.
+    """
+    tokens = tokenize(term)
+    if not tokens:
+        return q.filter(false()), None
+
+    if dialect_name == "postgresql":
+        # Prefix match on every token so results update as the user types.
+        tsquery = func.to_tsquery("simple", " & ".join(f"{t}:*" for t in tokens))
+        vector = literal_column("manga.search_vector")
+        score = func.ts_rank_cd(vector, tsquery) + func.similarity(Manga.title, term)
+        # Double so the value round-trips exactly through a pagination cursor.
+        rank = cast(-score, Double)
+        return q.filter(or_(vector.op("@@")(tsquery), Manga.title.op("%")(term))), rank
+
+    if dialect_name == "sqlite":
+        match = " ".join(f'"{t}"*' for t in tokens)
+        hits = (
+            text(
+                "SELECT rowid AS id, bm25(manga_fts, 10.0, 1.0) AS rank "
+                "FROM manga_fts WHERE manga_fts MATCH :match"
+            )
+            .bindparams(match=match)
+            .columns(id=Integer, rank=Float)
+            .subquery("manga_hits")
+        )
+        # bm25() is already lower-is-better.
+        return q.join(hits, hits.c.id == Manga.id), hits.c.rank
+
+    pattern = f"%{term}%"
+    return q.filter(or_(Manga.title.ilike(pattern), Manga.description.ilike(pattern))), None
+
+
+def apply_search(q: Query, term: str, dialect_name: str) -> Query:
+    """Filter a Manga query by `term` and order it by relevance (best first)."""
+    q, rank = ranked_search(q, term, dialect_name)
+    if rank is None:
+        return q.order_by(Manga.id)
+    return q.order_by(rank, Manga.id)
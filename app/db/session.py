@@ -2,10 +2,12 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db.pool import pool_options
 
 engine = create_engine(
     settings.db_url,
     future=True,
+    **pool_options(settings.db_url),
 )
 
 SessionLocal = sessionmaker(
@@ -1,62 +1,100 @@
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db, engine, SessionLocal
-from app.db.base import Base
+from app.db.counters import like_buffer
+from app.db.progress_writer import progress_coalescer
+from app.db.catalog import get_catalog_snapshot
 from app.core.config import settings
+from app.core.fast_json import FastJSONResponse
+from app.core.response_cache import etag_matches
+from app.core.rate_limit import RateLimitMiddleware, rate_limiter
+from app.core.warmup import warm_up
 import app.db.models  # noqa: F401
 
-from app.db.models.manga_model import Manga, Chapter, Page
-from app.routers import manga_routes, chapter_routes, progress_routes, admin_routes
+from app.routers import manga_routes, chapter_routes, progress_routes, admin_routes, asset_routes
 
+logger = logging.getLogger(__name__)
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    # Startup logic
-    Base.metadata.create_all(bind=engine)
+
+def prepare_database() -> None:
+    """Migrations or schema check, then demo data in development. Not run on fast start."""
+    from app.db.migrations import SchemaBehindError, check_schema, upgrade
+
+    if settings.should_auto_migrate:
+        upgrade(engine)
+    elif settings.schema_check != "off":
+        try:
+            check_schema(engine)
+        except SchemaBehindError as exc:
+            if settings.schema_check == "fail":
+                raise
+            logger.warning("%s", exc)
 
     # Only seed demo data in development
     if settings.env == "dev":
-        db = SessionLocal()
-        try:
-            if db.query(Manga).count() == 0:
-                demo = Manga(
-                    slug="demo-manga",
-                    title="Demo Manga",
-                    description="Placeholder manga for frontend dev.",
-                    cover_url="https://placehold.co/300x450",
-                    status="ongoing",
-                )
-                db.add(demo)
-                db.flush()
-
-                ch1 = Chapter(manga_id=demo.id, number=1, title="Chapter 1")
-                ch2 = Chapter(manga_id=demo.id, number=2, title="Chapter 2")
-                db.add_all([ch1, ch2])
-                db.flush()
-
-                # Add demo pages for each chapter
-                for ch in [ch1, ch2]:
-                    for i in range(1, 6):
-                        page = Page(
-                            chapter_id=ch.id,
-                            index=i,
-                            image_url=f"https://placehold.co/800x1200?text=Ch{ch.number}+Page{i}"
-                        )
-                        db.add(page)
-
-                db.commit()
-        finally:
-            db.close()
+        from app.db.demo import seed_demo
+
+        with SessionLocal() as db:
+            seed_demo(db)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup logic
+    warmup = None
+    if settings.should_fast_start:
+        if settings.schema_check == "fail":
+            # One indexed read of the migrations table; never serve a schema that is behind
+            from app.db.migrations import check_schema
+
+            check_schema(engine)
+        # Serve right away; see app/core/warmup.py
+        warmup = asyncio.create_task(warm_up(engine))
+    else:
+        prepare_database()
+
+    # Write-behind buffers: (buffer, flush task)
+    flushers = []
+    if settings.like_mode == "buffered":
+        flushers.append((like_buffer, like_buffer.run(settings.like_flush_interval_seconds)))
+    if settings.progress_mode == "coalesced":
+        flushers.append(
+            (progress_coalescer, progress_coalescer.run(settings.progress_flush_interval_seconds))
+        )
+    tasks = [(buffer, asyncio.create_task(run)) for buffer, run in flushers]
 
     yield  # App runs here
 
+    # Shutdown logic: stop the flush loops, then write what's left
+    if warmup is not None:
+        warmup.cancel()
+        with suppress(asyncio.CancelledError):
+            await warmup
+    for buffer, task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        buffer.flush()
+
+
+app = FastAPI(
+    title="Otaku Manga API",
+    version="0.1.0",
+    lifespan=lifespan,
+    # orjson for every route; the hot ones also skip the model round trip
+    default_response_class=FastJSONResponse,
+)
 
-app = FastAPI(title="Otaku Manga API", version="0.1.0", lifespan=lifespan)
+# Added before CORS so CORS wraps it and 429s still carry CORS headers
+if settings.rate_limit_enabled:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
 
 app.add_middleware(
     CORSMiddleware,
@@ -78,7 +116,35 @@ def db_health(db: Session = Depends(get_db)):
     return {"db": "ok" if result == 1 else "bad"}
 
 
-app.include_router(manga_routes.router)
-app.include_router(chapter_routes.router)
-app.include_router(progress_routes.router)
-app.include_router(admin_routes.router)
+@app.get("/manga/catalog.json")
+def catalog_json(request: Request, db: Session = Depends(get_db)):
+    # Precomputed, pre-gzipped snapshot; see app/db/catalog.py
+    snapshot = get_catalog_snapshot(db)
+    use_gzip = "gzip" in request.headers.get("accept-encoding", "")
+    etag = snapshot.gzip_etag if use_gzip else snapshot.etag
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+    if etag_matches(request, snapshot.etag) or etag_matches(request, snapshot.gzip_etag):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=snapshot.gzipped, media_type="application/json", headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+api_routers = [
+    manga_routes.router,
+    chapter_routes.router,
+    progress_routes.router,
+    admin_routes.router,
+]
+if settings.db_mode == "async":
+    from app.routers.async_routes import make_async_router
+
+    api_routers = [make_async_router(router) for router in api_routers]
+
+for router in api_routers:
+    app.include_router(router)
+
+# Catch-all for the manga/ tree; registered after /manga/catalog.json
+app.include_router(asset_routes.router)
@@ -0,0 +1,72 @@
+import argparse
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from app.media.renditions import MEDIA_TYPES, build_renditions
+
+
+def report(results: dict) -> None:
+    for slug, stats in results.items():
+        print(slug, " ".join(f"{k}={v}" for k, v in stats.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.media")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rend = sub.add_parser("renditions", help="build WebP/AVIF renditions of page images")
+    rend.add_argument("--root", default=settings.manga_root)
+    rend.add_argument("--widths", type=int, nargs="+", default=settings.rendition_widths)
+    rend.add_argument("--formats", nargs="+", choices=sorted(MEDIA_TYPES), default=settings.rendition_formats)
+    rend.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    sub.add_parser("inspect", help="fill in dimensions/size/placeholder for pages missing them")
+    ing = sub.add_parser("ingest", help="load catalog.json and <slug>/manifest.json into the database")
+    ing.add_argument("--root", default=settings.manga_root)
+    ing.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    ing.add_argument("--force", action="store_true", help="rescan every chapter, ignoring fingerprints")
+    ing.add_argument("--watch", action="store_true", help="keep running and sync changes as they happen")
+    ing.add_argument("--renditions", action="store_true", help="render new images as they are synced")
+    ing.add_argument("slugs", nargs="*", help="only these manga (default: all)")
+    gc = sub.add_parser("gc", help="delete blobs no page references")
+    gc.add_argument("--grace-seconds", type=float, default=3600, help="never delete files newer than this")
+    gc.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "renditions":
+        counts = build_renditions(Path(args.root), args.widths, args.formats, args.workers)
+        print(
+            f"rendered {counts['rendered']}, skipped {counts['skipped']} unchanged, "
+            f"failed {counts['failed']} in {time.perf_counter() - start:.1f}s"
+        )
+    elif args.command == "inspect":
+        from app.db.session import SessionLocal
+        from app.media.inspect import backfill_pages
+
+        with SessionLocal() as db:
+            updated = backfill_pages(db)
+        print(f"inspected {updated} pages in {time.perf_counter() - start:.1f}s")
+    elif args.command == "gc":
+        from app.db.session import SessionLocal
+        from app.media.blobs import blob_store, collect_garbage
+
+        with SessionLocal() as db:
+            stats = collect_garbage(db, blob_store(), args.grace_seconds, args.dry_run)
+        verb = "would delete" if args.dry_run else "deleted"
+        print(f"{verb} {stats['blobs']} blob rows, {stats['files']} files ({stats['bytes'] / 1e6:.1f} MB)")
+    else:
+        from app.db.session import SessionLocal
+        from app.media.ingest import ingest_tree, watch_tree
+
+        with SessionLocal() as db:
+            results = ingest_tree(db, Path(args.root), args.workers, args.slugs, args.force, args.renditions)
+            report(results)
+            print(f"synced {len(results)} manga in {time.perf_counter() - start:.1f}s")
+            if args.watch:
+                print(f"watching {args.root} for changes")
+                for results in watch_tree(db, Path(args.root), args.workers, args.renditions):
+                    report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Content-addressed store for page images.
+
+Each distinct image is kept once, at ``<manga_root>/_blobs/ab/<sha256>.<ext>``,
+and pages point at it by hash (``page.content_hash`` -> ``blob.hash``).
+A credits page or cover repeated across chapters is therefore stored,
+inspected and rendered once, and clients download it once: blob URLs never
+change content, so the asset route serves them as immutable.
+
+Blobs are added by the ingester and removed by ``collect_garbage`` once no
+page references them (``python -m app.media gc``). On PostgreSQL the two
+serialize on an advisory lock, so a collection cannot delete a blob an
+in-flight ingest is about to reference. Files newer than the grace period
+are never deleted, which covers ingests that stored a file but have not
+committed its row yet.
+
+A blob takes no extra space where the filesystem allows it
+(``settings.blob_storage``):
+
+- a copy-on-write clone (FICLONE: btrfs, XFS, bcachefs) shares the tree
+  file's extents until either side is written, so edits can't reach it;
+- otherwise a hard link, which shares the inode with the editable tree
+  file. Overwriting ``chN/001.png`` in place then changes the blob under
+  its old hash, so the ingester checks each changed file against the
+  chapter's previous blobs and drops one whose content no longer matches
+  (``drop_if_linked``) instead of serving it as immutable;
+- a plain copy across filesystems, or with ``blob_storage = "copy"``.
+"""
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from sqlalchemy import delete, exists, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.blob_model import Blob
+from app.db.models.manga_model import Page
+
+
+BLOB_LOCK_KEY = 0x6D616E6762  # "mangb"
+# ioctl(dest, FICLONE, src) from linux/fs.h
+FICLONE = 0x40049409
+
+logger = logging.getLogger(__name__)
+
+
+def _clone(source: Path, target: Path) -> bool:
+    """Copy-on-write clone of source at target; False where unsupported."""
+    if fcntl is None:
+        return False
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError:
+            pass
+    target.unlink()
+    return False
+
+
+def _link(source: Path, target: Path) -> bool:
+    try:
+        os.link(source, target)
+        return True
+    except OSError:
+        return False
+
+
+class BlobStore:
+    def __init__(self, root: Path):
+        self.root = root
+
+    @property
+    def directory(self) -> Path:
+        return self.root / settings.blobs_dir
+
+    def path(self, digest: str, suffix: str) -> Path:
+        return self.directory / digest[:2] / f"{digest}{suffix.lower()}"
+
+    def url(self, digest: str, suffix: str) -> str:
+        return f"/manga/{settings.blobs_dir}/{digest[:2]}/{digest}{suffix.lower()}"
+
+    def put(self, source: Path, digest: str) -> Path:
+        """Store source under its hash: a clone, a hard link or a copy. Idempotent."""
+        target = self.path(digest, source.suffix)
+        if target.exists():
+            return target
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        if settings.blob_storage == "copy" or not (_clone(source, tmp) or _link(source, tmp)):
+            shutil.copyfile(source, tmp)
+        os.replace(tmp, target)
+        return target
+
+    def drop_if_linked(self, source: Path, digest: str, previous: Iterable[tuple[str, str]]) -> int:
+        """
+        Delete the blobs among `previous` (hash, suffix) that are hard links
+        to source but are stored under a hash other than its current
+        `digest`: source was overwritten in place. Returns blobs dropped.
+        """
+        stat = source.stat()
+        if stat.st_nlink < 2:
+            return 0
+        dropped = 0
+        for old, suffix in previous:
+            path = self.path(old, suffix)
+            if old == digest or not path.exists() or not os.path.samestat(path.stat(), stat):
+                continue
+            logger.warning(
+                "%s was edited in place and changed blob %s; dropping it (`ingest --force` restores it "
+                "for other pages that still use it)", source, old,
+            )
+            path.unlink()
+            renditions = self.root / settings.renditions_dir / path.relative_to(self.root).with_suffix("")
+            shutil.rmtree(renditions, ignore_errors=True)
+            dropped += 1
+        return dropped
+
+    def files(self) -> Iterator[Path]:
+        if self.directory.exists():
+            yield from (p for p in self.directory.glob("*/*") if not p.name.endswith(".tmp"))
+
+
+def blob_store() -> BlobStore:
+    return BlobStore(Path(settings.manga_root))
+
+
+def lock_blobs(db: Session, shared: bool) -> None:
+    """Transaction-scoped lock: ingests take it shared, garbage collection exclusive."""
+    if db.get_bind().dialect.name == "postgresql":
+        fn = "pg_advisory_xact_lock_shared" if shared else "pg_advisory_xact_lock"
+        db.execute(text(f"SELECT {fn}(:key)"), {"key": BLOB_LOCK_KEY})
+
+
+def collect_garbage(db: Session, store: BlobStore, grace_seconds: float = 3600, dry_run: bool = False) -> dict:
+    """Delete blobs no page references, and stray files with no blob row."""
+    lock_blobs(db, shared=False)
+    unreferenced = ~exists().where(Page.content_hash == Blob.hash)
+    dead = db.execute(select(Blob.hash, Blob.suffix).where(unreferenced)).all()
+    if not dry_run and dead:
+        db.execute(delete(Blob).where(unreferenced))
+    known = set(db.execute(select(Blob.hash)).scalars()) - {row.hash for row in dead}
+
+    cutoff = time.time() - grace_seconds
+    removed_files = removed_bytes = 0
+    for path in store.files():
+        stat = path.stat()
+        if path.stem in known or max(stat.st_mtime, stat.st_ctime) > cutoff:
+            continue
+        removed_files += 1
+        removed_bytes += stat.st_size
+        if not dry_run:
+            path.unlink()
+            renditions = store.root / settings.renditions_dir / path.relative_to(store.root).with_suffix("")
+            shutil.rmtree(renditions, ignore_errors=True)
+    db.commit()
+    return {"blobs": len(dead), "files": removed_files, "bytes": removed_bytes}
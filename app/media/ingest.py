@@ -0,0 +1,424 @@
+"""
+Bulk loader for the ``manga/`` tree.
+
+Reads ``catalog.json`` and each ``<slug>/manifest.json``, hashes and
+inspects every page image in a process pool, and upserts Manga, Chapter
+and Page rows with executemany INSERT/UPDATE statements, one transaction
+per manga. Image scanning for later manga continues in the pool while
+earlier ones are written.
+
+Chapters are matched on (manga, number) and pages on (chapter, index);
+a page whose file hash and metadata are unchanged is not rewritten.
+Images are cloned, linked or copied into the content-addressed blob store,
+and pages point at the blob URL; see app/media/blobs.py.
+
+Syncs are incremental, at three levels:
+
+- a manga whose manifest/catalog entry and chapter directories all match
+  their stored fingerprints (sync_state) is skipped without touching
+  any image;
+- a chapter directory is fingerprinted by its file names, sizes and
+  mtimes, and only changed directories are scanned;
+- within a changed directory, an image whose content hash matches one of
+  the chapter's stored pages reuses that metadata and is not decoded again.
+
+``--watch`` keeps running and re-syncs the manga whose files change.
+``--renditions`` renders each new image while it is scanned, so a sync
+never needs a pass of ``python -m app.media renditions`` over the tree.
+
+    python -m app.media ingest --workers 8
+    python -m app.media ingest --watch --renditions
+"""
+import hashlib
+import json
+import re
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.aggregates import refresh_manga
+from app.db.models.blob_model import Blob
+from app.db.models.manga_model import Chapter, Manga, Page
+from app.db.models.sync_model import SyncState
+from app.media.blobs import BlobStore, lock_blobs
+from app.media.inspect import inspect_image
+from app.media.renditions import SOURCE_SUFFIXES, file_hash, render_source
+
+
+PAGE_FIELDS = ("image_url", "content_hash", "width", "height", "byte_size", "placeholder")
+
+
+@dataclass
+class ChapterSource:
+    number: int
+    title: Optional[str]
+    published_at: Optional[datetime]
+    files: list[Path]
+    key: str
+    fingerprint: str
+
+
+@dataclass
+class MangaSource:
+    slug: str
+    title: str
+    description: Optional[str]
+    cover_url: Optional[str]
+    status: Optional[str]
+    fingerprint: str
+    chapters: list[ChapterSource] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return f"manga:{self.slug}"
+
+
+def chapter_number(chapter_id: str) -> Optional[int]:
+    match = re.search(r"\d+", chapter_id)
+    return int(match.group()) if match else None
+
+
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    for fmt in ("%Y-%m-%d", "%b %Y", "%B %Y"):
+        try:
+            return datetime.strptime(value or "", fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+def directory_fingerprint(files: list[Path]) -> str:
+    """Changes when a file is added, removed, renamed or rewritten; needs only stat()."""
+    hasher = hashlib.sha256()
+    for path in files:
+        stat = path.stat()
+        hasher.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return hasher.hexdigest()
+
+
+def read_sources(root: Path, slugs: Optional[Iterable[str]] = None) -> list[MangaSource]:
+    """Manga described by catalog.json and/or a <slug>/manifest.json."""
+    catalog_path = root / "catalog.json"
+    catalog = json.loads(catalog_path.read_bytes()) if catalog_path.exists() else {"items": []}
+    entries = {item["id"]: item for item in catalog["items"]}
+    for manifest_path in root.glob("*/manifest.json"):
+        entries.setdefault(manifest_path.parent.name, {"id": manifest_path.parent.name})
+
+    wanted = set(slugs) if slugs else None
+    sources = []
+    for slug, item in sorted(entries.items()):
+        if wanted is not None and slug not in wanted:
+            continue
+        manifest_path = root / slug / "manifest.json"
+        raw = manifest_path.read_bytes() if manifest_path.exists() else b"{}"
+        manifest = json.loads(raw)
+        cover = item.get("cover")
+        source = MangaSource(
+            slug=slug,
+            title=manifest.get("title") or slug.replace("-", " ").title(),
+            description=manifest.get("description") or item.get("hook"),
+            # catalog.json covers are site-relative ("manga/<slug>/...")
+            cover_url="/" + cover.lstrip("/") if cover else None,
+            status=item.get("status"),
+            fingerprint=hashlib.sha256(raw + json.dumps(item, sort_keys=True).encode()).hexdigest(),
+        )
+        for ch in manifest.get("chapters", []):
+            number = chapter_number(ch["id"])
+            chapter_dir = root / slug / ch["id"]
+            if number is None or not chapter_dir.is_dir():
+                continue
+            files = sorted(p for p in chapter_dir.iterdir() if p.suffix.lower() in SOURCE_SUFFIXES)
+            source.chapters.append(
+                ChapterSource(
+                    number,
+                    ch.get("title"),
+                    parse_date(ch.get("date")),
+                    files,
+                    key=f"chapter:{slug}/{ch['id']}",
+                    fingerprint=directory_fingerprint(files),
+                )
+            )
+        sources.append(source)
+    return sources
+
+
+def scan_chapter(
+    root: str,
+    paths: list[str],
+    known: dict[str, dict],
+    widths: tuple[int, ...] = (),
+    formats: tuple[str, ...] = (),
+    reuse: bool = True,
+) -> tuple[list[dict], int]:
+    """
+    Hash, store and inspect one chapter's images. Runs in a worker process.
+    `known` maps content hash to the chapter's stored page fields; with
+    `reuse`, a known image reuses them instead of being decoded. With
+    `formats`, new images also get their renditions. Returns the pages and
+    the number of images rendered.
+    """
+    store = BlobStore(Path(root))
+    previous = [(digest, Path(fields["image_url"]).suffix) for digest, fields in known.items()]
+    pages = []
+    rendered = 0
+    for index, path in enumerate(paths, start=1):
+        path = Path(path)
+        digest = file_hash(path)
+        # A hard-linked blob edited through the tree no longer matches its hash
+        store.drop_if_linked(path, digest, previous)
+        blob = store.put(path, digest)
+        page = {"index": index, "image_url": store.url(digest, path.suffix), "content_hash": digest}
+        stored = known.get(digest) if reuse else None
+        if stored:
+            page.update((f, stored[f]) for f in ("width", "height", "byte_size", "placeholder"))
+        else:
+            info = inspect_image(path)
+            page.update(
+                width=info.width, height=info.height, byte_size=info.byte_size, placeholder=info.placeholder
+            )
+            if formats and render_source(root, str(blob), widths, formats, digest) == "rendered":
+                rendered += 1
+        pages.append(page)
+    return pages, rendered
+
+
+def stored_pages(db: Session, slug: str, numbers: Iterable[int]) -> dict[int, dict[str, dict]]:
+    """chapter number -> content hash -> page fields, for the given chapters of one manga."""
+    rows = db.execute(
+        select(Chapter.number, *(getattr(Page, f) for f in PAGE_FIELDS))
+        .join(Chapter, Chapter.id == Page.chapter_id)
+        .join(Manga, Manga.id == Chapter.manga_id)
+        .where(Manga.slug == slug, Chapter.number.in_(list(numbers)), Page.content_hash.is_not(None))
+    ).mappings()
+    pages: dict[int, dict[str, dict]] = {}
+    for row in rows:
+        pages.setdefault(row["number"], {})[row["content_hash"]] = dict(row)
+    return pages
+
+
+def insert_blobs(db: Session, pages: Iterable[dict]) -> int:
+    """Add blob rows for page images not yet recorded. Returns rows added."""
+    blobs = {
+        page["content_hash"]: {
+            "hash": page["content_hash"],
+            "suffix": Path(page["image_url"]).suffix,
+            "byte_size": page["byte_size"],
+        }
+        for page in pages
+    }
+    hashes = list(blobs)
+    for i in range(0, len(hashes), 500):
+        chunk = hashes[i:i + 500]
+        for digest in db.execute(select(Blob.hash).where(Blob.hash.in_(chunk))).scalars():
+            del blobs[digest]
+    if blobs:
+        db.execute(insert(Blob), list(blobs.values()))
+    return len(blobs)
+
+
+def save_fingerprints(db: Session, fingerprints: dict[str, str], stored: dict[str, str]) -> None:
+    rows = [{"key": key, "fingerprint": fp} for key, fp in fingerprints.items() if key not in stored]
+    if rows:
+        db.execute(insert(SyncState), rows)
+    rows = [
+        {"key": key, "fingerprint": fp}
+        for key, fp in fingerprints.items()
+        if key in stored and stored[key] != fp
+    ]
+    if rows:
+        db.execute(update(SyncState), rows)
+
+
+def upsert_manga(
+    db: Session,
+    source: MangaSource,
+    scanned: dict[int, list[dict]],
+    manifest_changed: bool = True,
+) -> dict[str, int]:
+    """
+    Write one manga, its chapters and pages. `scanned` maps chapter number
+    to scan_chapter output; chapters missing from it are left as they are.
+    Unless `manifest_changed`, manga metadata and chapter titles are only
+    checked for the scanned chapters. Rows are written only where they
+    differ. The caller commits.
+    """
+    stats = {"chapters_added": 0, "pages_added": 0, "pages_updated": 0, "pages_removed": 0}
+    # Keeps garbage collection from deleting blobs these pages are about to reference
+    lock_blobs(db, shared=True)
+    stats["blobs_added"] = insert_blobs(db, (page for pages in scanned.values() for page in pages))
+    values = {
+        "title": source.title,
+        "description": source.description,
+        "cover_url": source.cover_url,
+        "status": source.status,
+    }
+    current = db.execute(
+        select(Manga.id, *(getattr(Manga, f) for f in values)).where(Manga.slug == source.slug)
+    ).mappings().first()
+    if current is None:
+        manga_id = db.execute(
+            insert(Manga).values(slug=source.slug, **values).returning(Manga.id)
+        ).scalar()
+    else:
+        manga_id = current["id"]
+        if manifest_changed and any(current[f] != v for f, v in values.items()):
+            db.execute(update(Manga).where(Manga.id == manga_id).values(**values))
+
+    chapters = source.chapters if manifest_changed else [ch for ch in source.chapters if ch.number in scanned]
+    stored_chapters = {
+        row.number: row
+        for row in db.execute(
+            select(Chapter.number, Chapter.id, Chapter.title).where(
+                Chapter.manga_id == manga_id, Chapter.number.in_([ch.number for ch in chapters])
+            )
+        )
+    }
+    chapter_ids = {number: row.id for number, row in stored_chapters.items()}
+    new_chapters = [
+        {
+            "manga_id": manga_id,
+            "number": ch.number,
+            "title": ch.title,
+            **({"published_at": ch.published_at} if ch.published_at else {}),
+        }
+        for ch in chapters
+        if ch.number not in chapter_ids
+    ]
+    if new_chapters:
+        for number, chapter_id in db.execute(
+            insert(Chapter).returning(Chapter.number, Chapter.id), new_chapters
+        ).all():
+            chapter_ids[number] = chapter_id
+        stats["chapters_added"] = len(new_chapters)
+    titles = [
+        {"id": chapter_ids[ch.number], "title": ch.title}
+        for ch in chapters
+        if ch.title is not None and ch.number in stored_chapters and stored_chapters[ch.number].title != ch.title
+    ]
+    if titles:
+        db.execute(update(Chapter), titles)
+
+    existing: dict[tuple[int, int], dict] = {}
+    for row in db.execute(
+        select(Page.id, Page.chapter_id, Page.index, *(getattr(Page, f) for f in PAGE_FIELDS))
+        .join(Chapter, Chapter.id == Page.chapter_id)
+        .where(Chapter.manga_id == manga_id, Chapter.number.in_(list(scanned)))
+    ).mappings():
+        existing[(row["chapter_id"], row["index"])] = dict(row)
+
+    inserts, updates, stale = [], [], []
+    for ch in source.chapters:
+        if ch.number not in scanned:
+            continue
+        chapter_id = chapter_ids[ch.number]
+        pages = scanned[ch.number]
+        for page in pages:
+            current = existing.get((chapter_id, page["index"]))
+            if current is None:
+                inserts.append({"chapter_id": chapter_id, **page})
+            elif any(current[f] != page[f] for f in PAGE_FIELDS):
+                updates.append({"id": current["id"], **{f: page[f] for f in PAGE_FIELDS}})
+        stale.extend(
+            row["id"]
+            for (cid, index), row in existing.items()
+            if cid == chapter_id and index > len(pages)
+        )
+
+    if inserts:
+        db.execute(insert(Page), inserts)
+    if updates:
+        db.execute(update(Page), updates)
+    if stale:
+        db.execute(delete(Page).where(Page.id.in_(stale)))
+    stats.update(pages_added=len(inserts), pages_updated=len(updates), pages_removed=len(stale))
+    if new_chapters:
+        refresh_manga(db, [manga_id])
+    return stats
+
+
+def ingest_tree(
+    db: Session,
+    root: Path,
+    workers: Optional[int] = None,
+    slugs: Optional[Iterable[str]] = None,
+    force: bool = False,
+    renditions: bool = False,
+) -> dict[str, dict[str, int]]:
+    """
+    Sync every manga under root (or just `slugs`). `force` rescans every
+    chapter regardless of stored fingerprints. `renditions` renders the
+    new images as they are scanned (RENDITION_WIDTHS/RENDITION_FORMATS).
+    Returns per-slug counters.
+    """
+    widths = tuple(settings.rendition_widths) if renditions else ()
+    formats = tuple(settings.rendition_formats) if renditions else ()
+    sources = read_sources(root, slugs)
+    stored = dict(db.execute(select(SyncState.key, SyncState.fingerprint)).all())
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Queue every changed chapter up front so scanning runs ahead of the writes
+        jobs: list[tuple[MangaSource, dict[int, Future]]] = []
+        for source in sources:
+            changed = [
+                ch for ch in source.chapters
+                if force or stored.get(ch.key) != ch.fingerprint
+            ]
+            if not changed and stored.get(source.key) == source.fingerprint:
+                results[source.slug] = {"chapters_skipped": len(source.chapters)}
+                continue
+            known = stored_pages(db, source.slug, (ch.number for ch in changed))
+            futures = {}
+            for ch in changed:
+                paths = [str(p) for p in ch.files]
+                futures[ch.number] = pool.submit(
+                    scan_chapter, str(root), paths, known.get(ch.number, {}), widths, formats, not force
+                )
+            jobs.append((source, futures))
+
+        for source, futures in jobs:
+            scanned, rendered = {}, 0
+            for number, future in futures.items():
+                scanned[number], count = future.result()
+                rendered += count
+            manifest_changed = force or stored.get(source.key) != source.fingerprint
+            fingerprints = {source.key: source.fingerprint}
+            fingerprints.update((ch.key, ch.fingerprint) for ch in source.chapters if ch.number in scanned)
+            try:
+                stats = upsert_manga(db, source, scanned, manifest_changed)
+                save_fingerprints(db, fingerprints, stored)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            stats["chapters_skipped"] = len(source.chapters) - len(scanned)
+            if renditions:
+                stats["renditions"] = rendered
+            results[source.slug] = stats
+    return results
+
+
+def watch_tree(
+    db: Session, root: Path, workers: Optional[int] = None, renditions: bool = False
+) -> Iterator[dict[str, dict[str, int]]]:
+    """Re-sync the manga whose files change under root; yields each sync's results."""
+    from watchfiles import watch
+
+    root = root.resolve()
+    for changes in watch(root):
+        slugs = set()
+        for _, changed in changes:
+            parts = Path(changed).relative_to(root).parts
+            if not parts or parts[0] == settings.renditions_dir or any(p.startswith(".") for p in parts):
+                continue
+            if parts[0] == "catalog.json":
+                slugs = None
+                break
+            slugs.add(parts[0])
+        if slugs is None or slugs:
+            yield ingest_tree(db, root, workers, slugs, renditions=renditions)
@@ -0,0 +1,242 @@
+"""
+WebP/AVIF renditions of page images at several widths.
+
+Renditions of ``<root>/<slug>/chN/001.png`` are written under
+``<root>/_renditions/<slug>/chN/001/`` as ``<width>.<format>``, next to a
+``meta.json`` recording the source hash and what was produced. A source
+whose hash and settings match its meta.json is skipped, so re-running the
+pipeline over the whole tree only does work for new or changed pages.
+Because the output lives under the manga root, the asset route serves the
+renditions like any other file.
+
+    python -m app.media renditions --workers 8
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+SOURCE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+MEDIA_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+# Best first; used when negotiating on Accept
+FORMAT_PREFERENCE = ["avif", "webp"]
+QUALITY = {"webp": 80, "avif": 60}
+# Largest side each encoder accepts; bigger renditions of that format are skipped
+MAX_SIDE = {"webp": 16383, "avif": 65535}
+HASH_CHUNK = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Rendition:
+    url: str
+    width: int
+    height: int
+    format: str
+    bytes: int
+
+    @property
+    def media_type(self) -> str:
+        return MEDIA_TYPES[self.format]
+
+
+def file_hash(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def source_pages(root: Path) -> Iterator[Path]:
+    """
+    Page images under root. Once pages have been ingested into the blob
+    store (app/media/blobs.py) they reference blobs, so those are rendered
+    instead of the tree: one set of renditions per distinct image.
+    """
+    blobs = root / settings.blobs_dir
+    search = blobs if blobs.is_dir() else root
+    for path in sorted(search.rglob("*")):
+        relative = path.relative_to(root)
+        if relative.parts[0] == settings.renditions_dir or any(p.startswith(".") for p in relative.parts):
+            continue
+        if path.suffix.lower() in SOURCE_SUFFIXES and path.is_file():
+            yield path
+
+
+def rendition_dir(root: Path, source: Path) -> Path:
+    return root / settings.renditions_dir / source.relative_to(root).with_suffix("")
+
+
+def target_widths(source_width: int, widths: Iterable[int]) -> list[int]:
+    # Never upscale: widths above the source collapse to the source width
+    return sorted({min(w, source_width) for w in widths})
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def render_source(
+    root: str,
+    source: str,
+    widths: tuple[int, ...],
+    formats: tuple[str, ...],
+    digest: Optional[str] = None,
+) -> str:
+    """
+    Produce the renditions of one source image. Runs in a worker process,
+    so it takes and returns plain values. `digest` is the source's hash if
+    the caller already has it. Returns "skipped", "rendered" or "failed";
+    a failure is logged and leaves the other sources of a batch alone.
+    """
+    try:
+        return _render(Path(root), Path(source), widths, formats, digest)
+    except Exception:
+        logger.exception("Rendering %s failed", source)
+        return "failed"
+
+
+def _render(
+    root_path: Path,
+    source_path: Path,
+    widths: tuple[int, ...],
+    formats: tuple[str, ...],
+    digest: Optional[str],
+) -> str:
+    from PIL import Image
+
+    out_dir = rendition_dir(root_path, source_path)
+    meta_path = out_dir / "meta.json"
+    digest = digest or file_hash(source_path)
+    config = {"widths": sorted(widths), "formats": sorted(formats), "quality": QUALITY}
+
+    if meta_path.exists():
+        meta = json.loads(meta_path.read_bytes())
+        if (
+            meta.get("source") == digest
+            and meta.get("config") == config
+            and all((out_dir / r["file"]).exists() for r in meta["renditions"])
+        ):
+            return "skipped"
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    produced = []
+    with Image.open(source_path) as image:
+        image.load()
+        src_w, src_h = image.size
+        for width in target_widths(src_w, widths):
+            height = round(src_h * width / src_w)
+            fitting = [fmt for fmt in formats if max(width, height) <= MAX_SIDE[fmt]]
+            if not fitting:
+                continue
+            resized = image if width == src_w else image.resize((width, height), Image.LANCZOS)
+            for fmt in fitting:
+                buf = io.BytesIO()
+                resized.save(buf, format=fmt.upper(), quality=QUALITY[fmt])
+                name = f"{width}.{fmt}"
+                _write_atomic(out_dir / name, buf.getvalue())
+                produced.append(
+                    {"file": name, "width": width, "height": height, "format": fmt, "bytes": buf.tell()}
+                )
+
+    # Drop renditions left over from earlier settings
+    keep = {r["file"] for r in produced} | {"meta.json"}
+    for stale in out_dir.iterdir():
+        if stale.name not in keep and stale.is_file():
+            stale.unlink()
+
+    meta = {"source": digest, "width": src_w, "height": src_h, "config": config, "renditions": produced}
+    _write_atomic(meta_path, json.dumps(meta, indent=2).encode())
+    return "rendered"
+
+
+def build_renditions(
+    root: Path,
+    widths: Iterable[int],
+    formats: Iterable[str],
+    workers: Optional[int] = None,
+) -> dict[str, int]:
+    """Render every page under root in a process pool. Returns counts per outcome."""
+    # Only the CLI renders; keep multiprocessing out of the API's imports
+    from concurrent.futures import ProcessPoolExecutor
+
+    widths, formats = tuple(widths), tuple(formats)
+    sources = [str(p) for p in source_pages(root)]
+    counts = {"rendered": 0, "skipped": 0, "failed": 0}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(
+            render_source,
+            [str(root)] * len(sources),
+            sources,
+            [widths] * len(sources),
+            [formats] * len(sources),
+            chunksize=4,
+        )
+        for outcome in results:
+            counts[outcome] += 1
+    return counts
+
+
+# meta.json path -> (mtime_ns, renditions)
+_meta_cache = TTLCache(maxsize=100_000, ttl=300)
+
+
+def renditions_for(image_url: str) -> list[Rendition]:
+    """Renditions of a page served from the manga root (``/manga/...`` URLs)."""
+    if not image_url.startswith("/manga/"):
+        return []
+    # Plain string paths: this runs once per page of every chapter built
+    stem, _ = os.path.splitext(image_url.split("?", 1)[0][len("/manga/"):])
+    base = f"{settings.renditions_dir}/{stem}"
+    meta_path = os.path.join(settings.manga_root, base, "meta.json")
+    try:
+        mtime = os.stat(meta_path).st_mtime_ns
+    except OSError:
+        return []
+
+    cached = _meta_cache.get(meta_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(meta_path, "rb") as f:
+        meta = json.loads(f.read())
+    renditions = [
+        Rendition(
+            url=f"/manga/{base}/{r['file']}",
+            width=r["width"],
+            height=r["height"],
+            format=r["format"],
+            bytes=r["bytes"],
+        )
+        for r in meta["renditions"]
+    ]
+    _meta_cache.set(meta_path, (mtime, renditions))
+    return renditions
+
+
+def negotiate(renditions: list[Rendition], accept: str, width: Optional[int]) -> Optional[Rendition]:
+    """
+    Pick the rendition for an Accept header and optional target width: the
+    best accepted format, then the narrowest width >= target (or the widest).
+    """
+    for fmt in FORMAT_PREFERENCE:
+        if MEDIA_TYPES[fmt] not in accept:
+            continue
+        candidates = sorted((r for r in renditions if r.format == fmt), key=lambda r: r.width)
+        if not candidates:
+            continue
+        if width is None:
+            return candidates[-1]
+        return next((r for r in candidates if r.width >= width), candidates[-1])
+    return None
@@ -1,22 +1,30 @@
 from fastapi import APIRouter, Depends, Header, HTTPException
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, engine
+from app.db.pool import pool_status
+from app.db.aggregates import refresh_manga
+from app.db.catalog import invalidate_catalog
+from app.db.chapter_index import chapter_index
 from app.db.models.manga_model import Manga, Chapter, Page
 from app.core.config import settings
+from app.core.rate_limit import rate_limiter
+from app.core.response_cache import invalidate_chapter, invalidate_manga, invalidate_readers
+from app.media.inspect import page_image_info
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
-@router.post("/seed")
+def require_admin_key(x_admin_key: str = Header(...)):
+    if x_admin_key != settings.admin_seed_key:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@router.post("/seed", dependencies=[Depends(require_admin_key)])
 def seed_content(
     payload: dict,
-    x_admin_key: str = Header(...),
     db: Session = Depends(get_db),
 ):
-    if x_admin_key != settings.admin_seed_key:
-        raise HTTPException(status_code=403, detail="Forbidden")
-
     manga = Manga(**payload["manga"])
     db.add(manga)
     db.flush()
@@ -25,11 +33,50 @@ def seed_content(
     db.add(chapter)
     db.flush()
 
-    pages = [
-        Page(chapter_id=chapter.id, index=i + 1, image_url=url)
-        for i, url in enumerate(payload["pages"])
-    ]
+    pages = []
+    for i, url in enumerate(payload["pages"]):
+        page = Page(chapter_id=chapter.id, index=i + 1, image_url=url)
+        info = page_image_info(url)
+        if info:
+            page.width, page.height = info.width, info.height
+            page.byte_size, page.placeholder = info.byte_size, info.placeholder
+        pages.append(page)
     db.add_all(pages)
+    db.flush()
+    refresh_manga(db, [manga.id])
 
     db.commit()
+    invalidate_manga(manga.slug)
+    invalidate_chapter(chapter.id)
+    invalidate_readers()
+    invalidate_catalog()
+    chapter_index.invalidate_manga(manga.id)
     return {"manga_id": manga.id, "chapter_id": chapter.id, "pages": len(pages)}
+
+
+@router.get("/pool", dependencies=[Depends(require_admin_key)])
+def pool_stats():
+    """Live connection pool counters and checkout-wait histogram per engine."""
+    stats = {"sync": pool_status(engine.pool)}
+    if settings.db_mode == "async":
+        from app.db.async_session import get_async_engine
+
+        stats["async"] = pool_status(get_async_engine().pool)
+    return stats
+
+
+@router.get("/chapter-index", dependencies=[Depends(require_admin_key)])
+def chapter_index_stats():
+    """Hit/miss counters of the in-memory next/prev navigation index."""
+    return chapter_index.stats()
+
+
+@router.get("/rate-limit", dependencies=[Depends(require_admin_key)])
+def rate_limit_stats():
+    """Buckets held and requests rejected by this worker's rate limiter."""
+    return {
+        "buckets": len(rate_limiter),
+        "rejected": rate_limiter.rejected,
+        "budgets": settings.rate_limits,
+        "budgets_per_ip": settings.rate_limits_per_ip,
+    }
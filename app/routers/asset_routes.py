@@ -0,0 +1,112 @@
+"""
+Page images and manifests from the ``manga/`` tree.
+
+- Strong ETags derived from the file's content hash (computed once per
+  file version), with If-None-Match -> 304.
+- Range requests (via FileResponse), so interrupted downloads resume.
+- ``Cache-Control: immutable`` for blob URLs (content-addressed, see
+  app/media/blobs.py) and for URLs that carry the content version
+  (``?v=<version>``, see asset_version). Other URLs are cached briefly and
+  then revalidated.
+- A page image requested with an Accept header that lists image/avif or
+  image/webp is answered with the matching rendition when one has been
+  built (``python -m app.media renditions``); ``?w=`` picks the width.
+- Zero-copy delivery: FileResponse uses the ASGI ``pathsend`` extension
+  when the server offers it. Behind nginx, set ASSET_ACCEL_REDIRECT_PREFIX
+  and the body is handed to nginx's sendfile via X-Accel-Redirect.
+"""
+import hashlib
+import mimetypes
+import os
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.response_cache import etag_matches
+from app.media.renditions import negotiate, renditions_for
+
+
+router = APIRouter(tags=["assets"])
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+HASH_CHUNK = 1024 * 1024
+
+# (path, mtime_ns, size) -> content hash, so each file version is hashed once
+_hashes = TTLCache(maxsize=50_000, ttl=24 * 3600)
+
+
+def asset_root() -> Path:
+    return Path(settings.manga_root).resolve()
+
+
+def resolve_asset(asset_path: str) -> Path:
+    root = asset_root()
+    path = (root / asset_path).resolve()
+    if root not in path.parents or any(part.startswith(".") for part in path.relative_to(root).parts):
+        raise HTTPException(status_code=404, detail="Not found")
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="Not found")
+    return path
+
+
+def content_hash(path: Path, stat: Optional[os.stat_result] = None) -> str:
+    stat = stat or path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    digest = _hashes.get(key)
+    if digest is None:
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        _hashes.set(key, digest)
+    return digest
+
+
+def content_addressed(asset_path: str) -> bool:
+    """Blobs and their renditions: the URL changes whenever the content does."""
+    blobs = settings.blobs_dir + "/"
+    return asset_path.startswith(blobs) or asset_path.startswith(f"{settings.renditions_dir}/{blobs}")
+
+
+def asset_version(path: Path) -> str:
+    """Short content version to append as ?v= for immutable caching."""
+    return content_hash(path)[:16]
+
+
+@router.api_route("/manga/{asset_path:path}", methods=["GET", "HEAD"])
+def get_asset(asset_path: str, request: Request, w: Optional[int] = None):
+    path = resolve_asset(asset_path)
+    # Renditions are derived from the source, so the source's version
+    # covers them too
+    versioned = content_addressed(asset_path) or request.query_params.get("v") == asset_version(path)
+    vary = {}
+    renditions = renditions_for(f"/manga/{asset_path}")
+    if renditions:
+        vary = {"Vary": "Accept"}
+        chosen = negotiate(renditions, request.headers.get("accept", ""), w)
+        if chosen is not None:
+            path = resolve_asset(chosen.url[len("/manga/"):])
+    stat = path.stat()
+    etag = f'"{content_hash(path, stat)[:32]}"'
+
+    headers = {
+        **vary,
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE if versioned else f"public, max-age={settings.asset_max_age_seconds}",
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    if settings.asset_accel_redirect_prefix:
+        # nginx serves the bytes (sendfile, Range) from its internal location
+        relative = path.relative_to(asset_root()).as_posix()
+        headers["X-Accel-Redirect"] = settings.asset_accel_redirect_prefix.rstrip("/") + "/" + relative
+        headers["Content-Type"] = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        return Response(headers=headers)
+
+    return FileResponse(path, headers=headers, stat_result=stat)
@@ -0,0 +1,185 @@
+"""
+Async variants of the API routers (settings.db_mode == "async").
+
+The hot read routes (manga detail, chapter, reader, prefetch manifest) have
+native ``async def`` versions below, registered in place of their sync
+counterparts: queries go through ``await db.execute(...)`` and the
+filesystem work a cache miss needs (rendition meta.json reads, one stat()
+per page) runs in the threadpool, so the event loop only ever waits on
+the database driver.
+
+Every other route is re-registered as an ``async def`` endpoint whose
+``get_db`` dependency is swapped for an ``AsyncSession`` and whose own body
+runs through ``AsyncSession.run_sync``: the ORM code is unchanged and each
+round trip goes through the async driver, but the rest of the body
+(comment moderation, the write buffers' locks) runs on the event loop
+thread. Those routes are writes or rarely hit; port one to a native
+handler here if it shows up in ``python -m benchmarks.bench_async``.
+"""
+import inspect
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.params import Depends as DependsParam
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from starlette.concurrency import run_in_threadpool
+
+from app.core.response_cache import cached_response_async, response_cache
+from app.db.async_session import get_async_db
+from app.db.chapter_index import chapter_index
+from app.db.models.manga_model import Chapter, Manga
+from app.db.session import get_db
+from app.routers import chapter_routes, manga_routes
+from app.routers.chapter_routes import (
+    PrefetchManifest,
+    add_prefetch_links,
+    chapter_detail_dict,
+    chapter_reader_dict,
+    chapter_renditions,
+    make_prefetch_manifest,
+    prefetch_pages_statement,
+)
+from app.schemas.manga_schema import manga_detail_dict
+
+
+# --- Native async versions of the hot read routes ---
+async def get_manga(slug: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def build():
+        result = await db.execute(select(Manga).options(selectinload(Manga.chapters)).where(Manga.slug == slug))
+        manga = result.scalar_one_or_none()
+        if not manga:
+            raise HTTPException(status_code=404, detail="Manga not found")
+        return manga_detail_dict(manga)
+
+    return await cached_response_async(response_cache, request, ("manga", slug), build)
+
+
+async def get_chapter(chapter_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def build():
+        result = await db.execute(select(Chapter).options(selectinload(Chapter.pages)).where(Chapter.id == chapter_id))
+        chapter = result.scalar_one_or_none()
+        if not chapter:
+            raise HTTPException(status_code=404, detail="Chapter not found")
+        return chapter_detail_dict(chapter, await run_in_threadpool(chapter_renditions, chapter))
+
+    response = await cached_response_async(response_cache, request, ("chapter", chapter_id), build)
+    return add_prefetch_links(response, await prefetch_manifest(db, chapter_id))
+
+
+async def get_chapter_reader(chapter_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Everything the reader needs to open a chapter: pages, manga, prev/next."""
+    async def build():
+        result = await db.execute(
+            select(Chapter)
+            .options(joinedload(Chapter.manga), selectinload(Chapter.pages))
+            .where(Chapter.id == chapter_id)
+        )
+        chapter = result.scalar_one_or_none()
+        if not chapter:
+            raise HTTPException(status_code=404, detail="Chapter not found")
+        prev_ch, next_ch = await chapter_index.neighbours_async(db, chapter.id)
+        renditions = await run_in_threadpool(chapter_renditions, chapter)
+        return chapter_reader_dict(chapter, prev_ch, next_ch, renditions)
+
+    response = await cached_response_async(response_cache, request, ("reader", chapter_id), build)
+    return add_prefetch_links(response, await prefetch_manifest(db, chapter_id))
+
+
+async def get_prefetch_manifest(chapter_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Page URLs and sizes of the next chapter, for background download."""
+    return await prefetch_manifest(db, chapter_id)
+
+
+async def prefetch_manifest(db: AsyncSession, chapter_id: int) -> PrefetchManifest:
+    """chapter_routes.prefetch_manifest() on an AsyncSession, sharing its cache entry."""
+    key = ("prefetch", chapter_id)
+    manifest = response_cache.get(key)
+    if manifest is not None:
+        return manifest
+
+    neighbours = await chapter_index.neighbours_async(db, chapter_id)
+    if neighbours is None:
+        raise HTTPException(status_code=404, detail="Chapter not found")
+    next_ch = neighbours[1]
+    rows = (await db.execute(prefetch_pages_statement(next_ch.id))).all() if next_ch else []
+    manifest = make_prefetch_manifest(chapter_id, next_ch, rows)
+    response_cache.set(key, manifest)
+    return manifest
+
+
+# Sync endpoint -> native async replacement
+NATIVE_ENDPOINTS = {
+    manga_routes.get_manga: get_manga,
+    chapter_routes.get_chapter: get_chapter,
+    chapter_routes.get_chapter_reader: get_chapter_reader,
+    chapter_routes.get_prefetch_manifest: get_prefetch_manifest,
+}
+
+
+def session_param(endpoint) -> str | None:
+    for param in inspect.signature(endpoint).parameters.values():
+        if isinstance(param.default, DependsParam) and param.default.dependency is get_db:
+            return param.name
+    return None
+
+
+def make_async_endpoint(route: APIRoute, db_param: str):
+    adapter = TypeAdapter(route.response_model) if route.response_model else None
+
+    def call(sync_db, kwargs):
+        result = route.endpoint(**kwargs, **{db_param: sync_db})
+        if adapter is None or isinstance(result, Response):
+            return result
+        return adapter.validate_python(result, from_attributes=True)
+
+    async def endpoint(**kwargs):
+        db: AsyncSession = kwargs.pop(db_param)
+        return await db.run_sync(call, kwargs)
+
+    signature = inspect.signature(route.endpoint)
+    endpoint.__signature__ = signature.replace(
+        parameters=[
+            param.replace(default=Depends(get_async_db), annotation=AsyncSession)
+            if param.name == db_param
+            else param
+            for param in signature.parameters.values()
+        ]
+    )
+    endpoint.__name__ = route.endpoint.__name__
+    endpoint.__doc__ = route.endpoint.__doc__
+    return endpoint
+
+
+def make_async_router(sync_router: APIRouter) -> APIRouter:
+    router = APIRouter()
+    for route in sync_router.routes:
+        if not isinstance(route, APIRoute):
+            router.routes.append(route)
+            continue
+        endpoint = NATIVE_ENDPOINTS.get(route.endpoint)
+        if endpoint is None:
+            db_param = session_param(route.endpoint)
+            endpoint = make_async_endpoint(route, db_param) if db_param else route.endpoint
+        extra = {}
+        if not isinstance(route.response_class, DefaultPlaceholder):
+            extra["response_class"] = route.response_class
+        router.add_api_route(
+            route.path,
+            endpoint,
+            methods=list(route.methods),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            responses=route.responses,
+            name=route.name,
+            include_in_schema=route.include_in_schema,
+            **extra,
+        )
+    return router
@@ -1,34 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, selectinload
 from datetime import datetime
-from pydantic import BaseModel, field_validator
-from typing import List, Optional
-import re
+from pydantic import BaseModel
+from typing import List, Literal, Optional, Union
 
 from app.db.session import get_db
-from app.db.models.manga_model import Chapter, Page, Comment
+from app.db.models.manga_model import Chapter, Manga, Page, Comment
+from app.db.aggregates import add_comments
+from app.db.counters import increment_now, like_buffer
+from app.db.chapter_index import chapter_index
+from app.schemas.comment_schema import CommentCreate
+from app.core.config import settings
+from app.core.response_cache import cached_response, invalidate_manga, response_cache
+from app.core.pagination import keyset_page
+from app.media.renditions import MEDIA_TYPES, Rendition, renditions_for
 
 
-# --- Comment Validation Constants ---
-COMMENT_MIN_LENGTH = 2
-COMMENT_MAX_LENGTH = 2000
-# URL pattern to detect links
-URL_PATTERN = re.compile(
-    r'(https?://|www\.|[a-zA-Z0-9-]+\.(com|org|net|io|co|dev|app|xyz|info|biz|me))',
-    re.IGNORECASE
-)
+# --- Schemas ---
+class RenditionOut(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str
+    bytes: int
+
+    class Config:
+        from_attributes = True
 
 
-# --- Schemas ---
 class PageOut(BaseModel):
     id: int
     index: int
     image_url: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    byte_size: Optional[int] = None
+    placeholder: Optional[str] = None
+
+    # Resolved once per chapter by chapter_renditions
+    renditions: List[RenditionOut] = []
+    # Media type -> srcset string, for <picture><source type=... srcset=...>
+    srcset: dict[str, str] = {}
 
     class Config:
         from_attributes = True
 
 
+def srcset_for(renditions) -> dict[str, str]:
+    by_type: dict[str, list[str]] = {}
+    for r in renditions:
+        by_type.setdefault(MEDIA_TYPES[r.format], []).append(f"{r.url} {r.width}w")
+    return {media_type: ", ".join(entries) for media_type, entries in by_type.items()}
+
+
 class ChapterDetailOut(BaseModel):
     id: int
     number: int
@@ -48,37 +73,38 @@ class ChapterNav(BaseModel):
         from_attributes = True
 
 
-class LikeResponse(BaseModel):
-    like_count: int
+class ReaderMangaOut(BaseModel):
+    id: int
+    slug: str
+    title: str
 
+    class Config:
+        from_attributes = True
+
+
+class ChapterReaderOut(ChapterDetailOut):
+    manga: ReaderMangaOut
+    prev: Optional[ChapterNav] = None
+    next: Optional[ChapterNav] = None
+
+
+class PrefetchPage(BaseModel):
+    index: int
+    url: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    byte_size: Optional[int] = None
 
-class CommentCreate(BaseModel):
-    user_name: str = "Anonymous"
-    text: str
-    # Honeypot field - if this is filled, the request is likely a bot
-    website: Optional[str] = None
-
-    @field_validator('text')
-    @classmethod
-    def validate_text(cls, v: str) -> str:
-        v = v.strip()
-        if len(v) < COMMENT_MIN_LENGTH:
-            raise ValueError(f'Comment must be at least {COMMENT_MIN_LENGTH} characters')
-        if len(v) > COMMENT_MAX_LENGTH:
-            raise ValueError(f'Comment must not exceed {COMMENT_MAX_LENGTH} characters')
-        if URL_PATTERN.search(v):
-            raise ValueError('Links are not allowed in comments')
-        return v
-
-    @field_validator('user_name')
-    @classmethod
-    def validate_user_name(cls, v: str) -> str:
-        v = v.strip() if v else "Anonymous"
-        if len(v) > 50:
-            raise ValueError('Username must not exceed 50 characters')
-        if URL_PATTERN.search(v):
-            raise ValueError('Links are not allowed in username')
-        return v if v else "Anonymous"
+
+class PrefetchManifest(BaseModel):
+    chapter_id: int
+    next: Optional[ChapterNav] = None
+    pages: List[PrefetchPage]
+    total_bytes: Optional[int] = None
+
+
+class LikeResponse(BaseModel):
+    like_count: int
 
 
 class CommentOut(BaseModel):
@@ -91,96 +117,238 @@ class CommentOut(BaseModel):
         from_attributes = True
 
 
+class CommentPage(BaseModel):
+    items: list[CommentOut]
+    next_cursor: Optional[str] = None
+    has_more: bool
+
+
+def chapter_renditions(chapter) -> list[list[Rendition]]:
+    """
+    Each page's renditions, in page order. Resolved once per chapter and
+    kept next to its responses, so the chapter and reader builds share one
+    meta.json lookup per page; invalidate_chapter drops it.
+    """
+    key = ("renditions", chapter.id)
+    renditions = response_cache.get(key)
+    if renditions is None:
+        renditions = [renditions_for(page.image_url) for page in chapter.pages]
+        response_cache.set(key, renditions)
+    return renditions
+
+
+# Row -> dict serializers for the chapter and reader routes; see
+# app/core/fast_json.py and tests/test_serializers.py.
+def page_dict(page, renditions: list[Rendition]) -> dict:
+    return {
+        "id": page.id,
+        "index": page.index,
+        "image_url": page.image_url,
+        "width": page.width,
+        "height": page.height,
+        "byte_size": page.byte_size,
+        "placeholder": page.placeholder,
+        "renditions": [
+            {"url": r.url, "width": r.width, "height": r.height, "format": r.format, "bytes": r.bytes}
+            for r in renditions
+        ],
+        "srcset": srcset_for(renditions),
+    }
+
+
+def nav_dict(chapter) -> Optional[dict]:
+    if chapter is None:
+        return None
+    return {"id": chapter.id, "number": chapter.number, "title": chapter.title}
+
+
+def chapter_detail_dict(chapter, renditions: Optional[list[list[Rendition]]] = None) -> dict:
+    """`renditions` defaults to chapter_renditions(chapter)."""
+    if renditions is None:
+        renditions = chapter_renditions(chapter)
+    return {
+        "id": chapter.id,
+        "number": chapter.number,
+        "title": chapter.title,
+        "pages": [page_dict(p, r) for p, r in zip(chapter.pages, renditions)],
+    }
+
+
 router = APIRouter(prefix="/api/v1/chapters", tags=["chapters"])
 
 
-@router.get("/{chapter_id}", response_model=ChapterDetailOut)
-def get_chapter(chapter_id: int, db: Session = Depends(get_db)):
-    chapter = (
-        db.query(Chapter)
-        .filter(Chapter.id == chapter_id)
-        .first()
-    )
-    if not chapter:
+def chapter_reader_dict(chapter, prev_ch, next_ch, renditions: Optional[list[list[Rendition]]] = None) -> dict:
+    manga = chapter.manga
+    return {
+        **chapter_detail_dict(chapter, renditions),
+        "manga": {"id": manga.id, "slug": manga.slug, "title": manga.title},
+        "prev": nav_dict(prev_ch),
+        "next": nav_dict(next_ch),
+    }
+
+
+def prefetch_manifest(db: Session, chapter_id: int) -> PrefetchManifest:
+    """Pages of the chapter after `chapter_id`, cached next to its responses."""
+    key = ("prefetch", chapter_id)
+    manifest = response_cache.get(key)
+    if manifest is not None:
+        return manifest
+
+    neighbours = chapter_index.neighbours(db, chapter_id)
+    if neighbours is None:
         raise HTTPException(status_code=404, detail="Chapter not found")
-    return chapter
+    next_ch = neighbours[1]
+    rows = db.execute(prefetch_pages_statement(next_ch.id)).all() if next_ch else []
+    manifest = make_prefetch_manifest(chapter_id, next_ch, rows)
+    response_cache.set(key, manifest)
+    return manifest
+
+
+def prefetch_pages_statement(chapter_id: int):
+    return (
+        select(Page.index, Page.image_url, Page.width, Page.height, Page.byte_size)
+        .where(Page.chapter_id == chapter_id)
+        .order_by(Page.index)
+    )
+
+
+def make_prefetch_manifest(chapter_id: int, next_ch, rows) -> PrefetchManifest:
+    pages = [
+        PrefetchPage(index=r.index, url=r.image_url, width=r.width, height=r.height, byte_size=r.byte_size)
+        for r in rows
+    ]
+    sizes = [p.byte_size for p in pages]
+    return PrefetchManifest(
+        chapter_id=chapter_id,
+        next=ChapterNav.model_validate(next_ch) if next_ch else None,
+        pages=pages,
+        total_bytes=sum(sizes) if pages and None not in sizes else None,
+    )
+
+
+def add_prefetch_links(response: Response, manifest: PrefetchManifest) -> Response:
+    """Hint the first pages of the next chapter so they download while this one is read."""
+    pages = manifest.pages[: settings.prefetch_link_pages]
+    if pages:
+        response.headers["Link"] = ", ".join(f"<{p.url}>; rel=prefetch; as=image" for p in pages)
+    return response
+
+
+def with_prefetch_links(response: Response, db: Session, chapter_id: int) -> Response:
+    return add_prefetch_links(response, prefetch_manifest(db, chapter_id))
+
+
+@router.get("/{chapter_id}", response_model=ChapterDetailOut)
+def get_chapter(chapter_id: int, request: Request, db: Session = Depends(get_db)):
+    def build():
+        # Pages in one extra SELECT ... IN, ordered by index
+        chapter = (
+            db.query(Chapter)
+            .options(selectinload(Chapter.pages))
+            .filter(Chapter.id == chapter_id)
+            .first()
+        )
+        if not chapter:
+            raise HTTPException(status_code=404, detail="Chapter not found")
+        return chapter_detail_dict(chapter)
+
+    response = cached_response(response_cache, request, ("chapter", chapter_id), build)
+    return with_prefetch_links(response, db, chapter_id)
+
+
+@router.get("/{chapter_id}/reader", response_model=ChapterReaderOut)
+def get_chapter_reader(chapter_id: int, request: Request, db: Session = Depends(get_db)):
+    """Everything the reader needs to open a chapter: pages, manga, prev/next."""
+    def build():
+        chapter = (
+            db.query(Chapter)
+            .options(joinedload(Chapter.manga), selectinload(Chapter.pages))
+            .filter(Chapter.id == chapter_id)
+            .first()
+        )
+        if not chapter:
+            raise HTTPException(status_code=404, detail="Chapter not found")
+
+        prev_ch, next_ch = chapter_index.neighbours(db, chapter.id)
+        return chapter_reader_dict(chapter, prev_ch, next_ch)
+
+    response = cached_response(response_cache, request, ("reader", chapter_id), build)
+    return with_prefetch_links(response, db, chapter_id)
+
+
+@router.get("/{chapter_id}/prefetch", response_model=PrefetchManifest)
+def get_prefetch_manifest(chapter_id: int, db: Session = Depends(get_db)):
+    """Page URLs and sizes of the next chapter, for background download."""
+    return prefetch_manifest(db, chapter_id)
 
 
 @router.post("/{chapter_id}/like", response_model=LikeResponse)
 def like_chapter(chapter_id: int, db: Session = Depends(get_db)):
-    chapter = db.query(Chapter).filter(Chapter.id == chapter_id).first()
+    if settings.like_mode == "atomic":
+        like_count = increment_now(db, "chapter", Chapter.id == chapter_id)
+        if like_count is None:
+            raise HTTPException(status_code=404, detail="Chapter not found")
+        return LikeResponse(like_count=like_count)
+
+    chapter = db.query(Chapter.id, Chapter.like_count).filter(Chapter.id == chapter_id).first()
     if not chapter:
         raise HTTPException(status_code=404, detail="Chapter not found")
 
-    chapter.like_count = (chapter.like_count or 0) + 1
-    db.commit()
-    db.refresh(chapter)
-
-    return LikeResponse(like_count=chapter.like_count)
+    # Acknowledge now; the buffer flushes to the DB in the background
+    like_buffer.add("chapter", chapter.id)
+    return LikeResponse(
+        like_count=(chapter.like_count or 0) + like_buffer.pending("chapter", chapter.id)
+    )
 
 
 @router.get("/{chapter_id}/next", response_model=Optional[ChapterNav])
 def get_next_chapter(chapter_id: int, db: Session = Depends(get_db)):
-    current = db.query(Chapter).filter(Chapter.id == chapter_id).first()
-    if not current:
+    # Served from the in-memory ordering index; see app/db/chapter_index.py
+    neighbours = chapter_index.neighbours(db, chapter_id)
+    if neighbours is None:
         raise HTTPException(status_code=404, detail="Chapter not found")
-
-    next_ch = (
-        db.query(Chapter)
-        .filter(
-            Chapter.manga_id == current.manga_id,
-            Chapter.number > current.number
-        )
-        .order_by(Chapter.number.asc())
-        .first()
-    )
-
-    if not next_ch:
-        return None
-    return next_ch
+    return neighbours[1]
 
 
 @router.get("/{chapter_id}/prev", response_model=Optional[ChapterNav])
 def get_prev_chapter(chapter_id: int, db: Session = Depends(get_db)):
-    current = db.query(Chapter).filter(Chapter.id == chapter_id).first()
-    if not current:
+    neighbours = chapter_index.neighbours(db, chapter_id)
+    if neighbours is None:
         raise HTTPException(status_code=404, detail="Chapter not found")
-
-    prev_ch = (
-        db.query(Chapter)
-        .filter(
-            Chapter.manga_id == current.manga_id,
-            Chapter.number < current.number
-        )
-        .order_by(Chapter.number.desc())
-        .first()
-    )
-
-    if not prev_ch:
-        return None
-    return prev_ch
+    return neighbours[0]
 
 
-@router.get("/{chapter_id}/comments", response_model=list[CommentOut])
+@router.get("/{chapter_id}/comments", response_model=Union[list[CommentOut], CommentPage])
 def get_chapter_comments(
     chapter_id: int,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    mode: Literal["page", "cursor"] = "page",
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
     chapter = db.query(Chapter).filter(Chapter.id == chapter_id).first()
     if not chapter:
         raise HTTPException(status_code=404, detail="Chapter not found")
 
-    comments = (
-        db.query(Comment)
-        .filter(Comment.chapter_id == chapter_id)
-        .order_by(Comment.created_at.desc())
+    q = db.query(Comment).filter(Comment.chapter_id == chapter_id)
+
+    if mode == "cursor" or cursor is not None:
+        items, next_cursor = keyset_page(
+            q,
+            (Comment.created_at, Comment.id),
+            cursor,
+            (datetime.fromisoformat, int),
+            page_size,
+        )
+        return CommentPage(items=items, next_cursor=next_cursor, has_more=next_cursor is not None)
+
+    return (
+        q.order_by(Comment.created_at.desc(), Comment.id.desc())
         .offset((page - 1) * page_size)
         .limit(page_size)
         .all()
     )
-    return comments
 
 
 @router.post("/{chapter_id}/comments", response_model=CommentOut, status_code=201)
@@ -202,8 +370,11 @@ def create_chapter_comment(
         fake_comment.created_at = datetime.now()
         return fake_comment
 
-    chapter = db.query(Chapter).filter(Chapter.id == chapter_id).first()
-    if not chapter:
+    # The manga page lists this chapter's comment_count, so its cache entry goes too
+    manga_slug = (
+        db.query(Manga.slug).join(Chapter, Chapter.manga_id == Manga.id).filter(Chapter.id == chapter_id).scalar()
+    )
+    if manga_slug is None:
         raise HTTPException(status_code=404, detail="Chapter not found")
 
     comment = Comment(
@@ -212,7 +383,9 @@ def create_chapter_comment(
         text=comment_data.text,
     )
     db.add(comment)
+    add_comments(db, "chapter", chapter_id)
     db.commit()
+    invalidate_manga(manga_slug)
     db.refresh(comment)
 
     return comment
@@ -1,23 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Header
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Request
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, or_
+from typing import Literal, Optional, Union
 from datetime import datetime
-from pydantic import BaseModel, field_validator
-import re
+from pydantic import BaseModel
 
 from app.db.session import get_db
 from app.db.models.manga_model import Manga, Comment
-from app.schemas.manga_schema import MangaSummary, MangaDetail
-
-
-# --- Comment Validation Constants ---
-COMMENT_MIN_LENGTH = 2
-COMMENT_MAX_LENGTH = 2000
-URL_PATTERN = re.compile(
-    r'(https?://|www\.|[a-zA-Z0-9-]+\.(com|org|net|io|co|dev|app|xyz|info|biz|me))',
-    re.IGNORECASE
-)
+from app.db.search import apply_search, ranked_search
+from app.db.aggregates import add_comments
+from app.db.counters import increment_now, like_buffer
+from app.schemas.manga_schema import MangaSummary, MangaDetail, manga_detail_dict, manga_summary_dict
+from app.schemas.comment_schema import CommentCreate
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.fast_json import FastJSONResponse
+from app.core.pagination import encode_cursor, decode_cursor, keyset_page
+from app.core.response_cache import cached_response, invalidate_manga, response_cache
 
 
 router = APIRouter(
@@ -25,6 +24,21 @@ router = APIRouter(
     tags=["manga"],
 )
 
+# Columns behind MangaSummary; list pages load these rather than whole entities
+SUMMARY_COLUMNS = (
+    Manga.id,
+    Manga.slug,
+    Manga.title,
+    Manga.description,
+    Manga.cover_url,
+    Manga.comment_count,
+    Manga.chapter_count,
+    Manga.latest_chapter_number,
+)
+
+# Totals for cursor mode, keyed by normalized search term ("" = whole catalog)
+total_cache = TTLCache(maxsize=512, ttl=settings.count_cache_ttl_seconds)
+
 
 # --- Schemas for this router ---
 class PaginatedMangaResponse(BaseModel):
@@ -35,37 +49,16 @@ class PaginatedMangaResponse(BaseModel):
     pages: int
 
 
-class LikeResponse(BaseModel):
-    like_count: int
+class CursorMangaResponse(BaseModel):
+    items: list[MangaSummary]
+    next_cursor: Optional[str] = None
+    page_size: int
+    # Only filled when include_total=true; may lag by count_cache_ttl_seconds
+    total: Optional[int] = None
 
 
-class CommentCreate(BaseModel):
-    user_name: str = "Anonymous"
-    text: str
-    # Honeypot field - if filled, likely a bot
-    website: Optional[str] = None
-
-    @field_validator('text')
-    @classmethod
-    def validate_text(cls, v: str) -> str:
-        v = v.strip()
-        if len(v) < COMMENT_MIN_LENGTH:
-            raise ValueError(f'Comment must be at least {COMMENT_MIN_LENGTH} characters')
-        if len(v) > COMMENT_MAX_LENGTH:
-            raise ValueError(f'Comment must not exceed {COMMENT_MAX_LENGTH} characters')
-        if URL_PATTERN.search(v):
-            raise ValueError('Links are not allowed in comments')
-        return v
-
-    @field_validator('user_name')
-    @classmethod
-    def validate_user_name(cls, v: str) -> str:
-        v = v.strip() if v else "Anonymous"
-        if len(v) > 50:
-            raise ValueError('Username must not exceed 50 characters')
-        if URL_PATTERN.search(v):
-            raise ValueError('Links are not allowed in username')
-        return v if v else "Anonymous"
+class LikeResponse(BaseModel):
+    like_count: int
 
 
 class CommentOut(BaseModel):
@@ -78,81 +71,162 @@ class CommentOut(BaseModel):
         from_attributes = True
 
 
+class CommentPage(BaseModel):
+    items: list[CommentOut]
+    next_cursor: Optional[str] = None
+    has_more: bool
+
+
 # --- Endpoints ---
-@router.get("/", response_model=PaginatedMangaResponse)
+@router.get("/", response_model=Union[PaginatedMangaResponse, CursorMangaResponse])
 def list_manga(
     search: Optional[str] = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    mode: Literal["page", "cursor"] = "page",
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db),
 ):
-    q = db.query(Manga)
+    # Infinite-scroll clients: no COUNT(*) and no OFFSET
+    if mode == "cursor" or cursor is not None:
+        return list_manga_cursor(search, cursor, page_size, include_total, db)
+
+    q = db.query(*SUMMARY_COLUMNS)
 
     if search:
-        pattern = f"%{search}%"
-        q = q.filter(
-            or_(Manga.title.ilike(pattern), Manga.description.ilike(pattern))
-        )
+        # Ranked by relevance; see app/db/search.py
+        q = apply_search(q, search, db.bind.dialect.name)
+    else:
+        q = q.order_by(Manga.id)
 
     total = q.count()
     pages = (total + page_size - 1) // page_size  # ceiling division
 
-    items = q.order_by(Manga.id).offset((page - 1) * page_size).limit(page_size).all()
-
-    return PaginatedMangaResponse(
-        items=items,
-        total=total,
-        page=page,
-        page_size=page_size,
-        pages=pages,
-    )
+    rows = q.offset((page - 1) * page_size).limit(page_size).all()
+
+    # Plain rows straight to JSON; see app/core/fast_json.py
+    return FastJSONResponse({
+        "items": [manga_summary_dict(row) for row in rows],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "pages": pages,
+    })
+
+
+def list_manga_cursor(
+    search: Optional[str],
+    cursor: Optional[str],
+    page_size: int,
+    include_total: bool,
+    db: Session,
+) -> FastJSONResponse:
+    q = db.query(*SUMMARY_COLUMNS)
+    rank = None
+    if search:
+        q, rank = ranked_search(q, search, db.bind.dialect.name)
+    unpaged = q
+
+    # Keyset on (rank, id) when searching, on id otherwise
+    if rank is None:
+        if cursor:
+            (last_id,) = decode_cursor(cursor, (int,))
+            q = q.filter(Manga.id > last_id)
+        rows = q.order_by(Manga.id).limit(page_size + 1).all()
+    else:
+        if cursor:
+            last_rank, last_id = decode_cursor(cursor, (float, int))
+            q = q.filter(or_(rank > last_rank, and_(rank == last_rank, Manga.id > last_id)))
+        rows = q.add_columns(rank.label("rank")).order_by(rank, Manga.id).limit(page_size + 1).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor([last.id] if rank is None else [last.rank, last.id])
+
+    total = None
+    if include_total:
+        key = " ".join(search.lower().split()) if search else ""
+        total = total_cache.get(key)
+        if total is None:
+            total = unpaged.count()
+            total_cache.set(key, total)
+
+    return FastJSONResponse({
+        "items": [manga_summary_dict(row) for row in rows],
+        "next_cursor": next_cursor,
+        "page_size": page_size,
+        "total": total,
+    })
 
 
 @router.get("/{slug}", response_model=MangaDetail)
-def get_manga(slug: str, db: Session = Depends(get_db)):
-    manga = (
-        db.query(Manga)
-        .filter(Manga.slug == slug)
-        .first()
-    )
-    if not manga:
-        raise HTTPException(status_code=404, detail="Manga not found")
-    return manga
+def get_manga(slug: str, request: Request, db: Session = Depends(get_db)):
+    def build():
+        # Chapters in one extra SELECT ... IN, ordered by number
+        manga = (
+            db.query(Manga)
+            .options(selectinload(Manga.chapters))
+            .filter(Manga.slug == slug)
+            .first()
+        )
+        if not manga:
+            raise HTTPException(status_code=404, detail="Manga not found")
+        return manga_detail_dict(manga)
+
+    return cached_response(response_cache, request, ("manga", slug), build)
 
 
 @router.post("/{slug}/like", response_model=LikeResponse)
 def like_manga(slug: str, db: Session = Depends(get_db)):
-    manga = db.query(Manga).filter(Manga.slug == slug).first()
+    if settings.like_mode == "atomic":
+        like_count = increment_now(db, "manga", Manga.slug == slug)
+        if like_count is None:
+            raise HTTPException(status_code=404, detail="Manga not found")
+        return LikeResponse(like_count=like_count)
+
+    manga = db.query(Manga.id, Manga.like_count).filter(Manga.slug == slug).first()
     if not manga:
         raise HTTPException(status_code=404, detail="Manga not found")
 
-    manga.like_count = (manga.like_count or 0) + 1
-    db.commit()
-    db.refresh(manga)
-
-    return LikeResponse(like_count=manga.like_count)
+    # Acknowledge now; the buffer flushes to the DB in the background
+    like_buffer.add("manga", manga.id)
+    return LikeResponse(like_count=(manga.like_count or 0) + like_buffer.pending("manga", manga.id))
 
 
-@router.get("/{slug}/comments", response_model=list[CommentOut])
+@router.get("/{slug}/comments", response_model=Union[list[CommentOut], CommentPage])
 def get_manga_comments(
     slug: str,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    mode: Literal["page", "cursor"] = "page",
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
     manga = db.query(Manga).filter(Manga.slug == slug).first()
     if not manga:
         raise HTTPException(status_code=404, detail="Manga not found")
 
-    comments = (
-        db.query(Comment)
-        .filter(Comment.manga_id == manga.id)
-        .order_by(Comment.created_at.desc())
+    q = db.query(Comment).filter(Comment.manga_id == manga.id)
+
+    if mode == "cursor" or cursor is not None:
+        items, next_cursor = keyset_page(
+            q,
+            (Comment.created_at, Comment.id),
+            cursor,
+            (datetime.fromisoformat, int),
+            page_size,
+        )
+        return CommentPage(items=items, next_cursor=next_cursor, has_more=next_cursor is not None)
+
+    return (
+        q.order_by(Comment.created_at.desc(), Comment.id.desc())
         .offset((page - 1) * page_size)
         .limit(page_size)
         .all()
     )
-    return comments
 
 
 @router.post("/{slug}/comments", response_model=CommentOut, status_code=201)
@@ -183,7 +257,9 @@ def create_manga_comment(
         text=comment_data.text,
     )
     db.add(comment)
+    add_comments(db, "manga", manga.id)
     db.commit()
+    invalidate_manga(slug)
     db.refresh(comment)
 
     return comment
@@ -1,11 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, Header
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import datetime
 from pydantic import BaseModel
 from typing import Optional
 
 from app.db.session import get_db
-from app.db.models.manga_model import ReadingProgress, Manga
+from app.db.models.manga_model import ReadingProgress
+from app.db.chapter_index import chapter_index
+from app.db.progress_writer import progress_coalescer, progress_row, upsert_progress
+from app.core.config import settings
 
 
 # --- Schemas ---
@@ -40,6 +44,10 @@ def get_progress(
     db: Session = Depends(get_db),
 ):
     """Get reading progress for a manga."""
+    pending = progress_coalescer.get(user_token, manga_id)
+    if pending:
+        return ProgressOut(**pending)
+
     progress = (
         db.query(ReadingProgress)
         .filter(
@@ -60,40 +68,28 @@ def save_progress(
     user_token: str = Depends(get_user_token),
     db: Session = Depends(get_db),
 ):
-    """Save or update reading progress. Upsert behavior."""
-    # Check if manga exists
-    manga = db.query(Manga).filter(Manga.id == data.manga_id).first()
-    if not manga:
-        raise HTTPException(status_code=404, detail="Manga not found")
-
-    # Find existing progress
-    progress = (
-        db.query(ReadingProgress)
-        .filter(
-            ReadingProgress.user_token == user_token,
-            ReadingProgress.manga_id == data.manga_id
-        )
-        .first()
-    )
-
-    if progress:
-        # Update existing
-        progress.chapter_id = data.chapter_id
-        progress.page_index = data.page_index
-    else:
-        # Create new
-        progress = ReadingProgress(
-            user_token=user_token,
-            manga_id=data.manga_id,
-            chapter_id=data.chapter_id,
-            page_index=data.page_index,
-        )
-        db.add(progress)
-
-    db.commit()
-    db.refresh(progress)
+    """Save or update reading progress. Single-statement upsert."""
+    row = progress_row(user_token, data.manga_id, data.chapter_id, data.page_index)
+
+    # Checked against the chapter index in both modes: coalesced saves are
+    # acknowledged before anything is written, and SQLite doesn't enforce
+    # the foreign keys a direct upsert would otherwise fail on
+    if chapter_index.manga_of(db, data.chapter_id) != data.manga_id:
+        raise HTTPException(status_code=404, detail="Manga or chapter not found")
+
+    if settings.progress_mode == "coalesced":
+        # Only the latest position per (user, manga) is written on the next flush
+        progress_coalescer.submit(row)
+        return ProgressOut(**row)
+
+    try:
+        upsert_progress(db.connection(), [row])
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Manga or chapter not found")
 
-    return progress
+    return ProgressOut(**row)
 
 
 @router.delete("/{manga_id}", status_code=204)
@@ -103,6 +99,8 @@ def delete_progress(
     db: Session = Depends(get_db),
 ):
     """Delete reading progress for a manga."""
+    progress_coalescer.discard(user_token, manga_id)
+
     progress = (
         db.query(ReadingProgress)
         .filter(
@@ -117,4 +115,3 @@ def delete_progress(
         db.commit()
 
     return None
-
@@ -0,0 +1,50 @@
+from typing import Optional
+
+from pydantic import BaseModel, field_validator
+
+from app.core.moderation import get_engine
+
+
+# --- Comment Validation Constants ---
+COMMENT_MIN_LENGTH = 2
+COMMENT_MAX_LENGTH = 2000
+USER_NAME_MAX_LENGTH = 50
+
+
+def _moderate(v: str, field: str, noun: str) -> None:
+    verdict = get_engine().check(v)
+    if verdict.allowed:
+        return
+    if "link" in verdict.reasons:
+        raise ValueError(f'Links are not allowed in {field}')
+    if "banned" in verdict.reasons:
+        raise ValueError(f'Inappropriate language is not allowed in {field}')
+    raise ValueError(f'{noun} looks like spam')
+
+
+class CommentCreate(BaseModel):
+    user_name: str = "Anonymous"
+    text: str
+    # Honeypot field - if this is filled, the request is likely a bot
+    website: Optional[str] = None
+
+    @field_validator('text')
+    @classmethod
+    def validate_text(cls, v: str) -> str:
+        v = v.strip()
+        if len(v) < COMMENT_MIN_LENGTH:
+            raise ValueError(f'Comment must be at least {COMMENT_MIN_LENGTH} characters')
+        if len(v) > COMMENT_MAX_LENGTH:
+            raise ValueError(f'Comment must not exceed {COMMENT_MAX_LENGTH} characters')
+        _moderate(v, 'comments', 'Comment')
+        return v
+
+    @field_validator('user_name')
+    @classmethod
+    def validate_user_name(cls, v: str) -> str:
+        v = v.strip() if v else "Anonymous"
+        if len(v) > USER_NAME_MAX_LENGTH:
+            raise ValueError(f'Username must not exceed {USER_NAME_MAX_LENGTH} characters')
+        if v:
+            _moderate(v, 'username', 'Username')
+        return v if v else "Anonymous"
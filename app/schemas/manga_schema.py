@@ -9,6 +9,7 @@ class ChapterSummary(BaseModel):
     number: int
     title: Optional[str] = None
     published_at: Optional[datetime] = None
+    comment_count: int = 0
 
     class Config:
         from_attributes = True  # allow ORM -> schema
@@ -20,6 +21,10 @@ class MangaSummary(BaseModel):
     title: str
     description: Optional[str] = None
     cover_url: Optional[str] = None
+    # Denormalized on the manga row (app/db/aggregates.py); no COUNT(*) per card
+    comment_count: int = 0
+    chapter_count: int = 0
+    latest_chapter_number: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -27,3 +32,34 @@ class MangaSummary(BaseModel):
 
 class MangaDetail(MangaSummary):
     chapters: List[ChapterSummary] = []
+
+
+# Row -> dict serializers for the manga routes, matching the models above.
+def chapter_summary_dict(chapter) -> dict:
+    return {
+        "id": chapter.id,
+        "number": chapter.number,
+        "title": chapter.title,
+        "published_at": chapter.published_at,
+        "comment_count": chapter.comment_count,
+    }
+
+
+def manga_summary_dict(manga) -> dict:
+    return {
+        "id": manga.id,
+        "slug": manga.slug,
+        "title": manga.title,
+        "description": manga.description,
+        "cover_url": manga.cover_url,
+        "comment_count": manga.comment_count,
+        "chapter_count": manga.chapter_count,
+        "latest_chapter_number": manga.latest_chapter_number,
+    }
+
+
+def manga_detail_dict(manga) -> dict:
+    return {
+        **manga_summary_dict(manga),
+        "chapters": [chapter_summary_dict(ch) for ch in manga.chapters],
+    }
@@ -4,7 +4,7 @@ from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.core.config import settings
 from app.db.session import get_db, engine, SessionLocal
@@ -18,8 +18,17 @@ from app.routers import manga_routes, chapter_routes, progress_routes, admin_rou
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup logic
-    Base.metadata.create_all(bind=engine)
+    if not settings.fast_start:
+        Base.metadata.create_all(bind=engine)
 
+    # Only seed demo data in development
+    if not settings.fast_start and settings.env == "dev":
+        seed_demo()
+
+    yield  # App runs here
+
+
+def seed_demo():
     db = SessionLocal()
     try:
         if db.query(Manga).count() == 0:
@@ -52,8 +61,6 @@ async def lifespan(app: FastAPI):
     finally:
         db.close()
 
-    yield  # App runs here
-
 
 app = FastAPI(title="Otaku Manga API", version="0.1.0", lifespan=lifespan)
 
@@ -90,15 +97,16 @@ def db_health(db: Session = Depends(get_db)):
 
 @app.get("/manga/catalog.json")
 def catalog_json(db: Session = Depends(get_db)):
-    mangas = db.query(Manga).order_by(Manga.id.desc()).all()
+    # One query for all manga and their chapters instead of one per manga
+    mangas = (
+        db.query(Manga)
+        .options(selectinload(Manga.chapters))
+        .order_by(Manga.id.desc())
+        .all()
+    )
     items = []
     for m in mangas:
-        chapters = (
-            db.query(Chapter)
-            .filter(Chapter.manga_id == m.id)
-            .order_by(Chapter.number.asc())
-            .all()
-        )
+        chapters = sorted(m.chapters, key=lambda c: c.number)
         items.append({
             "slug": m.slug,
             "title": m.title,
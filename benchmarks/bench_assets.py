@@ -0,0 +1,111 @@
+"""
+Page image throughput from /manga/<slug>/chN/NNN.png.
+
+Starts uvicorn and has many concurrent readers fetch every page of the
+chapters under MANGA_ROOT, first as full downloads, then as revalidations
+(If-None-Match -> 304) and as resumed downloads (Range). Reports requests/s,
+MB/s and p50/p99 latency per phase.
+
+    python -m benchmarks.bench_assets --concurrency 100 --duration 10
+
+Needs httpx (pip install httpx).
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.bench_async import wait_ready
+
+
+def page_paths(root: Path) -> list[str]:
+    suffixes = {".png", ".jpg", ".jpeg", ".webp", ".avif"}
+    return sorted(
+        "/manga/" + path.relative_to(root).as_posix()
+        for path in root.rglob("*")
+        if path.suffix.lower() in suffixes
+    )
+
+
+async def phase(client, paths, etags, mode: str, concurrency: int, duration: float):
+    latencies: list[float] = []
+    received = 0
+    errors = 0
+    stop_at = time.monotonic() + duration
+
+    async def worker(offset: int):
+        nonlocal received, errors
+        i = offset
+        while time.monotonic() < stop_at:
+            path = paths[i % len(paths)]
+            headers = {}
+            if mode == "304":
+                headers["If-None-Match"] = etags[path]
+            elif mode == "range":
+                headers["Range"] = "bytes=65536-"
+            start = time.perf_counter()
+            resp = await client.get(path, headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            received += len(resp.content)
+            if resp.status_code not in (200, 206, 304):
+                errors += 1
+            i += 1
+
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    p50 = statistics.median(latencies)
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    print(
+        f"{mode:>6} {len(latencies) / duration:>9.0f} {received / duration / 1e6:>9.1f} "
+        f"{p50:>9.1f} {p99:>9.1f} {errors:>7}"
+    )
+
+
+async def drive(base_url: str, paths: list[str], concurrency: int, duration: float) -> None:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        await wait_ready(client)
+        etags = {path: (await client.head(path)).headers["etag"] for path in paths}
+        print(f"{'mode':>6} {'req/s':>9} {'MB/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for mode in ("200", "304", "range"):
+            await phase(client, paths, etags, mode, concurrency, duration)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--manga-root", default="manga")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per phase")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    paths = page_paths(Path(args.manga_root))
+    if not paths:
+        sys.exit(f"no images under {args.manga_root}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DB_URL": f"sqlite:///{Path(tmp) / 'bench.db'}",
+            "MANGA_ROOT": args.manga_root,
+            "RATE_LIMIT_ENABLED": "false",
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+            env=env,
+        )
+        try:
+            asyncio.run(drive(f"http://127.0.0.1:{args.port}", paths, args.concurrency, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Sync vs async DB mode under high concurrency.
+
+Starts uvicorn once per DB_MODE against the same database and drives it
+with many concurrent clients, reporting requests/s and p50/p99 latency,
+plus the p99 of a /health probe sent alongside: /health does no work, so
+its latency is how long the event loop was busy with other requests.
+
+--rendered-pages N adds a chapter of N ingested pages with renditions
+built and turns the response cache off, so every chapter request stats
+each page's meta.json. Both modes run that filesystem work in the
+threadpool; in async mode the chapter route awaits it from a native async
+handler (see app/routers/async_routes.py).
+
+    python -m benchmarks.bench_async --db-url postgresql+psycopg2://... --concurrency 200
+    python -m benchmarks.bench_async --rendered-pages 40
+
+Needs httpx (pip install httpx), plus aiosqlite for the default SQLite run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+
+PATHS = [
+    "/api/v1/manga/demo-manga",
+    "/api/v1/chapters/1",
+    "/api/v1/chapters/1/next",
+    "/api/v1/manga/?page_size=20",
+]
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def seed_rendered_chapter(db_url: str, root: Path, pages: int) -> int:
+    """A chapter of `pages` generated images, ingested with renditions. Returns its id."""
+    from PIL import Image
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import Session
+
+    from app.db.demo import seed_demo
+    from app.db.migrations import upgrade
+    from app.db.models.manga_model import Chapter, Manga
+    from app.media.ingest import ingest_tree
+
+    chapter_dir = root / "bench-rendered" / "ch1"
+    chapter_dir.mkdir(parents=True)
+    for p in range(1, pages + 1):
+        Image.new("RGB", (800, 1200), (p % 256, 90, 160)).save(chapter_dir / f"{p:03d}.png")
+    manifest = {"id": "bench-rendered", "title": "Bench", "chapters": [{"id": "ch1", "title": "Chapter 1"}]}
+    (root / "bench-rendered" / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+    engine = create_engine(db_url)
+    upgrade(engine)
+    with Session(engine) as db:
+        # Demo data first, so PATHS keep their ids
+        seed_demo(db)
+        ingest_tree(db, root, renditions=True)
+        chapter_id = db.execute(
+            select(Chapter.id).join(Manga, Manga.id == Chapter.manga_id).where(Manga.slug == "bench-rendered")
+        ).scalar()
+    engine.dispose()
+    return chapter_id
+
+
+async def drive(
+    base_url: str, paths: list[str], concurrency: int, duration: float
+) -> tuple[int, list[float], int, list[float]]:
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        await wait_ready(client)
+        latencies: list[float] = []
+        probes: list[float] = []
+        errors = 0
+        stop_at = time.monotonic() + duration
+
+        async def worker(offset: int):
+            nonlocal errors
+            i = offset
+            while time.monotonic() < stop_at:
+                start = time.perf_counter()
+                resp = await client.get(paths[i % len(paths)])
+                latencies.append((time.perf_counter() - start) * 1000)
+                if resp.status_code >= 400:
+                    errors += 1
+                i += 1
+
+        async def probe():
+            while time.monotonic() < stop_at:
+                start = time.perf_counter()
+                await client.get("/health")
+                probes.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(probe(), *(worker(n) for n in range(concurrency)))
+        return len(latencies), latencies, errors, probes
+
+
+def run_mode(
+    mode: str, db_url: str, port: int, concurrency: int, duration: float, paths: list[str], extra_env: dict
+) -> None:
+    env = {
+        **os.environ,
+        "DB_URL": db_url,
+        "DB_MODE": mode,
+        "SCHEMA_CHECK": "off",
+        "RATE_LIMIT_ENABLED": "false",
+        **extra_env,
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        count, latencies, errors, probes = asyncio.run(
+            drive(f"http://127.0.0.1:{port}", paths, concurrency, duration)
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+    p50 = statistics.median(latencies)
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    health_p99 = statistics.quantiles(probes, n=100)[98]
+    print(f"{mode:>6} {count / duration:>10.0f} {p50:>9.1f} {p99:>9.1f} {health_p99:>11.1f} {errors:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per mode")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rendered-pages", type=int, default=0, help="add a chapter with renditions")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = args.db_url or f"sqlite:///{Path(tmp) / 'bench.db'}"
+        paths, extra_env = list(PATHS), {}
+        if args.rendered_pages:
+            root = Path(tmp) / "manga"
+            chapter_id = seed_rendered_chapter(db_url, root, args.rendered_pages)
+            paths.append(f"/api/v1/chapters/{chapter_id}")
+            extra_env = {"MANGA_ROOT": str(root), "RESPONSE_CACHE_TTL_SECONDS": "0"}
+        print(f"{'mode':>6} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'health p99':>11} {'errors':>7}")
+        for mode in ("sync", "async"):
+            run_mode(mode, db_url, args.port, args.concurrency, args.duration, paths, extra_env)
+
+
+if __name__ == "__main__":
+    main()
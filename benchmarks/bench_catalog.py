@@ -0,0 +1,106 @@
+"""
+/manga/catalog.json: N+1 build vs single query vs precomputed snapshot.
+
+    python -m benchmarks.bench_catalog
+    python -m benchmarks.bench_catalog --db-url postgresql+psycopg2://... --sizes 1000 10000
+"""
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.catalog import build_catalog, make_snapshot
+from app.db.migrations import upgrade
+from app.db.models.manga_model import Chapter, Manga
+
+
+def seed(engine, size: int, chapters: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(delete(Chapter))
+        conn.execute(delete(Manga))
+        conn.execute(
+            insert(Manga),
+            [
+                {"slug": f"manga-{i}", "title": f"Manga {i}", "description": "x" * 200, "status": "ongoing"}
+                for i in range(size)
+            ],
+        )
+        ids = conn.execute(select(Manga.id)).scalars().all()
+        conn.execute(
+            insert(Chapter),
+            [
+                {"manga_id": manga_id, "number": n, "title": f"Chapter {n}"}
+                for manga_id in ids
+                for n in range(1, chapters + 1)
+            ],
+        )
+
+
+def legacy_catalog(db: Session) -> bytes:
+    items = []
+    for m in db.query(Manga).order_by(Manga.id.desc()).all():
+        chapters = (
+            db.query(Chapter)
+            .filter(Chapter.manga_id == m.id)
+            .order_by(Chapter.number.asc())
+            .all()
+        )
+        items.append({
+            "slug": m.slug,
+            "title": m.title,
+            "description": m.description,
+            "cover_url": m.cover_url,
+            "status": m.status,
+            "chapters": [{"id": c.id, "number": c.number, "title": c.title} for c in chapters],
+        })
+    return json.dumps({"items": items}).encode()
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-url", help="scratch database; defaults to a temporary SQLite file")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--chapters", type=int, default=20, help="chapters per title")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'titles':>7} {'mode':>12} {'ms/request':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.db_url or f"sqlite:///{Path(tmp) / 'catalog.db'}"
+        engine = create_engine(url, future=True)
+        upgrade(engine)
+        for size in args.sizes:
+            seed(engine, size, args.chapters)
+            with Session(engine) as db:
+                snapshot = make_snapshot(build_catalog(db))
+                results = {
+                    "n+1": timed(lambda: (legacy_catalog(db), db.expunge_all()), args.repeat),
+                    "one query": timed(lambda: make_snapshot(build_catalog(db)), args.repeat),
+                    # A snapshot hit is just handing out the stored bytes
+                    "snapshot": timed(lambda: snapshot.gzipped, args.repeat * 100),
+                }
+            for mode, ms in results.items():
+                print(f"{size:>7} {mode:>12} {ms:>11.3f}")
+            print(
+                f"{size:>7} {'bytes':>12} {len(snapshot.body):>11} raw, "
+                f"{len(snapshot.gzipped)} gzip"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Bulk ingest of a synthetic manga/ tree.
+
+Generates --manga titles with --chapters chapters of --pages small PNG pages
+each, then times `ingest_tree` for a first load, for a re-run with
+nothing changed (answered from the stored fingerprints), and for a sync
+after one page was replaced, rendering renditions as
+`ingest --renditions` does; that should cost about one chapter's work.
+
+    python -m benchmarks.bench_ingest --manga 50 --chapters 100 --pages 20
+    python -m benchmarks.bench_ingest --db-url postgresql+psycopg2://... --workers 8
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.db.migrations import upgrade
+from app.db.models.manga_model import Page
+from app.media.ingest import ingest_tree
+
+
+def make_tree(root: Path, manga: int, chapters: int, pages: int) -> None:
+    from PIL import Image
+
+    items = []
+    for m in range(manga):
+        slug = f"manga-{m}"
+        manifest = {"id": slug, "title": f"Manga {m}", "chapters": []}
+        for c in range(1, chapters + 1):
+            chapter_dir = root / slug / f"ch{c}"
+            chapter_dir.mkdir(parents=True)
+            for p in range(1, pages + 1):
+                # Distinct content per page so hashes differ
+                Image.new("RGB", (80, 120), ((m * 7) % 256, c % 256, p % 256)).save(chapter_dir / f"{p:03d}.png")
+            manifest["chapters"].append({"id": f"ch{c}", "title": f"Chapter {c}", "date": "Jan 2026"})
+        (root / slug / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+        items.append({"id": slug, "status": "ongoing"})
+    (root / "catalog.json").write_text(json.dumps({"items": items}), encoding="utf-8")
+
+
+def main():
+    from PIL import Image
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-url", help="scratch database; defaults to a temporary SQLite file")
+    parser.add_argument("--manga", type=int, default=50)
+    parser.add_argument("--chapters", type=int, default=100, help="chapters per title")
+    parser.add_argument("--pages", type=int, default=20, help="pages per chapter")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "manga"
+        start = time.perf_counter()
+        make_tree(root, args.manga, args.chapters, args.pages)
+        print(f"generated {args.manga * args.chapters} chapters in {time.perf_counter() - start:.1f}s")
+
+        engine = create_engine(args.db_url or f"sqlite:///{Path(tmp) / 'ingest.db'}", future=True)
+        upgrade(engine)
+        with Session(engine) as db:
+            for label in ("first load", "unchanged", "one page"):
+                if label == "one page":
+                    Image.new("RGB", (80, 120), (255, 255, 255)).save(root / "manga-0" / "ch1" / "001.png")
+                start = time.perf_counter()
+                ingest_tree(db, root, args.workers, renditions=label == "one page")
+                elapsed = time.perf_counter() - start
+                pages = db.execute(select(func.count(Page.id))).scalar()
+                print(f"{label:>11}: {elapsed:7.1f}s  ({pages / elapsed:,.0f} pages/s, {pages} pages)")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Concurrent likes: lost updates and throughput per like mode.
+
+Hammers one manga row from many threads and checks that the stored
+like_count equals the number of likes sent. "legacy" is the old
+SELECT / +1 / commit path and is expected to lose increments under
+contention; "atomic" and "buffered" must not.
+
+    python -m benchmarks.bench_likes --threads 16 --likes 500
+"""
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, delete, event, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.counters import LikeBuffer, increment_now
+from app.db.migrations import upgrade
+from app.db.models.manga_model import Manga
+
+
+def legacy_like(Session, buffer, manga_id):
+    with Session() as db:
+        manga = db.query(Manga).filter(Manga.id == manga_id).first()
+        manga.like_count = (manga.like_count or 0) + 1
+        db.commit()
+        db.refresh(manga)
+
+
+def atomic_like(Session, buffer, manga_id):
+    with Session() as db:
+        increment_now(db, "manga", Manga.id == manga_id)
+
+
+def buffered_like(Session, buffer, manga_id):
+    buffer.add("manga", manga_id)
+
+
+def run(engine, mode, like, threads, likes_per_thread):
+    Session = sessionmaker(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(delete(Manga))
+        manga_id = conn.execute(
+            insert(Manga).values(slug="hot", title="Hot", like_count=0).returning(Manga.id)
+        ).scalar()
+
+    buffer = LikeBuffer(engine)
+    stop = threading.Event()
+
+    def flusher():
+        while not stop.is_set():
+            time.sleep(0.05)
+            buffer.flush()
+
+    def worker():
+        for _ in range(likes_per_thread):
+            like(Session, buffer, manga_id)
+
+    background = threading.Thread(target=flusher)
+    if mode == "buffered":
+        background.start()
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    if mode == "buffered":
+        stop.set()
+        background.join()
+        buffer.flush()
+
+    with engine.connect() as conn:
+        stored = conn.execute(select(Manga.like_count).where(Manga.id == manga_id)).scalar()
+    return stored, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-url", help="scratch database; defaults to a temporary SQLite file")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--likes", type=int, default=300, help="likes per thread")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.db_url or f"sqlite:///{Path(tmp) / 'likes.db'}"
+        engine = create_engine(url, future=True, pool_size=args.threads + 2)
+        if engine.dialect.name == "sqlite":
+            @event.listens_for(engine, "connect")
+            def set_busy_timeout(dbapi_conn, _):
+                dbapi_conn.execute("PRAGMA busy_timeout = 30000")
+        upgrade(engine)
+
+        expected = args.threads * args.likes
+        failures = []
+        print(f"{'mode':>9} {'expected':>9} {'stored':>9} {'lost':>6} {'likes/s':>9}")
+        for mode, like in (("legacy", legacy_like), ("atomic", atomic_like), ("buffered", buffered_like)):
+            stored, elapsed = run(engine, mode, like, args.threads, args.likes)
+            print(
+                f"{mode:>9} {expected:>9} {stored:>9} {expected - stored:>6} "
+                f"{expected / elapsed:>9.0f}"
+            )
+            if mode != "legacy" and stored != expected:
+                failures.append(mode)
+        engine.dispose()
+
+    if failures:
+        raise SystemExit(f"lost increments in: {', '.join(failures)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Per-comment moderation cost.
+
+Compares the old per-field checks (strip, length, URL regex; no banned
+terms) with the moderation engine on the pyahocorasick automaton and on
+the pure-Python fallback, over a synthetic mix of short and long Uzbek and
+Russian comments. Also reports how the engine scales with the size of the
+banned-term list, and streaming re-scan throughput.
+
+    python -m benchmarks.bench_moderation
+"""
+import argparse
+import random
+import re
+import time
+
+from app.core.moderation import DEFAULT_TERMS_PATH, ModerationEngine, load_terms
+
+
+URL_PATTERN = re.compile(
+    r'(https?://|www\.|[a-zA-Z0-9-]+\.(com|org|net|io|co|dev|app|xyz|info|biz|me))',
+    re.IGNORECASE
+)
+
+WORDS = (
+    "zo'r juda yaxshi bob rahmat keyingi qachon chiqadi manga o'qidim syujet "
+    "отличная глава спасибо перевод когда следующая очень понравилось "
+    "ажойиб боб раҳмат кейинги қачон"
+).split()
+
+
+def legacy_check(text: str) -> bool:
+    v = text.strip()
+    return 2 <= len(v) <= 2000 and not URL_PATTERN.search(v)
+
+
+def corpus(size: int, seed: int = 7) -> list[str]:
+    rnd = random.Random(seed)
+    texts = []
+    for i in range(size):
+        length = rnd.choice((4, 12, 40, 200))
+        words = [rnd.choice(WORDS) for _ in range(length)]
+        if i % 50 == 0:
+            words.insert(rnd.randrange(len(words)), "сука")
+        if i % 70 == 0:
+            words.append("example.com")
+        texts.append(" ".join(words))
+    return texts
+
+
+def per_comment_us(fn, texts: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(texts) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--comments", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = corpus(args.comments)
+    terms = load_terms(DEFAULT_TERMS_PATH)
+    native = ModerationEngine(terms)
+    fallback = ModerationEngine(terms, native=False)
+    print(f"{len(texts)} comments, avg {sum(map(len, texts)) / len(texts):.0f} chars, {len(terms)} terms")
+    print(f"{'checker':<34} {'us/comment':>10}")
+    for label, fn in (
+        ("regex + length (old, no terms)", legacy_check),
+        (f"engine ({type(native.automaton).__name__})", native.check),
+        ("engine (pure-Python automaton)", fallback.check),
+    ):
+        print(f"{label:<34} {per_comment_us(fn, texts, args.repeat):>10.2f}")
+
+    # Automaton cost should not grow with the number of terms
+    print(f"\n{'terms':>7} {'us/comment':>10}")
+    for extra in (0, 1_000, 10_000):
+        engine = ModerationEngine(terms + [f"zzword{i}*" for i in range(extra)])
+        print(f"{len(terms) + extra:>7} {per_comment_us(engine.check, texts, args.repeat):>10.2f}")
+
+    start = time.perf_counter()
+    rejected = sum(not v.allowed for v in native.check_many(texts))
+    elapsed = time.perf_counter() - start
+    print(f"\nbatch: {len(texts) / elapsed:,.0f} comments/s, {rejected} rejected")
+
+
+if __name__ == "__main__":
+    main()
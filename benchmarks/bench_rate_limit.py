@@ -0,0 +1,106 @@
+"""
+Rate limiter cost and behaviour under load.
+
+1. In-process: TokenBucketLimiter.hit() cost with many distinct clients,
+   and the bucket count staying at --max-keys.
+2. Over HTTP: starts uvicorn and floods POST .../comments from --clients
+   clients, all from one IP, reporting status counts, latency and the
+   comment rows actually inserted. Phase "fixed" gives each client its own
+   X-User-Token; phase "rotating" sends a new token with every request,
+   which only the per-IP bucket stops. The 429s are answered by the
+   middleware before a DB session is opened, so they should stay fast
+   while the database is busy.
+
+    python -m benchmarks.bench_rate_limit --clients 50 --duration 10
+
+Needs httpx (pip install httpx).
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+from app.core.rate_limit import TokenBucketLimiter
+from benchmarks.bench_async import wait_ready
+
+
+def bench_limiter(keys: int, max_keys: int, ops: int) -> None:
+    limiter = TokenBucketLimiter({"comments": "5/60"}, max_keys=max_keys)
+    start = time.perf_counter()
+    for i in range(ops):
+        limiter.hit("comments", (f"10.0.{i % keys // 256}.{i % 256}", f"user-{i % keys}"))
+    elapsed = time.perf_counter() - start
+    print(
+        f"hit(): {elapsed / ops * 1e9:,.0f} ns/op over {keys:,} clients; "
+        f"{len(limiter):,} buckets held (max {max_keys:,}), {limiter.rejected:,} rejected"
+    )
+
+
+async def flood(base_url: str, clients: int, duration: float, rotate: bool) -> None:
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        await wait_ready(client)
+        latencies: dict[int, list[float]] = {}
+        stop_at = time.monotonic() + duration
+
+        async def worker(n: int):
+            i = 0
+            while time.monotonic() < stop_at:
+                start = time.perf_counter()
+                resp = await client.post(
+                    "/api/v1/manga/demo-manga/comments",
+                    json={"text": f"zo'r bob {n}-{i}"},
+                    headers={"X-User-Token": f"user-{n}-{i}" if rotate else f"user-{n}"},
+                )
+                latencies.setdefault(resp.status_code, []).append((time.perf_counter() - start) * 1000)
+                i += 1
+
+        await asyncio.gather(*(worker(n) for n in range(clients)))
+
+    counts = Counter({status: len(values) for status, values in latencies.items()})
+    print(f"{'status':>6} {'count':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for status, values in sorted(latencies.items()):
+        p99 = statistics.quantiles(values, n=100)[98] if len(values) > 1 else values[0]
+        print(f"{status:>6} {counts[status]:>8} {statistics.median(values):>8.1f} {p99:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--max-keys", type=int, default=100_000)
+    args = parser.parse_args()
+
+    bench_limiter(keys=1_000_000, max_keys=args.max_keys, ops=2_000_000)
+
+    for phase in ("fixed", "rotating"):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "bench.db"
+            env = {**os.environ, "DB_URL": f"sqlite:///{db_path}", "ENV": "dev"}
+            server = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+                env=env,
+            )
+            try:
+                print(f"\n{phase} tokens, {args.clients} clients on one IP")
+                asyncio.run(flood(f"http://127.0.0.1:{args.port}", args.clients, args.duration, phase == "rotating"))
+            finally:
+                server.terminate()
+                server.wait()
+            with sqlite3.connect(db_path) as conn:
+                inserted = conn.execute("SELECT COUNT(*) FROM comment").fetchone()[0]
+            print(f"comment rows inserted: {inserted}")
+
+
+if __name__ == "__main__":
+    main()
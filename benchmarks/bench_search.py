@@ -0,0 +1,110 @@
+"""
+Search latency vs catalog size.
+
+Seeds catalogs of increasing size and compares p50/p95 latency of the
+indexed search (app/db/search.py) with the old ILIKE scan.
+
+    python -m benchmarks.bench_search
+    python -m benchmarks.bench_search --db-url postgresql+psycopg2://... --sizes 1000 10000 50000
+
+--db-url must point at a scratch database: its manga rows are replaced.
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, delete, insert, or_
+from sqlalchemy.orm import Session
+
+from app.db.migrations import upgrade
+from app.db.models.manga_model import Manga
+from app.db.search import apply_search
+
+
+SYLLABLES = ["ka", "ri", "to", "mu", "sa", "ne", "yo", "zu", "la", "vo", "ch", "sh"]
+# Real searches match a handful of titles, so the queried words are planted
+# in a fixed number of rows no matter how large the catalog gets.
+PLANTED = ["dragon", "blade", "academy", "tokyo", "ghoul", "ajdaho", "клинок", "crimson"]
+PLANTED_ROWS = 50
+QUERIES = ["dragon", "blade acad", "tokyo ghoul", "ajdaho", "клинок", "crim"]
+
+
+def filler_word(rng: random.Random) -> str:
+    return "".join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+
+
+def seed(engine, size: int) -> None:
+    rng = random.Random(size)
+    rows = []
+    for i in range(size):
+        title = [filler_word(rng) for _ in range(3)]
+        if i % max(size // PLANTED_ROWS, 1) == 0:
+            title[0] = rng.choice(PLANTED)
+            title[1] = rng.choice(PLANTED)
+        rows.append({
+            "slug": f"manga-{i}",
+            "title": " ".join(title).title(),
+            "description": " ".join(filler_word(rng) for _ in range(30)),
+        })
+    with engine.begin() as conn:
+        conn.execute(delete(Manga))
+        conn.execute(insert(Manga), rows)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    return statistics.quantiles(samples, n=100)[int(pct) - 1]
+
+
+def measure(engine, build, repeat: int) -> list[float]:
+    samples = []
+    with Session(engine) as db:
+        for _ in range(repeat):
+            for term in QUERIES:
+                start = time.perf_counter()
+                build(db, term).limit(20).all()
+                samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def indexed(db, term):
+    return apply_search(db.query(Manga), term, db.bind.dialect.name)
+
+
+def legacy(db, term):
+    pattern = f"%{term}%"
+    return (
+        db.query(Manga)
+        .filter(or_(Manga.title.ilike(pattern), Manga.description.ilike(pattern)))
+        .order_by(Manga.id)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-url", help="defaults to a throwaway SQLite file per size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'titles':>8} {'mode':>8} {'p50 ms':>9} {'p95 ms':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            url = args.db_url or f"sqlite:///{Path(tmp) / f'search_{size}.db'}"
+            engine = create_engine(url, future=True)
+            upgrade(engine)
+            seed(engine, size)
+
+            for mode, build in (("indexed", indexed), ("ilike", legacy)):
+                samples = measure(engine, build, args.repeat)
+                print(
+                    f"{size:>8} {mode:>8} "
+                    f"{percentile(samples, 50):>9.2f} {percentile(samples, 95):>9.2f}"
+                )
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
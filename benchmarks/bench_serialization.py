@@ -0,0 +1,226 @@
+"""
+CPU time per response: FastAPI's model path vs the fast JSON path.
+
+Seeds a throwaway SQLite database (a chapter with --pages pages, --manga
+titles) and a meta.json with two renditions for every page, then for
+each hot response times, in process CPU seconds:
+
+  model  what the routes did before: validate the ORM objects into the
+         response model (from_attributes), validate/serialize against
+         response_model, encode with the stdlib json module
+  fast   the *_dict row serializers + app/core/fast_json.dumps
+
+Both include the database queries and resolve page renditions the same
+way (chapter_renditions, one meta.json lookup per page), with the
+response cache cleared before every run. Both payloads are checked to
+decode to the same JSON.
+
+    python -m benchmarks.bench_serialization --pages 200 --manga 100
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Union
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ.update(
+    DB_URL=f"sqlite:///{Path(_tmp.name) / 'serialize.db'}",
+    ENV="test",
+    MANGA_ROOT=str(Path(_tmp.name) / "manga"),
+)
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import joinedload, selectinload  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.fast_json import dumps, orjson  # noqa: E402
+from app.core.response_cache import response_cache  # noqa: E402
+from app.db.migrations import upgrade  # noqa: E402
+from app.db.models.manga_model import Chapter, Manga, Page  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.routers.chapter_routes import (  # noqa: E402
+    ChapterDetailOut,
+    ChapterReaderOut,
+    PageOut,
+    RenditionOut,
+    chapter_detail_dict,
+    chapter_renditions,
+    nav_dict,
+    srcset_for,
+)
+from app.routers.manga_routes import (  # noqa: E402
+    SUMMARY_COLUMNS,
+    CursorMangaResponse,
+    PaginatedMangaResponse,
+)
+from app.schemas.manga_schema import MangaDetail, manga_detail_dict, manga_summary_dict  # noqa: E402
+
+
+PLACEHOLDER = "data:image/webp;base64," + "A" * 300
+
+
+def seed(manga: int, pages: int) -> tuple[int, str]:
+    upgrade(engine)
+    with SessionLocal() as db:
+        manga_ids = db.execute(
+            insert(Manga).returning(Manga.id),
+            [
+                {"slug": f"manga-{m}", "title": f"Manga {m}", "description": "Tavsif " * 40,
+                 "cover_url": f"/manga/manga-{m}/cover.jpg", "chapter_count": 3, "latest_chapter_number": 3}
+                for m in range(manga)
+            ],
+        ).scalars().all()
+        chapter_ids = db.execute(
+            insert(Chapter).returning(Chapter.id),
+            [{"manga_id": manga_ids[0], "number": n, "title": f"Chapter {n}"} for n in (1, 2, 3)],
+        ).scalars().all()
+        db.execute(
+            insert(Page),
+            [
+                {"chapter_id": chapter_ids[1], "index": i, "image_url": f"/manga/manga-0/ch2/{i:03d}.png",
+                 "width": 800, "height": 1200, "byte_size": 250_000, "placeholder": PLACEHOLDER}
+                for i in range(1, pages + 1)
+            ],
+        )
+        db.commit()
+    renditions_dir = Path(settings.manga_root) / settings.renditions_dir / "manga-0" / "ch2"
+    for i in range(1, pages + 1):
+        out_dir = renditions_dir / f"{i:03d}"
+        out_dir.mkdir(parents=True)
+        meta = {"renditions": [
+            {"file": f"{w}.webp", "width": w, "height": w * 3 // 2, "format": "webp", "bytes": w * 40}
+            for w in (480, 800)
+        ]}
+        (out_dir / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+    return chapter_ids[1], "manga-0"
+
+
+def model_encode(model, value) -> bytes:
+    """FastAPI's serialize_response + JSONResponse.render for a response_model route."""
+    adapter = TypeAdapter(model)
+    validated = adapter.validate_python(value, from_attributes=True)
+    content = adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def cases(chapter_id: int, slug: str, manga: int):
+    def load_chapter(db, reader=False):
+        options = [selectinload(Chapter.pages)]
+        if reader:
+            options.append(joinedload(Chapter.manga))
+        return db.query(Chapter).options(*options).filter(Chapter.id == chapter_id).first()
+
+    def load_manga(db):
+        return db.query(Manga).options(selectinload(Manga.chapters)).filter(Manga.slug == slug).first()
+
+    def neighbours(db, chapter):
+        prev_ch = db.query(Chapter).filter(Chapter.manga_id == chapter.manga_id, Chapter.number < chapter.number) \
+            .order_by(Chapter.number.desc()).first()
+        next_ch = db.query(Chapter).filter(Chapter.manga_id == chapter.manga_id, Chapter.number > chapter.number) \
+            .order_by(Chapter.number).first()
+        return prev_ch, next_ch
+
+    def page_models(chapter):
+        return [
+            PageOut.model_validate(page).model_copy(update={
+                "renditions": [RenditionOut.model_validate(r) for r in renditions],
+                "srcset": srcset_for(renditions),
+            })
+            for page, renditions in zip(chapter.pages, chapter_renditions(chapter))
+        ]
+
+    def chapter_model(db):
+        chapter = load_chapter(db)
+        return ChapterDetailOut(
+            id=chapter.id, number=chapter.number, title=chapter.title, pages=page_models(chapter),
+        ).model_dump_json().encode()
+
+    def chapter_fast(db):
+        return dumps(chapter_detail_dict(load_chapter(db)))
+
+    def reader_model(db):
+        chapter = load_chapter(db, reader=True)
+        prev_ch, next_ch = neighbours(db, chapter)
+        return ChapterReaderOut(
+            id=chapter.id, number=chapter.number, title=chapter.title, pages=page_models(chapter),
+            manga=chapter.manga, prev=prev_ch, next=next_ch,
+        ).model_dump_json().encode()
+
+    def reader_fast(db):
+        chapter = load_chapter(db, reader=True)
+        prev_ch, next_ch = neighbours(db, chapter)
+        manga_row = chapter.manga
+        return dumps({
+            **chapter_detail_dict(chapter),
+            "manga": {"id": manga_row.id, "slug": manga_row.slug, "title": manga_row.title},
+            "prev": nav_dict(prev_ch),
+            "next": nav_dict(next_ch),
+        })
+
+    def detail_model(db):
+        return MangaDetail.model_validate(load_manga(db)).model_dump_json().encode()
+
+    def detail_fast(db):
+        return dumps(manga_detail_dict(load_manga(db)))
+
+    def list_model(db):
+        items = db.query(Manga).order_by(Manga.id).limit(manga).all()
+        response = PaginatedMangaResponse(items=items, total=manga, page=1, page_size=manga, pages=1)
+        return model_encode(Union[PaginatedMangaResponse, CursorMangaResponse], response)
+
+    def list_fast(db):
+        rows = db.query(*SUMMARY_COLUMNS).order_by(Manga.id).limit(manga).all()
+        return dumps({
+            "items": [manga_summary_dict(r) for r in rows], "total": manga, "page": 1, "page_size": manga, "pages": 1,
+        })
+
+    return [
+        ("chapter (cache miss)", chapter_model, chapter_fast),
+        ("reader (cache miss)", reader_model, reader_fast),
+        ("manga detail (cache miss)", detail_model, detail_fast),
+        (f"manga list, {manga} items", list_model, list_fast),
+    ]
+
+
+def cpu_ms(fn, repeat: int) -> tuple[float, bytes]:
+    best = float("inf")
+    body = b""
+    for _ in range(repeat):
+        response_cache.clear()
+        with SessionLocal() as db:
+            start = time.process_time()
+            body = fn(db)
+            best = min(best, time.process_time() - start)
+    return best * 1000, body
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--manga", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    chapter_id, slug = seed(args.manga, args.pages)
+    print(f"encoder: {'orjson ' + orjson.__version__ if orjson else 'stdlib json'}")
+    print(f"{'response':<26} {'model ms':>9} {'fast ms':>8} {'speedup':>8} {'KB':>7}")
+    failed = False
+    for label, model_fn, fast_fn in cases(chapter_id, slug, args.manga):
+        model_ms, model_body = cpu_ms(model_fn, args.repeat)
+        fast_ms, fast_body = cpu_ms(fast_fn, args.repeat)
+        if json.loads(model_body) != json.loads(fast_body):
+            print(f"{label}: payloads differ")
+            failed = True
+        print(f"{label:<26} {model_ms:>9.2f} {fast_ms:>8.2f} {model_ms / fast_ms:>7.1f}x {len(fast_body) / 1024:>7.1f}")
+    lookup_ms, _ = cpu_ms(lambda db: chapter_renditions(db.get(Chapter, chapter_id)), args.repeat)
+    print(f"of which rendition lookups ({args.pages} pages, in both paths): {lookup_ms:.2f} ms")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
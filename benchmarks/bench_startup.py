@@ -0,0 +1,119 @@
+"""
+Worker startup time: import cost and time to first response.
+
+1. Imports: `import app.main` in a fresh interpreter, --runs times, plus the
+   slowest modules by cumulative time from `python -X importtime`.
+2. Boot: starts uvicorn against a migrated, seeded SQLite database with
+   FAST_START=false (migrations check + seeding at boot) and
+   FAST_START=true (app/core/warmup.py), timing from process spawn to the
+   first 200 from /health, then the first /api/v1/manga/ and
+   /manga/catalog.json responses right after it, and again after --settle
+   seconds (once a fast-start warmup has finished).
+
+    python -m benchmarks.bench_startup --runs 5
+
+Needs httpx (pip install httpx).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+
+def import_seconds(env: dict) -> float:
+    code = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(env: dict, top: int) -> list[tuple[int, str]]:
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Direct imports of app.main only, so parents and children aren't both listed
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def boot(env: dict, port: int, settle: float = 0.0) -> dict[str, float]:
+    """Seconds from spawn to the first /health, then for each first data response."""
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    timings = {}
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=30.0) as client:
+            while True:
+                try:
+                    if client.get("/health").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.005)
+            timings["health"] = time.perf_counter() - start
+            time.sleep(settle)
+            for path in ("/api/v1/manga/", "/manga/catalog.json"):
+                t = time.perf_counter()
+                client.get(path).raise_for_status()
+                timings[path] = time.perf_counter() - t
+    finally:
+        server.terminate()
+        server.wait()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8768)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--settle", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DB_URL": f"sqlite:///{Path(tmp) / 'startup.db'}",
+            "ENV": "dev",
+            "RATE_LIMIT_ENABLED": "false",
+        }
+        # Migrate and seed once, as the release step would
+        subprocess.run(
+            [sys.executable, "-c", "from app.main import prepare_database; prepare_database()"],
+            env={**env, "AUTO_MIGRATE": "true"}, check=True,
+        )
+
+        imports = [import_seconds(env) for _ in range(args.runs)]
+        print(f"import app.main: median {statistics.median(imports) * 1000:.0f} ms over {args.runs} runs")
+        for cumulative, name in slowest_imports(env, args.top):
+            print(f"  {cumulative / 1000:>7.1f} ms  {name}")
+
+        print(f"\n{'':<10} {'first':>8} {'right after':>22} {f'after {args.settle:g}s':>22}")
+        print(f"{'mode':<10} {'/health':>8} {'list':>10} {'catalog':>11} {'list':>10} {'catalog':>11}  (median ms)")
+        for label, fast in (("full", "false"), ("fast", "true")):
+            row = []
+            for settle in (0.0, args.settle):
+                runs = [boot({**env, "FAST_START": fast}, args.port, settle) for _ in range(args.runs)]
+                if not row:
+                    row.append(statistics.median(r["health"] for r in runs) * 1000)
+                row += [statistics.median(r[path] for r in runs) * 1000 for path in ("/api/v1/manga/", "/manga/catalog.json")]
+            print(f"{label:<10} {row[0]:>8.0f} {row[1]:>10.1f} {row[2]:>11.1f} {row[3]:>10.1f} {row[4]:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Shared test setup: the app on a throwaway SQLite database.
+
+Settings are read when app modules are imported, so the environment is
+set here, before any test module imports them. The schema is migrated by
+the app's own startup (AUTO_MIGRATE). Rate limiting is off; tests that
+exercise it wrap the app in their own limiter.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ.update(
+    DB_URL=f"sqlite:///{Path(_tmp.name) / 'test.db'}",
+    DB_MODE="sync",
+    ENV="test",
+    AUTO_MIGRATE="true",
+    FAST_START="false",
+    RATE_LIMIT_ENABLED="false",
+    MANGA_ROOT=str(Path(_tmp.name) / "manga"),
+)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app.main import app
+
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def manga(client):
+    """A fresh manga with one chapter: (manga_id, slug, chapter_id)."""
+    from app.db.models.manga_model import Chapter, Manga
+    from app.db.session import engine
+
+    slug = f"test-{os.urandom(4).hex()}"
+    with engine.begin() as conn:
+        manga_id = conn.execute(
+            insert(Manga).values(slug=slug, title="Test", like_count=0).returning(Manga.id)
+        ).scalar()
+        chapter_id = conn.execute(
+            insert(Chapter).values(manga_id=manga_id, number=1, like_count=0).returning(Chapter.id)
+        ).scalar()
+    return manga_id, slug, chapter_id
+
+
+@pytest.fixture
+def chapters(manga):
+    """Chapters 1-3 of the `manga` fixture, each with four 100-byte pages: (slug, [chapter ids])."""
+    from app.db.models.manga_model import Chapter, Page
+    from app.db.session import engine
+
+    manga_id, slug, first_id = manga
+    with engine.begin() as conn:
+        # Inserted out of order: navigation follows chapter numbers, not ids
+        third_id, second_id = (
+            conn.execute(
+                insert(Chapter).values(manga_id=manga_id, number=number, title=f"Ch {number}", like_count=0)
+                .returning(Chapter.id)
+            ).scalar()
+            for number in (3, 2)
+        )
+        ids = [first_id, second_id, third_id]
+        conn.execute(
+            insert(Page),
+            [
+                {"chapter_id": cid, "index": i, "image_url": f"/manga/{slug}/{cid}/{i}.jpg", "byte_size": 100}
+                for cid in ids
+                for i in range(1, 5)
+            ],
+        )
+    return slug, ids
@@ -0,0 +1,24 @@
+"""Admin routes all sit behind X-Admin-Key."""
+import pytest
+
+from app.core.config import settings
+
+
+@pytest.mark.parametrize(
+    "method, path",
+    [("post", "/admin/seed"), ("get", "/admin/pool"), ("get", "/admin/chapter-index"), ("get", "/admin/rate-limit")],
+)
+def test_wrong_admin_key_is_forbidden(client, method, path):
+    kwargs = {"json": {}} if method == "post" else {}
+    assert getattr(client, method)(path, headers={"X-Admin-Key": "wrong"}, **kwargs).status_code == 403
+
+
+def test_seed_with_admin_key(client):
+    payload = {
+        "manga": {"slug": "admin-seeded", "title": "Seeded"},
+        "chapter": {"number": 1, "title": "One"},
+        "pages": ["https://example.com/1.png"],
+    }
+    resp = client.post("/admin/seed", json=payload, headers={"X-Admin-Key": settings.admin_seed_key})
+    assert resp.status_code < 400
+    assert client.get("/api/v1/manga/admin-seeded").json()["chapter_count"] == 1
@@ -0,0 +1,79 @@
+"""The manga/ asset server: Range requests, ETags, and nothing outside the root."""
+import pytest
+
+from app.core.config import settings
+from app.routers.asset_routes import asset_version
+
+
+BODY = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    root = tmp_path / "manga"
+    (root / "demo" / "ch1").mkdir(parents=True)
+    (root / "demo" / "ch1" / "001.jpg").write_bytes(BODY)
+    (root / "demo" / ".hidden").write_bytes(b"hidden")
+    (tmp_path / "secret.txt").write_bytes(b"secret")
+    (tmp_path / "manga-other").mkdir()
+    (tmp_path / "manga-other" / "secret.txt").write_bytes(b"secret")
+    monkeypatch.setattr(settings, "manga_root", str(root))
+    return root
+
+
+PAGE = "/manga/demo/ch1/001.jpg"
+
+
+def test_full_body(client, root):
+    response = client.get(PAGE)
+
+    assert response.status_code == 200
+    assert response.content == BODY
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert response.headers["Cache-Control"] == f"public, max-age={settings.asset_max_age_seconds}"
+
+
+@pytest.mark.parametrize(
+    "range_header, start, end",
+    [("bytes=0-9", 0, 9), ("bytes=1000-", 1000, len(BODY) - 1), ("bytes=-24", len(BODY) - 24, len(BODY) - 1)],
+)
+def test_range_is_a_206(client, root, range_header, start, end):
+    response = client.get(PAGE, headers={"Range": range_header})
+
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == f"bytes {start}-{end}/{len(BODY)}"
+    assert response.content == BODY[start : end + 1]
+    assert "ETag" in response.headers
+
+
+def test_unsatisfiable_range(client, root):
+    response = client.get(PAGE, headers={"Range": f"bytes={len(BODY)}-"})
+    assert response.status_code == 416
+
+
+def test_etag_and_versioned_urls(client, root):
+    first = client.get(PAGE)
+    etag = first.headers["ETag"]
+
+    assert client.get(PAGE, headers={"If-None-Match": etag}).status_code == 304
+
+    versioned = client.get(PAGE, params={"v": asset_version(root / "demo" / "ch1" / "001.jpg")})
+    assert versioned.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/manga/..%2fsecret.txt",
+        "/manga/demo/..%2f..%2fsecret.txt",
+        "/manga/%2e%2e/secret.txt",
+        "/manga/..%2fmanga-other/secret.txt",
+        "/manga/demo/.hidden",
+        "/manga/demo/ch1",
+        "/manga/demo/ch1/missing.jpg",
+    ],
+)
+def test_outside_the_root_is_a_404(client, root, path):
+    response = client.get(path)
+    assert response.status_code == 404
+    assert b"secret" not in response.content
@@ -0,0 +1,95 @@
+"""
+DB_MODE=async routers against the same database as the sync app.
+
+The hot read routes have native async handlers; their responses, headers
+included, must match what the sync routes return.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from app.core.response_cache import response_cache
+from app.db.chapter_index import chapter_index
+from app.db.models.manga_model import Chapter, Page
+from app.db.session import engine
+from app.routers import chapter_routes, manga_routes
+from app.routers.async_routes import NATIVE_ENDPOINTS, make_async_router
+
+
+@pytest.fixture(scope="module")
+def async_client(client):
+    from app.db.async_session import get_async_engine
+
+    app = FastAPI()
+    for router in (manga_routes.router, chapter_routes.router):
+        app.include_router(make_async_router(router))
+    with TestClient(app) as async_client:
+        yield async_client
+    # The engine's pool is bound to this client's event loop
+    get_async_engine.cache_clear()
+
+
+@pytest.fixture
+def two_chapters(manga):
+    manga_id, slug, chapter_id = manga
+    with engine.begin() as conn:
+        next_id = conn.execute(
+            insert(Chapter).values(manga_id=manga_id, number=2, like_count=0).returning(Chapter.id)
+        ).scalar()
+        conn.execute(
+            insert(Page),
+            [
+                {"chapter_id": cid, "index": i, "image_url": f"/manga/{slug}/{cid}/{i}.jpg", "byte_size": 100}
+                for cid in (chapter_id, next_id)
+                for i in (1, 2)
+            ],
+        )
+    return slug, chapter_id, next_id
+
+
+def fetch(client, path):
+    response_cache.clear()
+    chapter_index.clear()
+    return client.get(path)
+
+
+def test_hot_routes_are_native(async_client):
+    endpoints = {route.endpoint for route in async_client.app.routes if hasattr(route, "endpoint")}
+    assert set(NATIVE_ENDPOINTS.values()) <= endpoints
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/v1/manga/{slug}",
+        "/api/v1/chapters/{chapter_id}",
+        "/api/v1/chapters/{chapter_id}/reader",
+        "/api/v1/chapters/{chapter_id}/prefetch",
+        "/api/v1/chapters/{next_id}/reader",
+    ],
+)
+def test_matches_sync(client, async_client, two_chapters, path):
+    slug, chapter_id, next_id = two_chapters
+    path = path.format(slug=slug, chapter_id=chapter_id, next_id=next_id)
+
+    expected = fetch(client, path)
+    got = fetch(async_client, path)
+
+    assert got.status_code == expected.status_code == 200
+    assert got.content == expected.content
+    for header in ("ETag", "Link"):
+        assert got.headers.get(header) == expected.headers.get(header)
+
+
+def test_reader_links_next_chapter(async_client, two_chapters):
+    slug, chapter_id, next_id = two_chapters
+    response = fetch(async_client, f"/api/v1/chapters/{chapter_id}/reader")
+
+    assert response.json()["next"]["id"] == next_id
+    assert f"/manga/{slug}/{next_id}/1.jpg" in response.headers["Link"]
+
+
+@pytest.mark.parametrize("path", ["/api/v1/manga/no-such-manga", "/api/v1/chapters/999999/reader"])
+def test_not_found(async_client, path):
+    assert fetch(async_client, path).status_code == 404
@@ -0,0 +1,50 @@
+"""Blob storage: no second copy where avoidable, and no stale immutable content."""
+import os
+
+from app.core.config import settings
+from app.media.blobs import BlobStore
+from app.media.renditions import file_hash
+
+
+def test_put_shares_storage_with_the_tree(tmp_path):
+    source = tmp_path / "ch1" / "001.png"
+    source.parent.mkdir()
+    source.write_bytes(b"page one")
+    store = BlobStore(tmp_path)
+
+    blob = store.put(source, file_hash(source))
+    assert blob.read_bytes() == b"page one"
+    # Either a clone (own inode, shared extents) or a hard link (same inode)
+    assert os.path.samefile(blob, source) or source.stat().st_nlink == 1
+    assert store.put(source, file_hash(source)) == blob
+
+
+def test_in_place_edit_drops_the_linked_blob(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.media.blobs._clone", lambda source, target: False)
+    source = tmp_path / "ch1" / "001.png"
+    source.parent.mkdir()
+    source.write_bytes(b"page one")
+    store = BlobStore(tmp_path)
+    old = file_hash(source)
+    blob = store.put(source, old)
+    assert os.path.samefile(blob, source)
+
+    # Overwrite in place, as `cp new.png ch1/001.png` does
+    with open(source, "r+b") as f:
+        f.truncate(0)
+        f.write(b"page one, fixed")
+    new = file_hash(source)
+    assert store.drop_if_linked(source, new, [(old, ".png")]) == 1
+    assert not blob.exists()
+    assert store.put(source, new).read_bytes() == b"page one, fixed"
+    # The new blob still matches its hash, so nothing else is dropped
+    assert store.drop_if_linked(source, new, [(new, ".png")]) == 0
+
+
+def test_copy_mode(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "blob_storage", "copy")
+    source = tmp_path / "001.png"
+    source.write_bytes(b"page")
+    blob = BlobStore(tmp_path).put(source, file_hash(source))
+    assert not os.path.samefile(blob, source)
+    assert source.stat().st_nlink == 1
@@ -0,0 +1,65 @@
+"""catalog.json: a snapshot served gzipped or plain, rebuilt when the admin routes change content."""
+import os
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.db.catalog import invalidate_catalog
+from app.db.models.manga_model import Manga
+from app.db.session import engine
+
+
+GZIP = {"Accept-Encoding": "gzip"}
+PLAIN = {"Accept-Encoding": "identity"}
+
+
+def slugs(response):
+    return {item["slug"] for item in response.json()["items"]}
+
+
+def test_gzip_and_plain_bodies_match(client, manga):
+    invalidate_catalog()
+    plain = client.get("/manga/catalog.json", headers=PLAIN)
+    gzipped = client.get("/manga/catalog.json", headers=GZIP)
+
+    assert "content-encoding" not in plain.headers
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert int(gzipped.headers["Content-Length"]) < int(plain.headers["Content-Length"])
+    assert gzipped.content == plain.content
+    for response in (plain, gzipped):
+        assert response.headers["Vary"] == "Accept-Encoding"
+    assert gzipped.headers["ETag"] != plain.headers["ETag"]
+
+    _, slug, chapter_id = manga
+    item = next(item for item in plain.json()["items"] if item["slug"] == slug)
+    assert item["chapters"] == [{"id": chapter_id, "number": 1, "title": None}]
+
+
+def test_either_etag_is_a_304(client):
+    plain = client.get("/manga/catalog.json", headers=PLAIN).headers["ETag"]
+    gzipped = client.get("/manga/catalog.json", headers=GZIP).headers["ETag"]
+
+    for headers in (PLAIN, GZIP):
+        for etag in (plain, gzipped):
+            response = client.get("/manga/catalog.json", headers={**headers, "If-None-Match": etag})
+            assert response.status_code == 304
+
+
+def test_snapshot_is_rebuilt_after_seed(client):
+    invalidate_catalog()
+    before = client.get("/manga/catalog.json", headers=PLAIN)
+
+    # Written behind the app's back: the snapshot keeps serving until invalidated
+    hidden = f"catalog-{os.urandom(4).hex()}"
+    with engine.begin() as conn:
+        conn.execute(insert(Manga).values(slug=hidden, title="Hidden", like_count=0))
+    assert client.get("/manga/catalog.json", headers=PLAIN).content == before.content
+
+    seeded = f"catalog-{os.urandom(4).hex()}"
+    payload = {"manga": {"slug": seeded, "title": "Seeded"}, "chapter": {"number": 1}, "pages": []}
+    client.post("/admin/seed", json=payload, headers={"X-Admin-Key": settings.admin_seed_key})
+
+    after = client.get("/manga/catalog.json", headers=PLAIN)
+    assert {hidden, seeded} <= slugs(after)
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert client.get("/manga/catalog.json", headers={**PLAIN, "If-None-Match": before.headers["ETag"]}).status_code == 200
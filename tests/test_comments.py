@@ -0,0 +1,79 @@
+"""Comment writes reach the cached manga page straight away; comment feeds keyset-paginate."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app.db.models.manga_model import Comment
+from app.db.session import engine
+
+
+def test_comments_invalidate_the_cached_manga_page(client, manga):
+    _, slug, chapter_id = manga
+
+    detail = client.get(f"/api/v1/manga/{slug}").json()
+    assert detail["comment_count"] == 0
+    assert detail["chapters"][0]["comment_count"] == 0
+
+    assert client.post(f"/api/v1/manga/{slug}/comments", json={"text": "zo'r manga"}).status_code == 201
+    assert client.get(f"/api/v1/manga/{slug}").json()["comment_count"] == 1
+
+    assert client.post(f"/api/v1/chapters/{chapter_id}/comments", json={"text": "zo'r bob"}).status_code == 201
+    assert client.get(f"/api/v1/manga/{slug}").json()["chapters"][0]["comment_count"] == 1
+
+
+def test_rescan_delete_invalidates_the_cached_manga_page(client, manga, monkeypatch):
+    from app.core import moderation
+    from app.db.session import SessionLocal
+
+    _, slug, chapter_id = manga
+    client.post(f"/api/v1/chapters/{chapter_id}/comments", json={"text": "zo'r bob"})
+    assert client.get(f"/api/v1/manga/{slug}").json()["chapters"][0]["comment_count"] == 1
+
+    with SessionLocal() as db:
+        rows = [
+            row for row, _ in moderation.scan_comments(db, moderation.get_engine())
+            if row.chapter_id == chapter_id
+        ]
+        moderation.delete_comments(db, rows)
+    assert client.get(f"/api/v1/manga/{slug}").json()["chapters"][0]["comment_count"] == 0
+
+
+@pytest.fixture
+def feeds(manga):
+    """Five comments on the manga and on its chapter; the last three share a timestamp."""
+    manga_id, slug, chapter_id = manga
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    times = [start, start + timedelta(minutes=1)] + [start + timedelta(minutes=2)] * 3
+    with engine.begin() as conn:
+        for owner in ({"manga_id": manga_id}, {"chapter_id": chapter_id}):
+            conn.execute(
+                insert(Comment),
+                [{**owner, "text": f"comment {n}", "created_at": at} for n, at in enumerate(times)],
+            )
+    return {"manga": f"/api/v1/manga/{slug}/comments", "chapter": f"/api/v1/chapters/{chapter_id}/comments"}
+
+
+@pytest.mark.parametrize("feed", ["manga", "chapter"])
+def test_cursor_walk_matches_page_mode(client, feeds, feed):
+    url = feeds[feed]
+    expected = [c["id"] for c in client.get(url, params={"page_size": 100}).json()]
+
+    ids, cursor = [], None
+    while True:
+        body = client.get(url, params={"mode": "cursor", "page_size": 2, "cursor": cursor}).json()
+        ids += [c["id"] for c in body["items"]]
+        cursor = body["next_cursor"]
+        assert body["has_more"] == (cursor is not None)
+        if cursor is None:
+            break
+
+    assert len(ids) == 5
+    assert ids == expected
+
+
+@pytest.mark.parametrize("feed", ["manga", "chapter"])
+def test_bad_comment_cursor_is_a_400(client, feeds, feed):
+    response = client.get(feeds[feed], params={"cursor": "bm90LWEtY3Vyc29y"})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
@@ -0,0 +1,75 @@
+"""Incremental sync: only changed chapters are read, written and rendered."""
+import json
+import os
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.migrations import upgrade
+from app.db.models.manga_model import Manga
+from app.media.ingest import ingest_tree
+
+
+def write_tree(root, chapters=3, pages=2):
+    from PIL import Image
+
+    manifest = {"id": "demo", "title": "Demo", "chapters": []}
+    for c in range(1, chapters + 1):
+        chapter_dir = root / "demo" / f"ch{c}"
+        chapter_dir.mkdir(parents=True)
+        for p in range(1, pages + 1):
+            Image.new("RGB", (60, 90), (c * 40, p * 60, 0)).save(chapter_dir / f"{p:03d}.png")
+        manifest["chapters"].append({"id": f"ch{c}", "title": f"Chapter {c}"})
+    (root / "demo" / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ingest.db'}")
+    upgrade(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    with Session(engine) as session:
+        session.statements = statements
+        yield session
+    engine.dispose()
+
+
+def test_unchanged_sync_writes_nothing(db, tmp_path):
+    root = tmp_path / "manga"
+    write_tree(root)
+    ingest_tree(db, root, workers=1)
+    updated_at = db.execute(select(Manga.updated_at)).scalar()
+
+    db.statements.clear()
+    assert ingest_tree(db, root, workers=1) == {"demo": {"chapters_skipped": 3}}
+    assert not [s for s in db.statements if not s.lstrip().upper().startswith("SELECT")]
+    assert db.execute(select(Manga.updated_at)).scalar() == updated_at
+
+
+def test_changed_chapter_is_the_only_one_touched(db, tmp_path, monkeypatch):
+    from PIL import Image
+
+    monkeypatch.setattr(settings, "rendition_widths", [30])
+    monkeypatch.setattr(settings, "rendition_formats", ["webp"])
+    root = tmp_path / "manga"
+    write_tree(root)
+    ingest_tree(db, root, workers=1)
+    updated_at = db.execute(select(Manga.updated_at)).scalar()
+
+    page = root / "demo" / "ch2" / "001.png"
+    Image.new("RGB", (60, 90), (1, 2, 3)).save(page)
+    os.utime(page, ns=(1, 1))
+    db.statements.clear()
+    stats = ingest_tree(db, root, workers=1, renditions=True)["demo"]
+
+    assert stats["chapters_skipped"] == 2
+    assert stats["pages_updated"] == 1
+    assert stats["renditions"] == 1
+    writes = [s for s in db.statements if not s.lstrip().upper().startswith("SELECT")]
+    assert not [s for s in writes if s.lstrip().upper().startswith("UPDATE MANGA ")]
+    assert not [s for s in writes if s.lstrip().upper().startswith("UPDATE CHAPTER ")]
+    assert db.execute(select(Manga.updated_at)).scalar() == updated_at
+    assert len(list((root / settings.renditions_dir).rglob("meta.json"))) == 1
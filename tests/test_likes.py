@@ -0,0 +1,47 @@
+"""No like is lost under concurrency, in either like mode."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.counters import like_buffer
+from app.db.models.manga_model import Chapter, Manga
+from app.db.session import engine
+
+
+THREADS = 8
+LIKES = 80
+
+
+@pytest.mark.parametrize("like_mode", ["atomic", "buffered"])
+def test_concurrent_likes_are_not_lost(client, manga, like_mode, monkeypatch):
+    monkeypatch.setattr(settings, "like_mode", like_mode)
+    _, slug, chapter_id = manga
+
+    def like(i):
+        url = f"/api/v1/manga/{slug}/like" if i % 2 else f"/api/v1/chapters/{chapter_id}/like"
+        return client.post(url).status_code
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        statuses = list(pool.map(like, range(LIKES)))
+    assert statuses == [200] * LIKES
+    like_buffer.flush()
+
+    with engine.connect() as conn:
+        manga_likes = conn.execute(select(Manga.like_count).where(Manga.slug == slug)).scalar()
+        chapter_likes = conn.execute(select(Chapter.like_count).where(Chapter.id == chapter_id)).scalar()
+    assert (manga_likes, chapter_likes) == (LIKES // 2, LIKES // 2)
+
+
+def test_buffer_keeps_increments_when_flush_fails(manga, monkeypatch):
+    manga_id, _, _ = manga
+    like_buffer.add("manga", manga_id, 3)
+    monkeypatch.setattr(like_buffer, "bind", None)
+    with pytest.raises(AttributeError):
+        like_buffer.flush()
+    monkeypatch.undo()
+    assert like_buffer.pending("manga", manga_id) == 3
+    like_buffer.flush()
+    with engine.connect() as conn:
+        assert conn.execute(select(Manga.like_count).where(Manga.id == manga_id)).scalar() == 3
@@ -0,0 +1,63 @@
+"""Next-chapter prefetch: the manifest route and the Link header on chapter responses."""
+import pytest
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.response_cache import response_cache
+from app.db.chapter_index import chapter_index
+from app.db.models.manga_model import Page
+from app.db.session import engine
+
+
+@pytest.fixture(autouse=True)
+def cold():
+    response_cache.clear()
+    chapter_index.clear()
+
+
+def test_manifest_lists_the_next_chapter(client, chapters):
+    slug, (first, second, _) = chapters
+
+    body = client.get(f"/api/v1/chapters/{first}/prefetch").json()
+
+    assert body["chapter_id"] == first
+    assert body["next"] == {"id": second, "number": 2, "title": "Ch 2"}
+    assert [page["url"] for page in body["pages"]] == [f"/manga/{slug}/{second}/{i}.jpg" for i in range(1, 5)]
+    assert body["total_bytes"] == 400
+
+
+def test_last_chapter_has_nothing_to_prefetch(client, chapters):
+    _, (_, _, third) = chapters
+
+    body = client.get(f"/api/v1/chapters/{third}/prefetch").json()
+    assert body == {"chapter_id": third, "next": None, "pages": [], "total_bytes": None}
+    for path in (f"/api/v1/chapters/{third}", f"/api/v1/chapters/{third}/reader"):
+        assert "link" not in client.get(path).headers
+
+
+def test_total_bytes_unknown_when_a_size_is_missing(client, chapters):
+    _, (first, second, _) = chapters
+    with engine.begin() as conn:
+        conn.execute(update(Page).where(Page.chapter_id == second, Page.index == 4).values(byte_size=None))
+
+    assert client.get(f"/api/v1/chapters/{first}/prefetch").json()["total_bytes"] is None
+
+
+@pytest.mark.parametrize("suffix", ["", "/reader"])
+def test_link_header(client, chapters, monkeypatch, suffix):
+    monkeypatch.setattr(settings, "prefetch_link_pages", 2)
+    slug, (first, second, _) = chapters
+
+    response = client.get(f"/api/v1/chapters/{first}{suffix}")
+    expected = ", ".join(f"</manga/{slug}/{second}/{i}.jpg>; rel=prefetch; as=image" for i in (1, 2))
+    assert response.headers["Link"] == expected
+
+    # Sent with the 304 too, so a revalidating reader still prefetches
+    etag = response.headers["ETag"]
+    again = client.get(f"/api/v1/chapters/{first}{suffix}", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["Link"] == expected
+
+
+def test_unknown_chapter(client):
+    assert client.get("/api/v1/chapters/999999/prefetch").status_code == 404
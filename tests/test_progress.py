@@ -0,0 +1,59 @@
+"""Progress saves: unknown ids are rejected in both modes, and coalesced deletes stick."""
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db import progress_writer
+from app.db.models.manga_model import ReadingProgress
+from app.db.progress_writer import progress_coalescer, progress_row
+from app.db.session import engine
+
+
+def stored(token, manga_id):
+    with engine.connect() as conn:
+        return conn.execute(
+            select(ReadingProgress.chapter_id).where(
+                ReadingProgress.user_token == token, ReadingProgress.manga_id == manga_id
+            )
+        ).scalar()
+
+
+@pytest.mark.parametrize("mode", ["coalesced", "direct"])
+def test_save_rejects_unknown_ids(client, manga, monkeypatch, mode):
+    manga_id, _, chapter_id = manga
+    monkeypatch.setattr(settings, "progress_mode", mode)
+    headers = {"X-User-Token": f"reader-1-{mode}"}
+
+    missing = client.post("/api/v1/progress/", json={"manga_id": 999999, "chapter_id": 999999}, headers=headers)
+    assert missing.status_code == 404
+    other = client.post("/api/v1/progress/", json={"manga_id": 999999, "chapter_id": chapter_id}, headers=headers)
+    assert other.status_code == 404
+
+    saved = client.post("/api/v1/progress/", json={"manga_id": manga_id, "chapter_id": chapter_id}, headers=headers)
+    assert saved.status_code == 201
+    progress_coalescer.flush()
+    assert stored(f"reader-1-{mode}", manga_id) == chapter_id
+
+
+def test_delete_during_flush_is_not_undone(client, manga, monkeypatch):
+    manga_id, _, chapter_id = manga
+    progress_coalescer.submit(progress_row("reader-2", manga_id, chapter_id, 3))
+    upsert = progress_writer.upsert_progress
+
+    def delete_first(conn, rows):
+        # The DELETE route runs after the batch was taken but before it is written
+        client.delete(f"/api/v1/progress/{manga_id}", headers={"X-User-Token": "reader-2"})
+        upsert(conn, rows)
+
+    monkeypatch.setattr(progress_writer, "upsert_progress", delete_first)
+    progress_coalescer.flush()
+    assert stored("reader-2", manga_id) is None
+
+
+def test_save_after_delete_is_kept(client, manga):
+    manga_id, _, chapter_id = manga
+    progress_coalescer.submit(progress_row("reader-3", manga_id, chapter_id, 1))
+    progress_coalescer.discard("reader-3", manga_id)
+    progress_coalescer.submit(progress_row("reader-3", manga_id, chapter_id, 2))
+    progress_coalescer.flush()
+    assert stored("reader-3", manga_id) == chapter_id
@@ -0,0 +1,88 @@
+"""
+Per-endpoint SQL query budgets.
+
+Seeds a manga that has many chapters and pages, calls each read endpoint
+with the response caches cold, and fails if it runs more statements than
+its budget. The counts must not grow with the number of chapters or pages,
+so a lazy load or an N+1 sneaking back in fails here.
+"""
+import pytest
+from sqlalchemy import insert, select
+
+from app.core.response_cache import response_cache
+from app.db.catalog import invalidate_catalog
+from app.db.chapter_index import chapter_index
+from app.db.models.manga_model import Chapter, Manga, Page
+from app.db.query_counter import count_queries
+from app.db.session import engine
+
+
+CHAPTERS = 40
+PAGES = 25
+SLUG = "query-budget"
+
+# (path, max statements, warm). Cold runs start with every cache empty;
+# warm runs keep the in-memory indexes from the previous call.
+BUDGETS = [
+    ("/api/v1/manga/{slug}", 2, False),
+    ("/api/v1/manga/?page_size=20", 2, False),
+    ("/api/v1/manga/?mode=cursor&page_size=20", 1, False),
+    # Chapter and reader responses include the next chapter's prefetch
+    # hints: +1 for the ordering index when cold, +1 for its pages
+    ("/api/v1/chapters/{chapter_id}", 4, False),
+    ("/api/v1/chapters/{chapter_id}/reader", 4, False),
+    ("/api/v1/chapters/{chapter_id}/reader", 3, True),
+    ("/api/v1/chapters/{chapter_id}/prefetch", 2, False),
+    ("/api/v1/chapters/{chapter_id}/prefetch", 1, True),
+    ("/api/v1/chapters/{chapter_id}/next", 1, False),
+    ("/api/v1/chapters/{chapter_id}/next", 0, True),
+    ("/api/v1/chapters/{chapter_id}/prev", 0, True),
+    ("/api/v1/chapters/{chapter_id}/comments", 2, False),
+    ("/manga/catalog.json", 1, False),
+]
+
+
+@pytest.fixture(scope="module")
+def chapter_id(client):
+    with engine.begin() as conn:
+        manga_id = conn.execute(
+            insert(Manga).values(slug=SLUG, title="Query budget").returning(Manga.id)
+        ).scalar()
+        conn.execute(
+            insert(Chapter),
+            [{"manga_id": manga_id, "number": n, "title": f"Ch {n}"} for n in range(1, CHAPTERS + 1)],
+        )
+        chapter_ids = conn.execute(
+            select(Chapter.id).where(Chapter.manga_id == manga_id).order_by(Chapter.number)
+        ).scalars().all()
+        conn.execute(
+            insert(Page),
+            [
+                {"chapter_id": chapter_id, "index": i, "image_url": f"/p/{chapter_id}/{i}.png"}
+                for chapter_id in chapter_ids
+                for i in range(1, PAGES + 1)
+            ],
+        )
+    # A chapter in the middle, so it has both neighbours
+    return chapter_ids[CHAPTERS // 2]
+
+
+@pytest.mark.parametrize(
+    "path, budget, warm", BUDGETS, ids=[f"{path}{' (warm)' if warm else ''}" for path, _, warm in BUDGETS]
+)
+def test_query_budget(client, chapter_id, path, budget, warm):
+    url = path.format(slug=SLUG, chapter_id=chapter_id)
+    if warm:
+        # Fill the in-memory indexes the warm budget relies on
+        client.get(url)
+    else:
+        chapter_index.clear()
+    response_cache.clear()
+    invalidate_catalog()
+
+    with count_queries(engine) as counter:
+        resp = client.get(url)
+
+    assert resp.status_code < 400
+    statements = "\n".join(" ".join(s.split())[:150] for s in counter.statements)
+    assert counter.count <= budget, f"{counter.count} statements, budget {budget}:\n{statements}"
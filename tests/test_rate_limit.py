@@ -0,0 +1,78 @@
+"""Write budgets hold per IP, whatever X-User-Token the client sends."""
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.core.rate_limit import RateLimitMiddleware, TokenBucketLimiter
+from app.db.models.manga_model import Comment
+from app.db.session import engine
+
+
+def limited_client(app, limiter):
+    # Started by the session `client` fixture already; this only adds the middleware
+    return TestClient(RateLimitMiddleware(app, limiter=limiter))
+
+
+def comment_count(manga_id):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count(Comment.id)).where(Comment.manga_id == manga_id)).scalar()
+
+
+def test_rotating_tokens_share_the_ip_budget(app, client, manga):
+    manga_id, slug, _ = manga
+    limiter = TokenBucketLimiter({"comments": "5/60"}, max_keys=1000, ip_budgets={"comments": "8/60"})
+    limited = limited_client(app, limiter)
+
+    statuses = [
+        limited.post(
+            f"/api/v1/manga/{slug}/comments",
+            json={"text": f"zo'r bob {i}"},
+            headers={"X-User-Token": f"token-{i}"},
+        ).status_code
+        for i in range(20)
+    ]
+    assert statuses.count(201) == 8
+    assert statuses.count(429) == 12
+    assert comment_count(manga_id) == 8
+    # Rejected by the IP bucket before a bucket was made for each new token
+    assert len(limiter) == 1 + 8
+
+
+def test_one_token_is_held_to_its_own_budget(app, client, manga):
+    _, slug, _ = manga
+    limiter = TokenBucketLimiter({"comments": "5/60"}, max_keys=1000, ip_budgets={"comments": "8/60"})
+    limited = limited_client(app, limiter)
+
+    statuses = [
+        limited.post(f"/api/v1/manga/{slug}/comments", json={"text": "zo'r bob"}, headers={"X-User-Token": "one"})
+        for _ in range(7)
+    ]
+    assert [r.status_code for r in statuses] == [201] * 5 + [429] * 2
+    assert int(statuses[-1].headers["retry-after"]) > 0
+
+
+def test_refill():
+    limiter = TokenBucketLimiter({"likes": "2/60"}, max_keys=10, ip_budgets={"likes": "3/60"})
+    client = ("1.2.3.4", "t")
+    assert [limiter.hit("likes", client, now=0) for _ in range(2)] == [0, 0]
+    assert limiter.hit("likes", client, now=0) == 30
+    assert limiter.hit("likes", client, now=30) == 0
+
+
+def test_spoofed_forwarded_for_shares_the_ip_bucket(app, client, manga, monkeypatch):
+    from app.core.config import settings
+
+    _, slug, _ = manga
+    monkeypatch.setattr(settings, "rate_limit_trust_forwarded", True)
+    limiter = TokenBucketLimiter({"comments": "5/60"}, max_keys=1000, ip_budgets={"comments": "3/60"})
+    limited = limited_client(app, limiter)
+
+    statuses = [
+        limited.post(
+            f"/api/v1/manga/{slug}/comments",
+            json={"text": "zo'r bob"},
+            # The proxy appends the real address after whatever the client sent
+            headers={"X-User-Token": f"token-{i}", "X-Forwarded-For": f"10.0.0.{i}, 203.0.113.7"},
+        ).status_code
+        for i in range(6)
+    ]
+    assert statuses == [201] * 3 + [429] * 3
@@ -0,0 +1,47 @@
+"""The reader payload: pages, manga and prev/next in one response."""
+import pytest
+
+from app.core.response_cache import response_cache
+from app.db.chapter_index import chapter_index
+
+
+@pytest.fixture(autouse=True)
+def cold():
+    response_cache.clear()
+    chapter_index.clear()
+
+
+def test_reader_payload(client, manga, chapters):
+    manga_id, _, _ = manga
+    slug, (first, second, third) = chapters
+
+    body = client.get(f"/api/v1/chapters/{second}/reader").json()
+
+    assert body["id"] == second
+    assert body["manga"] == {"id": manga_id, "slug": slug, "title": "Test"}
+    assert body["prev"] == {"id": first, "number": 1, "title": None}
+    assert body["next"] == {"id": third, "number": 3, "title": "Ch 3"}
+    assert [page["index"] for page in body["pages"]] == [1, 2, 3, 4]
+    assert body["pages"][0]["image_url"] == f"/manga/{slug}/{second}/1.jpg"
+
+
+def test_first_and_last_chapters(client, chapters):
+    _, (first, second, third) = chapters
+
+    start = client.get(f"/api/v1/chapters/{first}/reader").json()
+    end = client.get(f"/api/v1/chapters/{third}/reader").json()
+
+    assert (start["prev"], start["next"]["id"]) == (None, second)
+    assert (end["prev"]["id"], end["next"]) == (second, None)
+
+
+def test_matches_the_next_and_prev_routes(client, chapters):
+    _, ids = chapters
+    for chapter_id in ids:
+        reader = client.get(f"/api/v1/chapters/{chapter_id}/reader").json()
+        assert reader["next"] == client.get(f"/api/v1/chapters/{chapter_id}/next").json()
+        assert reader["prev"] == client.get(f"/api/v1/chapters/{chapter_id}/prev").json()
+
+
+def test_unknown_chapter(client):
+    assert client.get("/api/v1/chapters/999999/reader").status_code == 404
@@ -0,0 +1,35 @@
+"""A source the encoders can't handle doesn't stop the rest of the batch."""
+import pytest
+
+from app.core.config import settings
+from app.media.renditions import build_renditions, render_source
+
+
+@pytest.fixture
+def root(tmp_path):
+    from PIL import Image
+
+    chapter = tmp_path / "demo" / "ch1"
+    chapter.mkdir(parents=True)
+    # Taller than WebP allows at full width
+    Image.new("RGB", (800, 20000), "white").save(chapter / "001.png")
+    Image.new("RGB", (60, 90), "black").save(chapter / "002.png")
+    (chapter / "003.png").write_bytes(b"not an image")
+    return tmp_path
+
+
+def test_oversized_widths_are_skipped_and_broken_sources_fail(root):
+    counts = build_renditions(root, [400, 800], ["webp"], workers=1)
+    assert counts == {"rendered": 2, "skipped": 0, "failed": 1}
+    tall = root / settings.renditions_dir / "demo" / "ch1" / "001"
+    assert sorted(p.name for p in tall.iterdir()) == ["400.webp", "meta.json"]
+
+
+def test_stale_directories_are_left_alone(root):
+    source = root / "demo" / "ch1" / "002.png"
+    out_dir = root / settings.renditions_dir / "demo" / "ch1" / "002"
+    (out_dir / "extra").mkdir(parents=True)
+    (out_dir / "999.webp").write_bytes(b"old")
+
+    assert render_source(str(root), str(source), (40,), ("webp",)) == "rendered"
+    assert sorted(p.name for p in out_dir.iterdir()) == ["40.webp", "extra", "meta.json"]
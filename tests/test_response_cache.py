@@ -0,0 +1,76 @@
+"""Cached reads answer If-None-Match with a 304, and writes drop the entries they stale."""
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.core.response_cache import response_cache
+
+
+READS = ["/api/v1/manga/{slug}", "/api/v1/chapters/{chapter_id}", "/api/v1/chapters/{chapter_id}/reader"]
+
+
+def url(path, manga):
+    _, slug, chapter_id = manga
+    return path.format(slug=slug, chapter_id=chapter_id)
+
+
+@pytest.mark.parametrize("path", READS)
+def test_if_none_match_is_a_304(client, manga, path):
+    first = client.get(url(path, manga))
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    for header in (etag, f'"stale", {etag}', "*"):
+        again = client.get(url(path, manga), headers={"If-None-Match": header})
+        assert again.status_code == 304
+        assert again.content == b""
+        assert again.headers["ETag"] == etag
+
+    changed = client.get(url(path, manga), headers={"If-None-Match": '"stale"'})
+    assert changed.status_code == 200
+    assert changed.content == first.content
+
+
+def test_comment_changes_the_etag(client, manga):
+    _, slug, _ = manga
+    etag = client.get(f"/api/v1/manga/{slug}").headers["ETag"]
+
+    assert client.post(f"/api/v1/manga/{slug}/comments", json={"text": "ajoyib"}).status_code == 201
+
+    response = client.get(f"/api/v1/manga/{slug}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["comment_count"] == 1
+
+
+@pytest.mark.parametrize("like_mode", ["atomic", "buffered"])
+def test_like_keeps_the_etag(client, manga, monkeypatch, like_mode):
+    # Like counts come from the like routes, not the cached bodies, so a
+    # like must not cost readers a full download
+    monkeypatch.setattr(settings, "like_mode", like_mode)
+    _, slug, chapter_id = manga
+    etags = {path: client.get(url(path, manga)).headers["ETag"] for path in READS}
+
+    assert client.post(f"/api/v1/manga/{slug}/like").json() == {"like_count": 1}
+    assert client.post(f"/api/v1/chapters/{chapter_id}/like").json() == {"like_count": 1}
+
+    for path, etag in etags.items():
+        assert client.get(url(path, manga), headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_seed_drops_cached_readers(client, manga):
+    _, _, chapter_id = manga
+    reader = f"/api/v1/chapters/{chapter_id}/reader"
+    etag = client.get(reader).headers["ETag"]
+    assert response_cache.get(("reader", chapter_id)) is not None
+
+    slug = f"seeded-{os.urandom(4).hex()}"
+    payload = {"manga": {"slug": slug, "title": "Seeded"}, "chapter": {"number": 1}, "pages": []}
+    assert client.post("/admin/seed", json=payload, headers={"X-Admin-Key": settings.admin_seed_key}).status_code == 200
+
+    assert response_cache.get(("reader", chapter_id)) is None
+    # Rebuilt with the same content, so the content-hash ETag still matches
+    assert client.get(reader, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(f"/api/v1/manga/{slug}").json()["chapter_count"] == 1
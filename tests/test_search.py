@@ -0,0 +1,52 @@
+"""Manga search: title hits rank above description hits, and the ILIKE fallback matches the same rows."""
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.db.models.manga_model import Manga
+from app.db.search import apply_search
+from app.db.session import engine
+
+
+WORD = "quetzalrook"
+
+
+@pytest.fixture(scope="module")
+def seeded(client):
+    rows = [
+        {"slug": "search-description", "title": "Harbour Lights", "description": f"A {WORD} circles the bay."},
+        {"slug": "search-title", "title": f"The {WORD.title()} Chronicles", "description": "Sky pirates."},
+        {"slug": "search-both", "title": f"{WORD.title()} Rising", "description": f"Every {WORD} returns."},
+        {"slug": "search-unrelated", "title": "Quiet Orchard", "description": "Nothing to see."},
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Manga), [{**row, "like_count": 0} for row in rows])
+
+
+def slugs(client, **params):
+    response = client.get("/api/v1/manga/", params=params)
+    assert response.status_code == 200
+    return [item["slug"] for item in response.json()["items"]]
+
+
+def test_title_matches_rank_first(client, seeded):
+    found = slugs(client, search=WORD)
+
+    assert set(found) == {"search-both", "search-title", "search-description"}
+    assert found[-1] == "search-description"
+
+
+def test_prefix_match_while_typing(client, seeded):
+    assert set(slugs(client, search=WORD[:6])) == set(slugs(client, search=WORD))
+
+
+def test_no_searchable_tokens_matches_nothing(client, seeded):
+    assert slugs(client, search="  !? ") == []
+
+
+def test_ilike_fallback(seeded):
+    with Session(engine) as db:
+        rows = apply_search(db.query(Manga.slug), WORD.upper(), "mysql").all()
+
+    # No ranking: id order, title or description containing the term
+    assert [row.slug for row in rows] == ["search-description", "search-title", "search-both"]
@@ -0,0 +1,84 @@
+"""The *_dict serializers produce what their response models would."""
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.core.fast_json import dumps
+from app.core.response_cache import response_cache
+from app.db.models.manga_model import Chapter, Manga, Page
+from app.db.session import SessionLocal, engine
+from app.routers.chapter_routes import (
+    ChapterDetailOut,
+    PageOut,
+    RenditionOut,
+    chapter_detail_dict,
+    chapter_renditions,
+    srcset_for,
+)
+from app.routers.manga_routes import SUMMARY_COLUMNS
+from app.schemas.manga_schema import MangaDetail, MangaSummary, manga_detail_dict, manga_summary_dict
+
+
+def same_json(model, content: dict) -> None:
+    expected = json.loads(model.model_dump_json())
+    actual = json.loads(dumps(content))
+    assert actual == expected
+    assert list(actual) == list(expected)
+
+
+def test_manga_dicts_match_the_models(client, manga):
+    manga_id, slug, chapter_id = manga
+    with engine.begin() as conn:
+        conn.execute(
+            update(Chapter)
+            .where(Chapter.id == chapter_id)
+            .values(title="Bir", published_at=datetime(2026, 1, 2, tzinfo=timezone.utc))
+        )
+
+    with SessionLocal() as db:
+        row = db.execute(select(*SUMMARY_COLUMNS).where(Manga.id == manga_id)).one()
+        same_json(MangaSummary.model_validate(row), manga_summary_dict(row))
+
+        detail = db.query(Manga).options(selectinload(Manga.chapters)).filter(Manga.slug == slug).one()
+        same_json(MangaDetail.model_validate(detail), manga_detail_dict(detail))
+
+
+def test_chapter_dict_matches_the_model(client, manga):
+    _, slug, chapter_id = manga
+    with engine.begin() as conn:
+        conn.execute(
+            Page.__table__.insert(),
+            [
+                {"chapter_id": chapter_id, "index": 1, "image_url": f"/manga/{slug}/ch1/001.png", "width": 800},
+                {"chapter_id": chapter_id, "index": 2, "image_url": "https://example.com/2.png", "width": None},
+            ],
+        )
+    out_dir = Path(settings.manga_root) / settings.renditions_dir / slug / "ch1" / "001"
+    out_dir.mkdir(parents=True)
+    meta = {"renditions": [
+        {"file": f"{w}.{fmt}", "width": w, "height": w * 2, "format": fmt, "bytes": w}
+        for w in (480, 800) for fmt in ("avif", "webp")
+    ]}
+    (out_dir / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    response_cache.clear()
+    with SessionLocal() as db:
+        chapter = db.query(Chapter).options(selectinload(Chapter.pages)).filter(Chapter.id == chapter_id).one()
+        pages = [
+            PageOut.model_validate(page).model_copy(update={
+                "renditions": [RenditionOut.model_validate(r) for r in renditions],
+                "srcset": srcset_for(renditions),
+            })
+            for page, renditions in zip(chapter.pages, chapter_renditions(chapter))
+        ]
+        model = ChapterDetailOut(id=chapter.id, number=chapter.number, title=chapter.title, pages=pages)
+        content = chapter_detail_dict(chapter)
+
+    same_json(model, content)
+    assert len(content["pages"][0]["renditions"]) == 4
+    assert content["pages"][0]["srcset"]["image/webp"].endswith("/800.webp 800w")
+    assert content["pages"][1]["renditions"] == []
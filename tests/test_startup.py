@@ -0,0 +1,44 @@
+"""Fast start keeps the SCHEMA_CHECK=fail guarantee; the schema check never writes."""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect
+
+from app.core.config import settings
+from app.db.migrations import SchemaBehindError, check_schema, upgrade
+
+
+@pytest.fixture
+def behind(app, tmp_path, monkeypatch):
+    """Point the app at a database with every migration pending."""
+    import app.main
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    monkeypatch.setattr(app.main, "engine", engine)
+    monkeypatch.setattr(settings, "fast_start", True)
+    yield
+    engine.dispose()
+
+
+def test_fast_start_refuses_a_schema_behind(app, behind, monkeypatch):
+    monkeypatch.setattr(settings, "schema_check", "fail")
+    with pytest.raises(SchemaBehindError):
+        with TestClient(app):
+            pass
+
+
+def test_fast_start_warns_in_the_background(app, behind, monkeypatch):
+    monkeypatch.setattr(settings, "schema_check", "warn")
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+
+
+def test_check_schema_is_read_only(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    with pytest.raises(SchemaBehindError):
+        check_schema(engine)
+    assert inspect(engine).get_table_names() == []
+
+    upgrade(engine)
+    check_schema(engine)
+    assert "schema_version" in inspect(engine).get_table_names()
+    engine.dispose()